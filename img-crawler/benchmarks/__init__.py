@@ -0,0 +1 @@
+# 성능 측정 패키지 
\ No newline at end of file
@@ -0,0 +1,209 @@
+"""
+크롤링 성능 측정 - 모의 갤러리 서버를 대상으로 전체 크롤링 실행
+
+사용법:
+    python -m benchmarks.crawl_benchmark --pages 200 --latency-ms 20 -o bench.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from core.image_crawler import ImageCrawler
+from .mock_server import DEFAULT_OPTIONS, MockServerProcess
+
+
+def percentile(values, pct):
+    """백분위수 (nearest-rank)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def latency_summary(values):
+    """지연 시간 요약 (밀리초)"""
+    return {
+        'count': len(values),
+        'p50_ms': round(percentile(values, 50) * 1000, 3),
+        'p99_ms': round(percentile(values, 99) * 1000, 3),
+        'max_ms': round(max(values) * 1000, 3) if values else 0.0,
+    }
+
+
+def image_durations(results):
+    """이미지 요청마다 대기열 대기를 뺀 요청 시간 (초, download_time 은 10ms 로 반올림되어 쓰지 않음)"""
+    durations = []
+    for result in results:
+        timings = result.get('timings')
+        if timings and 'total' in timings:
+            durations.append((timings['total'] - timings.get('queue_wait', 0)) / 1000)
+    return durations
+
+
+def peak_rss_mb():
+    """최대 RSS (MB, 지원하지 않는 플랫폼은 None)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux 는 KB, macOS 는 바이트 단위
+    divisor = 1024 * 1024 if platform.system() == "Darwin" else 1024
+    return round(peak / divisor, 1)
+
+
+def git_revision():
+    """현재 커밋 (버전 간 비교용)"""
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            stderr=subprocess.DEVNULL, text=True).strip()
+    except Exception:
+        return None
+
+
+async def run_crawl(config):
+    """크롤링을 실행하고 단계별 소요 시간 측정"""
+    crawler = ImageCrawler(config)
+    phase_marks = {}
+    crawler.events.on('progress', lambda percentage, message: phase_marks.setdefault(
+        percentage, time.perf_counter()))
+
+    start = time.perf_counter()
+    results = await crawler.crawl()
+    end = time.perf_counter()
+
+    # 50% 진행 이벤트가 다운로드 시작 시점
+    download_start = phase_marks.get(50, end)
+    return crawler, results, {
+        'total': end - start,
+        'pages': download_start - start,
+        'downloads': end - download_start,
+    }
+
+
+def run_benchmark(args):
+    server_options = {
+        'images_per_page': args.images_per_page,
+        'page_size_kb': args.page_size_kb,
+        'latency_ms': args.latency_ms,
+        'error_rate': args.error_rate,
+        'image_size_kb': tuple(args.image_size_kb),
+    }
+    save_path = tempfile.mkdtemp(prefix='crawl_bench_')
+
+    try:
+        with MockServerProcess(server_options, args.port) as server:
+            config = {
+                'url': f"{server.base_url}/page/{{}}",
+                'repeat_enabled': True,
+                'start_value': 1,
+                'end_value': args.pages,
+                'step_value': 1,
+                'selectors': ['.gallery img'],
+                'save_path': save_path,
+                'concurrent': args.concurrent,
+                'overwrite': True,
+                'create_subfolder': True,
+            }
+
+            cpu_start = time.process_time()
+            crawler, results, durations = asyncio.run(run_crawl(config))
+            cpu_time = time.process_time() - cpu_start
+            server_stats = server.stats()
+    finally:
+        shutil.rmtree(save_path, ignore_errors=True)
+
+    downloaded = [r for r in results if r.get('success')]
+    total_bytes = sum(r.get('size', 0) for r in downloaded)
+    statistics = crawler.get_statistics()
+
+    return {
+        'label': args.label,
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'params': dict(server_options, pages=args.pages, concurrent=args.concurrent),
+        'statistics': statistics,
+        'duration_s': {k: round(v, 4) for k, v in durations.items()},
+        'throughput': {
+            'pages_per_s': round(statistics['processed_urls'] / durations['pages'], 2)
+            if durations['pages'] else 0.0,
+            'images_per_s': round(len(downloaded) / durations['downloads'], 2)
+            if durations['downloads'] else 0.0,
+            'mb_per_s': round(total_bytes / (1024 * 1024) / durations['downloads'], 2)
+            if durations['downloads'] else 0.0,
+        },
+        'latency': {
+            # 서버 측 처리 시간 (주입한 지연 포함)
+            'server_page': latency_summary(server_stats['page_timings']),
+            'server_image': latency_summary(server_stats['image_timings']),
+            # 클라이언트 측 이미지 다운로드 시간
+            'client_image': latency_summary(image_durations(downloaded)),
+        },
+        # 클라이언트 측 단계별 시간 (queue_wait, dns, connect, ttfb, transfer, parse, write)
+        'client_timings': crawler.get_timing_summary(),
+        'resources': {
+            'cpu_s': round(cpu_time, 3),
+            'cpu_utilization': round(cpu_time / durations['total'], 3) if durations['total'] else 0.0,
+            'peak_rss_mb': peak_rss_mb(),
+        },
+        'bytes_downloaded': total_bytes,
+        'server_errors': server_stats['errors'],
+    }
+
+
+def append_result(path, result):
+    """결과를 JSON 배열 파일에 추가 (회귀 추적용)"""
+    history = []
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            history = json.load(f)
+    history.append(result)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(history, f, ensure_ascii=False, indent=2)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description='모의 갤러리 서버를 대상으로 크롤링 성능 측정')
+    parser.add_argument('--pages', type=int, default=100)
+    parser.add_argument('--images-per-page', type=int, default=DEFAULT_OPTIONS['images_per_page'])
+    parser.add_argument('--page-size-kb', type=int, default=DEFAULT_OPTIONS['page_size_kb'])
+    parser.add_argument('--latency-ms', type=int, default=DEFAULT_OPTIONS['latency_ms'])
+    parser.add_argument('--error-rate', type=float, default=DEFAULT_OPTIONS['error_rate'])
+    parser.add_argument('--image-size-kb', type=int, nargs=2, default=DEFAULT_OPTIONS['image_size_kb'])
+    parser.add_argument('-c', '--concurrent', type=int, default=3)
+    parser.add_argument('--port', type=int, default=8787)
+    parser.add_argument('--label', default='default', help='결과에 붙일 이름')
+    parser.add_argument('-o', '--output', help='결과를 추가할 JSON 파일')
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    result = run_benchmark(args)
+
+    json.dump(result, sys.stdout, ensure_ascii=False, indent=2)
+    sys.stdout.write('\n')
+    if args.output:
+        append_result(args.output, result)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,277 @@
+"""
+핫패스 마이크로 벤치마크 - 이미지마다 호출되는 함수의 결과 동일성과 속도 비교
+
+이전 구현(legacy_*)과 현재 구현의 출력이 같은지 먼저 확인한 뒤 속도를 측정한다.
+
+사용법:
+    python -m benchmarks.hotpath_benchmark [-n 반복수] [-o 결과.json]
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import timeit
+from urllib.parse import urlparse, unquote
+
+from core.downloader import ImageDownloader
+from core.image_crawler import ImageCrawler
+
+
+# ---------------------------------------------------------------------------
+# 이전 구현 (비교 기준)
+# ---------------------------------------------------------------------------
+
+def legacy_is_valid_image_url(config, url):
+    try:
+        parsed = urlparse(url)
+        if not parsed.scheme or not parsed.netloc:
+            return False
+        if config.get('check_extensions', True):
+            valid_extensions = ['.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp', '.svg']
+            url_lower = url.lower()
+            url_path = parsed.path.lower()
+            if any(url_path.endswith(ext) for ext in valid_extensions):
+                return True
+            if not config.get('strict_extensions', False):
+                return True
+            return False
+        return True
+    except Exception:
+        return False
+
+
+def legacy_sanitize_filename(filename):
+    import re
+    import platform
+
+    if platform.system() == "Windows":
+        sanitized = re.sub(r'[<>:"/\\|?*]', '_', filename)
+        reserved_names = [
+            'CON', 'PRN', 'AUX', 'NUL',
+            'COM1', 'COM2', 'COM3', 'COM4', 'COM5', 'COM6', 'COM7', 'COM8', 'COM9',
+            'LPT1', 'LPT2', 'LPT3', 'LPT4', 'LPT5', 'LPT6', 'LPT7', 'LPT8', 'LPT9'
+        ]
+        name, ext = os.path.splitext(sanitized)
+        if name.upper() in reserved_names:
+            name = f"_{name}"
+            sanitized = name + ext
+    else:
+        sanitized = re.sub(r'[<>:"/\\|?*]', '_', filename)
+    sanitized = re.sub(r'_+', '_', sanitized)
+    sanitized = sanitized.strip(' ._')
+    if platform.system() == "Windows":
+        sanitized = sanitized.rstrip('. ')
+    name, ext = os.path.splitext(sanitized)
+    if len(name) > 100:
+        name = name[:100]
+        sanitized = name + ext
+    return sanitized if sanitized else "unnamed_file"
+
+
+def legacy_generate_filename(config, url, index):
+    try:
+        parsed = urlparse(url)
+        original_filename = os.path.basename(unquote(parsed.path))
+        if not os.path.splitext(original_filename)[1]:
+            original_filename += '.jpg'
+        if not original_filename or original_filename == '.jpg':
+            original_filename = f"image_{index}.jpg"
+        filename_pattern = config.get('filename_pattern', 0)
+        if filename_pattern == 2:
+            filename = f"{index:04d}_{original_filename}"
+        elif filename_pattern == 3:
+            domain = urlparse(url).netloc.replace('.', '_')
+            filename = f"{domain}_{index:04d}_{original_filename}"
+        else:
+            filename = original_filename
+        return legacy_sanitize_filename(filename)
+    except Exception:
+        return f"image_{index}_{int(time.time())}.jpg"
+
+
+def legacy_get_file_path(save_path, create_subfolder, url, filename):
+    from pathlib import Path
+
+    base_path = Path(save_path)
+    if create_subfolder:
+        domain = urlparse(url).netloc
+        domain_folder = legacy_sanitize_filename(domain)
+        return str(base_path / domain_folder / filename)
+    return str(base_path / filename)
+
+
+def legacy_extract_images(crawler, html, base_url):
+    """이전 _extract_images (이미지 정보를 만든 뒤 유효성 검사)"""
+    from bs4 import BeautifulSoup
+    from urllib.parse import urljoin
+
+    soup = BeautifulSoup(html, 'html.parser')
+    images = []
+    image_urls = set()
+    for selector in crawler.selectors:
+        for img in soup.select(selector):
+            img_url = img.get('src') or img.get('data-src') or img.get('data-original')
+            if img_url:
+                img_url = urljoin(base_url, img_url)
+                if img_url not in image_urls:
+                    image_urls.add(img_url)
+                    image_info = {
+                        'url': img_url,
+                        'alt': img.get('alt', ''),
+                        'title': img.get('title', ''),
+                        'source_url': base_url,
+                        'selector': selector
+                    }
+                    if legacy_is_valid_image_url(crawler.config, img_url):
+                        images.append(image_info)
+    return images
+
+
+# ---------------------------------------------------------------------------
+# 측정용 데이터
+# ---------------------------------------------------------------------------
+
+def build_url_corpus(count, seed=7):
+    """CDN 샤드, 쿼리, 인코딩된 문자, 확장자 없는 경로 등이 섞인 URL 목록"""
+    rng = random.Random(seed)
+    hosts = [f"img{i}.cdn.example.com" for i in range(1, 10)] + ['example.com', 'static.example.org:8080']
+    names = ['photo', 'IMG_2024', 'thumb%20large', 'con', 'a:b|c', '사진', '___x___', 'very_long_' * 15]
+    exts = ['.jpg', '.JPEG', '.png', '.webp', '.gif', '', '.php', '.svg', '.bmp', '.']
+    urls = []
+    for i in range(count):
+        path = f"/{rng.choice(['gallery', 'i', 'media/2024/05'])}/{rng.choice(names)}{i % 97}{rng.choice(exts)}"
+        query = rng.choice(['', '?w=300', '?v=2&fmt=webp', '#frag'])
+        scheme = rng.choice(['https', 'http', 'https', ''])
+        prefix = f"{scheme}://" if scheme else '//'
+        urls.append(f"{prefix}{rng.choice(hosts)}{path}{query}")
+    return urls
+
+
+def build_html_corpus(pages, images_per_page, seed=11):
+    """갤러리 페이지 HTML 목록"""
+    rng = random.Random(seed)
+    corpus = []
+    for page in range(pages):
+        items = []
+        for i in range(images_per_page):
+            attr = rng.choice(['src', 'data-src', 'data-original'])
+            src = rng.choice([f"/img/{page}/{i}.jpg", f"https://img{i % 9}.cdn.example.com/p/{page}_{i}",
+                              f"../thumb/{i}.png?s=150"])
+            items.append(f'<div class="item"><a href="/view/{i}"><img {attr}="{src}" alt="image {i}" '
+                         f'title="t{i}"></a><span class="caption">caption {i}</span></div>')
+        nav = ''.join(f'<li><a href="/page/{p}">{p}</a></li>' for p in range(20))
+        corpus.append((f"https://example.com/page/{page}",
+                       f"<html><body><ul class='nav'>{nav}</ul><div class='gallery'>{''.join(items)}</div>"
+                       f"<footer><img src='/logo.svg' class='icon'></footer></body></html>"))
+    return corpus
+
+
+# ---------------------------------------------------------------------------
+# 측정
+# ---------------------------------------------------------------------------
+
+def measure(func, number, repeat=5):
+    """가장 빠른 1회 실행 시간 (초)"""
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number
+
+
+def compare(name, legacy, current, number, normalize=None):
+    """출력이 같은지 확인하고 속도 측정 (normalize: 비교 전에 현재 구현의 출력을 바꿀 함수)"""
+    expected = legacy()
+    actual = current()
+    if normalize is not None:
+        actual = normalize(actual)
+    if expected != actual:
+        raise AssertionError(f"{name}: 이전 구현과 결과가 다릅니다")
+
+    legacy_time = measure(legacy, number)
+    current_time = measure(current, number)
+    return {
+        'name': name,
+        'legacy_ms': round(legacy_time * 1000, 4),
+        'current_ms': round(current_time * 1000, 4),
+        'speedup': round(legacy_time / current_time, 2) if current_time else None,
+    }
+
+
+def run(number, save_path):
+    urls = build_url_corpus(2000)
+    filenames = [os.path.basename(urlparse(u).path) or u for u in urls] + ['CON.jpg', 'nul', ' .hidden. ', '']
+    html_corpus = build_html_corpus(10, 40)
+
+    results = []
+
+    for strict in (False, True):
+        config = {'strict_extensions': strict, 'save_path': save_path}
+        crawler = ImageCrawler(config)
+        results.append(compare(
+            f"_is_valid_image_url(strict={strict})",
+            lambda: [legacy_is_valid_image_url(config, u) for u in urls],
+            lambda: [crawler._is_valid_image_url(u) for u in urls],
+            number))
+
+    downloader = ImageDownloader({'save_path': save_path})
+    results.append(compare(
+        "_sanitize_filename",
+        lambda: [legacy_sanitize_filename(f) for f in filenames],
+        lambda: [downloader._sanitize_filename(f) for f in filenames],
+        number))
+
+    for pattern in (0, 2, 3):
+        config = {'filename_pattern': pattern, 'save_path': save_path}
+        downloader = ImageDownloader(config)
+        results.append(compare(
+            f"_generate_filename(pattern={pattern})",
+            lambda: [legacy_generate_filename(config, u, i) for i, u in enumerate(urls)],
+            lambda: [downloader._generate_filename(u, {}, i) for i, u in enumerate(urls)],
+            number))
+
+    downloader = ImageDownloader({'save_path': save_path})
+    results.append(compare(
+        "_get_file_path",
+        lambda: [legacy_get_file_path(save_path, True, u, 'a.jpg') for u in urls],
+        lambda: [downloader._get_file_path(u, 'a.jpg') for u in urls],
+        number))
+
+    crawler = ImageCrawler({'save_path': save_path, 'selectors': ['.gallery img', 'img']})
+    results.append(compare(
+        "_extract_images",
+        lambda: [legacy_extract_images(crawler, html, url) for url, html in html_corpus],
+        lambda: [crawler._extract_images(html, url) for url, html in html_corpus],
+        max(1, number // 20),
+        # ImageInfo 레코드는 이전 구현의 dict 와 비교
+        normalize=lambda pages: [[image.to_dict() for image in images] for images in pages]))
+
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='핫패스 마이크로 벤치마크')
+    parser.add_argument('-n', '--number', type=int, default=20, help='측정당 반복 횟수')
+    parser.add_argument('-o', '--output', help='결과 JSON 파일')
+    args = parser.parse_args(argv)
+
+    # 다운로더가 저장 폴더를 만들므로 임시 폴더 사용
+    save_path = tempfile.mkdtemp(prefix='hotpath_bench_')
+    try:
+        results = run(args.number, save_path)
+    finally:
+        shutil.rmtree(save_path, ignore_errors=True)
+
+    print(f"{'함수':<36}{'이전(ms)':>12}{'현재(ms)':>12}{'배속':>8}")
+    for r in results:
+        print(f"{r['name']:<36}{r['legacy_ms']:>12.4f}{r['current_ms']:>12.4f}{r['speedup']:>8.2f}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
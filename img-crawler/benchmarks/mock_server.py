@@ -0,0 +1,171 @@
+"""
+모의 갤러리 서버 - 성능 측정용 합성 페이지와 이미지 제공
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import random
+import time
+import urllib.request
+
+from aiohttp import web
+
+# 서버 기본 설정
+DEFAULT_OPTIONS = {
+    'images_per_page': 20,
+    'page_size_kb': 30,  # HTML 본문 크기 (패딩 포함)
+    'latency_ms': 0,  # 응답 전 대기 시간
+    'error_rate': 0.0,  # 500 응답 비율
+    'image_size_kb': (20, 200),  # 이미지 크기 범위
+    'seed': 42,
+}
+
+# 이미지 본문 앞에 붙일 JPEG 시그니처
+JPEG_HEADER = b'\xff\xd8\xff\xe0\x00\x10JFIF\x00'
+
+
+class GalleryServer:
+    """합성 갤러리 페이지와 이미지를 응답하고 서버 측 처리 시간을 기록"""
+
+    def __init__(self, options=None):
+        self.options = dict(DEFAULT_OPTIONS)
+        self.options.update(options or {})
+        self.random = random.Random(self.options['seed'])
+        self.timings = {'page': [], 'image': []}
+        self.errors = 0
+
+        # 이미지 본문은 크기별로 잘라 쓰도록 한 번만 생성
+        max_size = self.options['image_size_kb'][1] * 1024
+        self._image_pool = JPEG_HEADER + bytes(self.random.getrandbits(8) for _ in range(max_size))
+
+    def create_app(self):
+        app = web.Application()
+        app.router.add_get('/page/{page}', self.handle_page)
+        app.router.add_get('/img/{page}/{name}', self.handle_image)
+        app.router.add_get('/__stats', self.handle_stats)
+        return app
+
+    async def _simulate(self):
+        """지연 및 오류 주입 (오류면 True)"""
+        if self.options['latency_ms']:
+            await asyncio.sleep(self.options['latency_ms'] / 1000)
+        if self.options['error_rate'] and self.random.random() < self.options['error_rate']:
+            self.errors += 1
+            return True
+        return False
+
+    async def handle_page(self, request):
+        start = time.perf_counter()
+        page = request.match_info['page']
+        if await self._simulate():
+            return web.Response(status=500, text='error')
+
+        count = self.options['images_per_page']
+        items = ''.join(
+            f'<div class="item"><img src="/img/{page}/{i}.jpg" alt="image {i}" '
+            f'title="page {page} image {i}"></div>'
+            for i in range(count)
+        )
+        body = f'<html><head><title>page {page}</title></head><body><div class="gallery">{items}</div>'
+        padding = self.options['page_size_kb'] * 1024 - len(body)
+        if padding > 0:
+            body += f'<!-- {"x" * padding} -->'
+        body += '</body></html>'
+
+        response = web.Response(text=body, content_type='text/html')
+        self.timings['page'].append(time.perf_counter() - start)
+        return response
+
+    async def handle_image(self, request):
+        start = time.perf_counter()
+        key = f"{request.match_info['page']}/{request.match_info['name']}"
+        if await self._simulate():
+            return web.Response(status=500, text='error')
+
+        # 같은 URL 은 항상 같은 크기
+        low, high = self.options['image_size_kb']
+        size = random.Random(key).randint(low * 1024, high * 1024)
+        response = web.Response(body=self._image_pool[:size], content_type='image/jpeg')
+        self.timings['image'].append(time.perf_counter() - start)
+        return response
+
+    async def handle_stats(self, request):
+        return web.json_response({
+            'page_timings': self.timings['page'],
+            'image_timings': self.timings['image'],
+            'errors': self.errors,
+        })
+
+
+def _serve(options, port, ready):
+    """별도 프로세스에서 서버 실행"""
+    server = GalleryServer(options)
+    app = server.create_app()
+
+    async def main():
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, '127.0.0.1', port).start()
+        ready.set()
+        await asyncio.Event().wait()
+
+    asyncio.run(main())
+
+
+class MockServerProcess:
+    """모의 서버를 별도 프로세스로 실행 (측정 대상 프로세스의 CPU 사용량과 분리)"""
+
+    def __init__(self, options=None, port=8787):
+        self.options = options or {}
+        self.port = port
+        self.base_url = f"http://127.0.0.1:{port}"
+        ctx = multiprocessing.get_context('spawn')
+        self._ready = ctx.Event()
+        self._process = ctx.Process(target=_serve, args=(self.options, port, self._ready),
+                                    daemon=True)
+
+    def start(self, timeout=10):
+        self._process.start()
+        if not self._ready.wait(timeout):
+            self.stop()
+            raise RuntimeError("모의 서버를 시작할 수 없습니다.")
+        return self
+
+    def stats(self):
+        """서버 측 처리 시간 통계 조회"""
+        with urllib.request.urlopen(f"{self.base_url}/__stats") as response:
+            return json.load(response)
+
+    def stop(self):
+        if self._process.is_alive():
+            self._process.terminate()
+        self._process.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='성능 측정용 모의 갤러리 서버')
+    parser.add_argument('--port', type=int, default=8787)
+    parser.add_argument('--images-per-page', type=int, default=DEFAULT_OPTIONS['images_per_page'])
+    parser.add_argument('--page-size-kb', type=int, default=DEFAULT_OPTIONS['page_size_kb'])
+    parser.add_argument('--latency-ms', type=int, default=DEFAULT_OPTIONS['latency_ms'])
+    parser.add_argument('--error-rate', type=float, default=DEFAULT_OPTIONS['error_rate'])
+    parser.add_argument('--image-size-kb', type=int, nargs=2, default=DEFAULT_OPTIONS['image_size_kb'])
+    args = parser.parse_args()
+
+    options = {key: getattr(args, key) for key in DEFAULT_OPTIONS if hasattr(args, key)}
+    options['image_size_kb'] = tuple(args.image_size_kb)
+    print(f"모의 갤러리 서버: http://127.0.0.1:{args.port}/page/{{}}")
+    web.run_app(GalleryServer(options).create_app(), host='127.0.0.1', port=args.port,
+                access_log=None, print=None)
+
+
+if __name__ == "__main__":
+    main()
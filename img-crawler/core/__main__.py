@@ -0,0 +1,10 @@
+"""
+python -m core 진입점
+"""
+
+import sys
+
+from .cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
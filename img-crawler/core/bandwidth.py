@@ -0,0 +1,135 @@
+"""
+대역폭 제한 - 본문을 읽는 속도를 초당 바이트 수로 제한하는 토큰 버킷
+
+전송마다 조각을 읽을 때마다 읽은 만큼 토큰을 쓰고, 모자라면 채워질 때까지
+기다린다. 기다리는 전송은 요청한 순서대로 차례를 받으므로 동시에 받는 전송끼리
+속도를 고르게 나눈다. 읽기를 멈추면 소켓 수신 버퍼가 차서 서버도 보내는 속도를 줄인다.
+
+BandwidthLimiter 는 전체 버킷 하나와 호스트별 버킷을 함께 적용한다:
+    bandwidth_limit: 모든 전송의 합 (바이트/초, 0 이면 제한 없음)
+    host_bandwidth_limit: 호스트 하나의 전송 합 (바이트/초, 0 이면 제한 없음)
+"""
+
+import asyncio
+import time
+
+# 제한이 있을 때 본문을 나눠 읽는 최대/최소 크기 (바이트)
+READ_CHUNK = 64 * 1024
+MIN_READ_CHUNK = 4 * 1024
+
+# 이 시간(초) 동안 쓰지 않은 호스트 버킷은 정리 (오래 실행하는 작업 관리자에서 호스트가 계속 쌓이지 않도록)
+HOST_IDLE_SECONDS = 60
+
+
+class TokenBucket:
+    """초당 rate 바이트 토큰 버킷 (rate 0 이면 제한 없음, set_rate 는 실행 중에 바꿔도 됨)"""
+
+    def __init__(self, rate=0, burst=None):
+        self.rate = 0
+        self.burst = 0
+        self._tokens = 0
+        self._updated = time.monotonic()
+        self._lock = None  # asyncio.Lock (처음 기다릴 때 루프에서 생성)
+        self.set_rate(rate, burst)
+
+    def set_rate(self, rate, burst=None):
+        """초당 바이트 수 변경 (burst 생략 시 1초 분량, 최소 READ_CHUNK)"""
+        self._refill()
+        self.rate = max(0, int(rate or 0))
+        self.burst = int(burst) if burst else max(self.rate, READ_CHUNK)
+        self._tokens = min(self._tokens, self.burst)
+
+    def _refill(self):
+        now = time.monotonic()
+        if self.rate:
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def consume(self, size):
+        """size 바이트만큼 토큰 사용 (모자라면 채워질 때까지 대기)"""
+        if not self.rate:
+            return
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:  # 먼저 기다린 전송부터 차례로
+            self._refill()
+            self._tokens -= size
+            while self._tokens < 0 and self.rate:
+                # 조각이 burst 보다 커도 빚으로 남겨 다음 차례에서 갚음
+                await asyncio.sleep(-self._tokens / self.rate)
+                self._refill()
+
+
+class BandwidthLimiter:
+    """전체 + 호스트별 수신 속도 제한
+
+    버킷은 consume 을 실행하는 이벤트 루프 스레드에서만 바꾼다. set_limits 를 다른 스레드(GUI)에서
+    호출하면 그 루프에 예약해 적용한다.
+    """
+
+    def __init__(self, rate=0, host_rate=0):
+        self.total = TokenBucket(rate)
+        self.host_rate = max(0, int(host_rate or 0))
+        self._hosts = {}  # 호스트 -> TokenBucket
+        self._swept = time.monotonic()
+        self._loop = None  # consume 을 실행하는 루프 (처음 consume 할 때 기록)
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(config.get('bandwidth_limit', 0), config.get('host_bandwidth_limit', 0))
+
+    @property
+    def active(self):
+        return bool(self.total.rate or self.host_rate)
+
+    def set_limits(self, rate=None, host_rate=None):
+        """전체/호스트별 초당 바이트 수 변경 (None 은 그대로, 0 은 제한 없음, 루프 스레드가 아니면 루프에 예약)"""
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            try:
+                running = asyncio.get_running_loop()
+            except RuntimeError:
+                running = None
+            if running is not loop:
+                try:
+                    loop.call_soon_threadsafe(self._apply_limits, rate, host_rate)
+                    return
+                except RuntimeError:
+                    pass  # 루프가 그 사이 닫힘 (버킷을 쓰는 곳이 없으므로 바로 적용)
+        self._apply_limits(rate, host_rate)
+
+    def _apply_limits(self, rate, host_rate):
+        if rate is not None:
+            self.total.set_rate(rate)
+        if host_rate is not None:
+            self.host_rate = max(0, int(host_rate or 0))
+            for bucket in list(self._hosts.values()):
+                bucket.set_rate(self.host_rate)
+
+    def chunk_size(self):
+        """한 번에 읽을 크기 (가장 좁은 제한의 약 1/10초 분량)"""
+        rates = [rate for rate in (self.total.rate, self.host_rate) if rate]
+        if not rates:
+            return READ_CHUNK
+        return max(MIN_READ_CHUNK, min(READ_CHUNK, min(rates) // 10))
+
+    async def consume(self, host, size):
+        """host 에서 받은 size 바이트만큼 호스트 버킷과 전체 버킷의 토큰 사용"""
+        self._loop = asyncio.get_running_loop()
+        if self.host_rate:
+            bucket = self._hosts.get(host)
+            if bucket is None:
+                self._evict_idle()
+                bucket = self._hosts[host] = TokenBucket(self.host_rate)
+            await bucket.consume(size)
+        await self.total.consume(size)
+
+    def _evict_idle(self):
+        """HOST_IDLE_SECONDS 동안 쓰지 않고 기다리는 전송도 없는 호스트 버킷 정리"""
+        now = time.monotonic()
+        if now - self._swept < HOST_IDLE_SECONDS:
+            return
+        self._swept = now
+        for host, bucket in list(self._hosts.items()):
+            if now - bucket._updated > HOST_IDLE_SECONDS and not (bucket._lock and bucket._lock.locked()):
+                del self._hosts[host]
@@ -0,0 +1,55 @@
+"""
+작업 취소 - 진행 중인 요청까지 바로 중단하기 위한 작업 핸들 모음
+
+stop() 이 플래그만 바꾸면 이미 시작한 session.get / response.read() 는 제한 시간까지
+계속 기다린다. 크롤러와 다운로더는 만든 작업을 CancelScope 에 등록하고,
+중지 요청이 오면 (다른 스레드에서 와도) 이벤트 루프에서 모두 cancel() 한다.
+"""
+
+import asyncio
+
+
+class CancelScope:
+    """취소할 수 있는 작업 모음 (cancel() 은 어느 스레드에서 호출해도 됨)"""
+
+    def __init__(self):
+        self.cancelled = False
+        self._tasks = set()
+        self._loop = None
+
+    def spawn(self, coro):
+        """작업 생성 후 등록 (이미 취소되었으면 바로 취소된 작업)"""
+        self._loop = asyncio.get_running_loop()
+        task = self._loop.create_task(coro)
+        if self.cancelled:
+            task.cancel()
+            return task
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    def cancel(self):
+        """등록된 작업 모두 취소 (루프 스레드가 아니면 루프에 예약)"""
+        self.cancelled = True
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._cancel_all()
+            return
+        try:
+            loop.call_soon_threadsafe(self._cancel_all)
+        except RuntimeError:
+            pass  # 루프가 그 사이 닫힘
+
+    def _cancel_all(self):
+        for task in list(self._tasks):
+            task.cancel()
+
+    def __len__(self):
+        """진행 중인 작업 수"""
+        return len(self._tasks)
@@ -0,0 +1,380 @@
+"""
+명령줄 인터페이스 - PyQt 없이 크롤링 실행 (python -m core)
+"""
+
+import argparse
+import asyncio
+import json
+import signal
+import sys
+
+from .image_crawler import ImageCrawler
+from .preflight import PREFLIGHT_METHODS, PREFLIGHT_MODES
+from .profiling import CrawlProfiler
+from .sharded import ShardedCrawler
+from .sinks import OUTPUT_FORMATS
+from .url_generator import URLGenerator
+from .work_queue import open_work_queue
+
+
+def build_parser():
+    """명령줄 인자 정의 (CrawlerWidget.get_crawl_config 와 같은 설정)"""
+    parser = argparse.ArgumentParser(
+        prog='python -m core',
+        description='GUI 없이 이미지 크롤링을 실행하고 진행 상황을 JSON 으로 출력합니다.'
+    )
+    parser.add_argument('url', nargs='?', help='크롤링할 URL (반복 시 {} 패턴 포함)')
+    parser.add_argument('--config', help='크롤링 설정 JSON 파일 (명령줄 인자가 우선)')
+    parser.add_argument('-s', '--selector', dest='selectors', action='append',
+                        help='CSS 선택자 (여러 번 지정 가능, 기본값: img)')
+    parser.add_argument('--sitemap', dest='sitemap_url', nargs='?', const='auto',
+                        help='사이트맵에서 페이지 URL 가져오기 (URL 생략 시 robots.txt 의 Sitemap:, 없으면 /sitemap.xml)')
+    parser.add_argument('--sitemap-all', dest='sitemap_incremental', action='store_false', default=None,
+                        help='이전 실행 이후 바뀌지 않은(lastmod) 페이지도 모두 크롤링')
+    parser.add_argument('--robots', dest='respect_robots', action='store_true', default=None,
+                        help='robots.txt 에서 금지한 URL 은 요청하지 않음')
+    parser.add_argument('--incremental', action='store_true', default=None,
+                        help='바뀌지 않은 페이지는 이전 추출 결과를 재사용하고 새 이미지만 다운로드')
+    parser.add_argument('--state-dir',
+                        help='실행 사이의 상태 폴더 (사이트맵 기준 시각, robots.txt 캐시, 페이지 캐시, 기본값: 저장폴더/.crawl_state)')
+    parser.add_argument('--follow', dest='follow_links', action='store_true', default=None,
+                        help='페이지의 링크를 따라가며 크롤링 (같은 사이트, --max-depth 단계까지)')
+    parser.add_argument('--max-depth', type=int, help='--follow 사용 시 따라갈 링크 단계 (기본값: 2)')
+    parser.add_argument('--follow-selector', dest='follow_selectors', action='append',
+                        help='따라갈 링크 CSS 선택자 (여러 번 지정 가능, 기본값: a[href])')
+    parser.add_argument('--any-domain', dest='same_domain', action='store_false', default=None,
+                        help='--follow 사용 시 다른 사이트의 링크도 따라감')
+    parser.add_argument('--max-pages', type=int, help='--follow 사용 시 전체 페이지 수 제한')
+    parser.add_argument('--max-pages-per-host', type=int,
+                        help='--follow 사용 시 호스트별 페이지 수 제한')
+    parser.add_argument('--frontier', dest='frontier_path',
+                        help='링크 대기열 SQLite 파일 (지정하면 중단 후 이어서 진행)')
+    parser.add_argument('-o', '--save-path', help='저장 경로 (기본값: downloads)')
+    parser.add_argument('--start', dest='start_value', type=int, help='반복 시작값')
+    parser.add_argument('--end', dest='end_value', type=int, help='반복 끝값')
+    parser.add_argument('--step', dest='step_value', type=int, help='반복 증가값')
+    parser.add_argument('-c', '--concurrent', type=int, help='동시 연결 수')
+    parser.add_argument('--http2', action='store_true', default=None,
+                        help='HTTP/2 로 호스트마다 연결 하나에 요청 다중화 (httpx[http2] 필요)')
+    parser.add_argument('--dns-ttl', dest='dns_cache_ttl', type=int,
+                        help='DNS 조회 결과 캐시 시간 (초, 기본값: 300, 0 이면 사용 안 함)')
+    parser.add_argument('--no-preconnect', dest='preconnect', action='store_false', default=None,
+                        help='크롤링 중 새 이미지 호스트에 미리 연결하지 않음')
+    parser.add_argument('--bandwidth-limit', type=float,
+                        help='이미지 수신 속도 합 제한 (KB/초, --jobs 사용 시 모든 작업의 합, 기본값: 제한 없음)')
+    parser.add_argument('--host-bandwidth-limit', type=float,
+                        help='호스트 하나에서 받는 이미지 수신 속도 제한 (KB/초, 기본값: 제한 없음)')
+    parser.add_argument('--overwrite', action='store_true', default=None,
+                        help='기존 파일 덮어쓰기')
+    parser.add_argument('--no-subfolder', dest='create_subfolder', action='store_false',
+                        default=None, help='도메인별 하위 폴더를 만들지 않음')
+    parser.add_argument('--no-verify-content', dest='verify_content', action='store_false',
+                        default=None, help='받은 내용이 이미지인지 확인하지 않음 (URL 확장자만 사용)')
+    parser.add_argument('--max-size-mb', dest='max_file_size_mb', type=float,
+                        help='이보다 큰 이미지는 받지 않음 (MB)')
+    parser.add_argument('--min-width', type=int, help='가로가 이보다 작은 이미지는 받지 않음 (픽셀)')
+    parser.add_argument('--min-height', type=int, help='세로가 이보다 작은 이미지는 받지 않음 (픽셀)')
+    parser.add_argument('--type', dest='allowed_types', action='append',
+                        help='받을 이미지 형식 (jpeg, png, webp ..., 여러 번 지정 가능)')
+    parser.add_argument('--dedupe-etag', action='store_true', default=None,
+                        help='ETag 와 크기가 같은 이미지는 한 번만 받음')
+    parser.add_argument('--preflight', choices=PREFLIGHT_MODES,
+                        help='본문 전에 앞부분만 받아 조건 확인 (기본값: auto, 이득일 때만)')
+    parser.add_argument('--preflight-method', choices=PREFLIGHT_METHODS,
+                        help='사전 확인 요청 (range: 앞부분 1KB, head: 헤더만)')
+    parser.add_argument('--output-format', choices=sorted(OUTPUT_FORMATS),
+                        help='저장 형식 (files: 이미지마다 파일, tar: 묶음 파일과 색인)')
+    parser.add_argument('--pack-shard-mb', type=int,
+                        help='tar 형식에서 묶음 파일 하나의 최대 크기 (MB, 기본값: 1024)')
+    parser.add_argument('--io-workers', type=int,
+                        help='파일 저장에 사용할 스레드 수 (기본값: 4)')
+    parser.add_argument('--fsync', action='store_true', default=None,
+                        help='파일마다 fsync 로 디스크 기록 보장 (느림)')
+    parser.add_argument('--progress-interval', type=float,
+                        help='진행 상황 출력 주기 (초, 기본값: 0.5)')
+    parser.add_argument('-w', '--workers', type=int, default=1,
+                        help='반복 범위를 나눠 실행할 프로세스 수 (기본값: 1)')
+    parser.add_argument('--jobs',
+                        help='여러 크롤링을 한 프로세스에서 동시에 실행할 작업 목록 JSON 파일 '
+                             '(설정 객체의 배열, 각 항목에 priority 지정 가능)')
+    parser.add_argument('--max-jobs', type=int, default=4,
+                        help='--jobs 사용 시 동시에 실행할 작업 수 (기본값: 4, 나머지는 대기열)')
+    parser.add_argument('--max-connections', type=int, default=16,
+                        help='--jobs 사용 시 모든 작업이 나눠 쓰는 동시 요청 수 (기본값: 16)')
+    parser.add_argument('--queue',
+                        help='분산 실행용 작업 대기열 (sqlite:///경로 또는 memory://)')
+    parser.add_argument('--role', choices=('coordinator', 'worker'), default='worker',
+                        help='--queue 사용 시 역할 (coordinator: 작업 등록 및 감시)')
+    parser.add_argument('--pages-per-task', type=int, default=50,
+                        help='작업 하나에 포함할 페이지 수 (기본값: 50)')
+    parser.add_argument('--metrics-port', type=int,
+                        help='Prometheus 메트릭 엔드포인트 포트 (http://127.0.0.1:포트/metrics)')
+    parser.add_argument('--metrics-file', help='메트릭 JSON 스냅샷을 주기적으로 저장할 파일')
+    parser.add_argument('--metrics-interval', type=float,
+                        help='메트릭 파일 저장 주기 (초, 기본값: 5)')
+    parser.add_argument('--profile', dest='profile_dir',
+                        help='프로파일링 결과를 저장할 폴더 (cProfile, 느린 콜백, tracemalloc)')
+    parser.add_argument('--slow-callback-ms', type=float,
+                        help='--profile 사용 시 느린 콜백으로 기록할 기준 (밀리초, 기본값: 100)')
+    parser.add_argument('--show-images', action='store_true',
+                        help='발견된 이미지 URL 을 모두 출력')
+    return parser
+
+
+def build_config(args):
+    """설정 파일과 명령줄 인자를 합쳐 크롤링 설정 생성"""
+    config = {
+        'selectors': ['img'],
+        'save_path': 'downloads',
+        'overwrite': False,
+        'create_subfolder': True,
+        'repeat_enabled': False,
+        'start_value': 1,
+        'end_value': 10,
+        'step_value': 1,
+        'concurrent': 3,
+        'progress_interval': 0.5,
+    }
+
+    file_config = {}
+    if args.config:
+        with open(args.config, 'r', encoding='utf-8') as f:
+            file_config = json.load(f)
+    config.update(file_config)
+
+    if args.url:
+        config['url'] = args.url
+
+    for key in ('selectors', 'save_path', 'start_value', 'end_value', 'step_value',
+                'sitemap_url', 'sitemap_incremental', 'respect_robots', 'incremental', 'state_dir',
+                'follow_links', 'max_depth', 'follow_selectors', 'same_domain',
+                'max_pages', 'max_pages_per_host', 'frontier_path',
+                'concurrent', 'http2', 'dns_cache_ttl', 'preconnect',
+                'overwrite', 'create_subfolder', 'verify_content',
+                'max_file_size_mb', 'min_width', 'min_height', 'allowed_types', 'dedupe_etag',
+                'preflight', 'preflight_method', 'output_format',
+                'pack_shard_mb', 'io_workers', 'fsync',
+                'progress_interval',
+                'metrics_port', 'metrics_file', 'metrics_interval',
+                'profile_dir', 'slow_callback_ms'):
+        value = getattr(args, key)
+        if value is not None:
+            config[key] = value
+
+    # 수신 속도 제한은 KB/초로 받아 바이트/초로 저장
+    for key in ('bandwidth_limit', 'host_bandwidth_limit'):
+        value = getattr(args, key)
+        if value is not None:
+            config[key] = int(value * 1024)
+
+    # 설정 파일에 지정되지 않았으면 URL 에 {} 패턴이 있을 때 반복 크롤링
+    if 'repeat_enabled' not in file_config:
+        config['repeat_enabled'] = '{}' in config.get('url', '')
+
+    return config
+
+
+def print_event(event, **data):
+    """이벤트 한 건을 JSON 한 줄로 출력"""
+    data['event'] = event
+    sys.stdout.write(json.dumps(data, ensure_ascii=False) + '\n')
+    sys.stdout.flush()
+
+
+def connect_output(crawler, show_images=False):
+    """크롤러 이벤트를 JSON 출력에 연결"""
+    crawler.events.on('progress', lambda percentage, message: print_event(
+        'progress', percentage=percentage, message=message))
+    crawler.events.on('snapshot', lambda snapshot: print_event(
+        'snapshot', **snapshot.to_dict()))
+    if show_images:
+        crawler.events.on('images_found', lambda images: print_event(
+            'images_found', urls=[img['url'] for img in images]))
+
+
+async def run_crawl(crawler):
+    """Ctrl+C 로 중지할 수 있도록 시그널을 연결하고 크롤링 실행"""
+    loop = asyncio.get_running_loop()
+    try:
+        loop.add_signal_handler(signal.SIGINT, crawler.stop)
+    except (NotImplementedError, RuntimeError):
+        pass  # Windows 는 KeyboardInterrupt 로 처리
+    return await crawler.crawl()
+
+
+def run_sharded(config, workers):
+    """여러 프로세스로 나눠 크롤링"""
+    crawler = ShardedCrawler(config, workers)
+    connect_output(crawler)
+    crawler.events.on('shard_finished', lambda shard_id, statistics: print_event(
+        'shard_finished', shard=shard_id, statistics=statistics))
+
+    try:
+        results = crawler.run()
+    except Exception as e:
+        print_event('error', message=str(e))
+        return 1
+
+    for error in crawler.errors:
+        print_event('error', message=error)
+
+    print_event('finished', statistics=crawler.get_statistics(),
+                results=len(results))
+    return 1 if crawler.errors else 0
+
+
+def run_jobs(args, config):
+    """작업 목록을 한 이벤트 루프와 연결 풀에서 동시에 실행"""
+    from .job_manager import JobManager
+
+    with open(args.jobs, 'r', encoding='utf-8') as f:
+        entries = json.load(f)
+
+    # 세션과 DNS 캐시는 모든 작업이 공유하므로 전송 설정은 명령줄/설정 파일 값 하나만 사용
+    manager_config = {key: config[key] for key in ('http2', 'dns_cache_ttl', 'bandwidth_limit',
+                                                   'host_bandwidth_limit') if key in config}
+    manager_config.update({
+        'max_jobs': args.max_jobs,
+        'max_connections': args.max_connections,
+    })
+    manager = JobManager(manager_config)
+    manager.events.on('job_started', lambda job: print_event(
+        'job_started', job=job.job_id, url=job.config.get('url', ''), priority=job.priority))
+    manager.events.on('job_snapshot', lambda job_id, snapshot: print_event(
+        'snapshot', job=job_id, **snapshot.to_dict()))
+    manager.events.on('job_finished', lambda job: print_event(
+        'job_finished', job=job.job_id, state=job.state, error=job.error,
+        statistics=job.statistics, results=len(job.results)))
+
+    for entry in entries:
+        job_config = dict(config)
+        job_config.update(entry)
+        if 'repeat_enabled' not in entry:
+            job_config['repeat_enabled'] = '{}' in job_config.get('url', '')
+        priority = job_config.pop('priority', 0)
+        manager.submit(job_config, priority)
+
+    async def run_manager():
+        loop = asyncio.get_running_loop()
+        try:
+            loop.add_signal_handler(signal.SIGINT, manager.close)
+        except (NotImplementedError, RuntimeError):
+            pass
+        return await manager.run()
+
+    try:
+        jobs = asyncio.run(run_manager())
+    except KeyboardInterrupt:
+        return 130
+
+    failed = [job for job in jobs if job.state == 'failed']
+    print_event('finished', jobs=len(jobs), failed=len(failed),
+                results=sum(len(job.results) for job in jobs))
+    return 1 if failed else 0
+
+
+def run_distributed(args, config):
+    """공유 대기열을 사용하는 조정자 또는 작업자 실행"""
+    from .distributed import DistributedCoordinator, DistributedWorker
+
+    work_queue = open_work_queue(args.queue)
+    try:
+        if args.role == 'coordinator':
+            if not config.get('url'):
+                print_event('error', message='조정자는 URL 이 필요합니다.')
+                return 2
+            if config.get('follow_links'):
+                print_event('error', message='--follow 는 --queue 와 함께 사용할 수 없습니다.')
+                return 2
+            coordinator = DistributedCoordinator(config, work_queue, args.pages_per_task)
+            print_event('submitted', tasks=coordinator.submit())
+            coordinator.events.on('queue_status', lambda status: print_event(
+                'queue_status', **status))
+            coordinator.events.on('requeued', lambda count: print_event(
+                'requeued', tasks=count))
+            try:
+                results = coordinator.run()
+            except KeyboardInterrupt:
+                return 130
+            print_event('finished', status=work_queue.status(), results=len(results))
+            return 0
+
+        # 작업자: 설정은 대기열에서 받고, 명령줄에서 지정한 값만 덮어씀
+        overrides = {key: value for key, value in vars(args).items()
+                     if key in ('save_path', 'concurrent', 'http2', 'overwrite', 'create_subfolder',
+                                'output_format', 'pack_shard_mb', 'io_workers', 'fsync',
+                                'progress_interval') and value is not None}
+        # 수신 속도 제한은 바이트/초로 바꾼 값 (작업자마다 적용)
+        overrides.update({key: config[key] for key in ('bandwidth_limit', 'host_bandwidth_limit')
+                          if getattr(args, key) is not None})
+        worker = DistributedWorker(work_queue, overrides)
+        worker.events.on('task_started', lambda task_id, payload: print_event(
+            'task_started', task=task_id, **payload))
+        worker.events.on('task_finished', lambda task_id, statistics: print_event(
+            'task_finished', task=task_id, statistics=statistics))
+        worker.events.on('task_failed', lambda task_id, error: print_event(
+            'task_failed', task=task_id, error=error))
+
+        async def run_worker():
+            loop = asyncio.get_running_loop()
+            try:
+                loop.add_signal_handler(signal.SIGINT, worker.stop)
+            except (NotImplementedError, RuntimeError):
+                pass
+            return await worker.run()
+
+        completed = asyncio.run(run_worker())
+        print_event('finished', worker=worker.worker_id, tasks=completed)
+        return 0
+    finally:
+        work_queue.close()
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    config = build_config(args)
+
+    if args.queue:
+        return run_distributed(args, config)
+
+    if args.jobs:
+        return run_jobs(args, config)
+
+    if not config.get('url') and config.get('sitemap_url') in (None, 'auto'):
+        parser.error('URL 을 지정하거나 --config 파일에 url 을 포함해주세요.')
+
+    if args.workers > 1:
+        if config.get('follow_links'):
+            parser.error('--follow 는 -w 와 함께 사용할 수 없습니다 (링크 대기열은 프로세스 하나에서 관리).')
+        if config.get('sitemap_url') or URLGenerator(config).split_ranges(args.workers) == [{}]:
+            parser.error('-w 는 반복 범위({} 가 있는 URL 패턴)만 나눌 수 있습니다 '
+                         '(사이트맵이나 단일 URL 은 프로세스 하나로 실행해주세요).')
+        return run_sharded(config, args.workers)
+
+    crawler = ImageCrawler(config)
+    connect_output(crawler, args.show_images)
+    profiler = CrawlProfiler.from_config(config)
+    if profiler:
+        profiler.attach(crawler)
+
+    try:
+        if profiler:
+            results = profiler.run(run_crawl(crawler))
+        else:
+            results = asyncio.run(run_crawl(crawler))
+    except KeyboardInterrupt:
+        print_event('stopped', statistics=crawler.get_statistics())
+        return 130
+    except Exception as e:
+        print_event('error', message=str(e))
+        return 1
+
+    if profiler and profiler.summary:
+        print_event('profile', output_dir=profiler.output_dir,
+                    blocking=profiler.summary['blocking_by_category_s'],
+                    slow_callbacks=profiler.summary['slow_callbacks']['top'][:5])
+
+    print_event('finished', statistics=crawler.get_statistics(),
+                results=len(results), timings=crawler.get_timing_summary())
+    return 0
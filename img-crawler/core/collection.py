@@ -0,0 +1,232 @@
+"""
+이미지 모음 읽기 - 저장 폴더(개별 파일, tar 묶음)를 색인으로 조회하고 mmap 으로 읽기
+
+크롤링이 끝난 뒤 미리보기나 학습 파이프라인이 파일마다 open/stat 하지 않도록
+크기, 형식, 원본 페이지, 이미지 크기는 색인(*.index.jsonl)에서 한 번에 조회하고
+이미지 바이트는 mmap 기반 memoryview 로 돌려준다.
+
+사용법:
+    python -m core.collection 저장폴더            # 요약 출력
+    python -m core.collection 저장폴더 --rebuild  # 색인 없는 파일을 찾아 색인에 추가
+"""
+
+import argparse
+import glob
+import mmap
+import os
+import random
+import sys
+from collections import OrderedDict
+
+from .file_writer import PART_SUFFIX
+from .image_types import describe_image
+from .pack import INDEX_SUFFIX, append_index, read_index
+
+# 색인을 만들 때 형식/크기 확인을 위해 읽는 앞부분 길이 (JPEG 는 SOF 가 뒤에 있을 수 있음)
+HEADER_READ_BYTES = 64 * 1024
+
+# metadata() 기본 필드
+METADATA_FIELDS = ('url', 'name', 'length', 'type', 'width', 'height', 'source_url')
+
+
+class ImageCollection:
+    """저장 폴더의 이미지 모음
+
+    색인 파일이 하나도 없으면 (이전 버전으로 받은 폴더) 처음 열 때 한 번 색인을 만든다.
+    """
+
+    def __init__(self, directory, max_open_files=256):
+        self.directory = directory
+        self.max_open_files = max_open_files
+        self.entries = {}  # name -> 색인 항목 (같은 이름은 나중 것)
+        self.by_url = {}  # url -> 색인 항목
+        self._shard_maps = {}  # shard -> mmap
+        self._file_maps = OrderedDict()  # name -> mmap (최근 사용 순, max_open_files 개까지)
+
+        index_paths = self._index_paths()
+        if not index_paths:
+            self.build_index()
+            index_paths = self._index_paths()
+        for index_path in index_paths:
+            for entry in read_index(index_path):
+                self._add_entry(entry)
+
+    def _index_paths(self):
+        return sorted(glob.glob(os.path.join(glob.escape(self.directory), f"*{INDEX_SUFFIX}")))
+
+    def _add_entry(self, entry):
+        self.entries[entry['name']] = entry
+        if entry.get('url'):
+            self.by_url[entry['url']] = entry
+
+    def build_index(self):
+        """색인에 없는 개별 파일을 찾아 files.index.jsonl 에 추가 (추가한 개수 반환)"""
+        known = {name for name, entry in self.entries.items() if 'shard' not in entry}
+        new_entries = []
+        for root, _, files in os.walk(self.directory):
+            for filename in files:
+                path = os.path.join(root, filename)
+                name = os.path.relpath(path, self.directory).replace(os.sep, '/')
+                if name in known or filename.endswith((INDEX_SUFFIX, '.tar', '.tmp', PART_SUFFIX)):
+                    continue
+                try:
+                    with open(path, 'rb') as f:
+                        head = f.read(HEADER_READ_BYTES)
+                        stat = os.fstat(f.fileno())
+                except OSError:
+                    continue
+                info = describe_image(head)
+                if info['type'] is None:
+                    continue  # 이미지가 아닌 파일
+                new_entries.append(dict(info, name=name, url='', source_url='',
+                                        length=stat.st_size, mtime=int(stat.st_mtime)))
+
+        append_index(os.path.join(self.directory, f"files{INDEX_SUFFIX}"), new_entries)
+        for entry in new_entries:
+            self._add_entry(entry)
+        return len(new_entries)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __iter__(self):
+        return iter(self.entries.values())
+
+    def __contains__(self, url):
+        return url in self.by_url
+
+    def get(self, url):
+        """URL 로 색인 항목 조회 (없으면 None)"""
+        return self.by_url.get(url)
+
+    def metadata(self, urls=None, fields=METADATA_FIELDS):
+        """여러 이미지의 메타데이터를 파일을 열지 않고 조회"""
+        entries = self.entries.values() if urls is None else filter(None, map(self.by_url.get, urls))
+        return [{field: entry.get(field) for field in fields} for entry in entries]
+
+    def select(self, mime=None, min_width=0, min_height=0, source_url=None):
+        """조건에 맞는 색인 항목 목록"""
+        selected = []
+        for entry in self.entries.values():
+            if mime and entry.get('type') != mime:
+                continue
+            if min_width and (entry.get('width') or 0) < min_width:
+                continue
+            if min_height and (entry.get('height') or 0) < min_height:
+                continue
+            if source_url and entry.get('source_url') != source_url:
+                continue
+            selected.append(entry)
+        return selected
+
+    def read(self, url_or_entry):
+        """이미지 바이트 (mmap 기반 memoryview, 복사 없음)"""
+        entry = self.by_url.get(url_or_entry) if isinstance(url_or_entry, str) else url_or_entry
+        if entry is None:
+            return None
+        if 'shard' in entry:
+            start = entry['offset']
+            return memoryview(self._map_shard(entry['shard']))[start:start + entry['length']]
+        mapped = self._map_file(entry['name'])
+        return memoryview(mapped) if mapped is not None else memoryview(b'')
+
+    def _map_shard(self, shard):
+        mapped = self._shard_maps.get(shard)
+        if mapped is None:
+            mapped = self._shard_maps[shard] = _map(os.path.join(self.directory, shard))
+        return mapped
+
+    def _map_file(self, name):
+        mapped = self._file_maps.get(name)
+        if mapped is not None:
+            self._file_maps.move_to_end(name)
+            return mapped
+
+        mapped = _map(os.path.join(self.directory, *name.split('/')))
+        if mapped is None:
+            return None
+        self._file_maps[name] = mapped
+        if len(self._file_maps) > self.max_open_files:
+            _, oldest = self._file_maps.popitem(last=False)
+            _close_map(oldest)
+        return mapped
+
+    def iter_images(self, entries=None, batch_size=None, shuffle=False, seed=None):
+        """(색인 항목, memoryview) 순회 (batch_size 지정 시 목록 단위)
+
+        섞지 않으면 묶음 파일 안의 위치 순서로 읽어 디스크를 순차적으로 접근한다.
+        """
+        entries = list(self.entries.values() if entries is None else entries)
+        if shuffle:
+            random.Random(seed).shuffle(entries)
+        else:
+            entries.sort(key=lambda e: (e.get('shard', ''), e.get('offset', 0), e['name']))
+
+        batch = []
+        for entry in entries:
+            item = (entry, self.read(entry))
+            if batch_size is None:
+                yield item
+                continue
+            batch.append(item)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def close(self):
+        """mmap 해제 (반환한 memoryview 를 모두 놓은 뒤 호출)"""
+        for mapped in list(self._shard_maps.values()) + list(self._file_maps.values()):
+            _close_map(mapped)
+        self._shard_maps = {}
+        self._file_maps = OrderedDict()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _map(path):
+    """읽기 전용 mmap (빈 파일이나 없는 파일은 None)"""
+    try:
+        with open(path, 'rb') as f:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+
+
+def _close_map(mapped):
+    try:
+        mapped.close()
+    except BufferError:
+        pass  # 아직 사용 중인 memoryview 가 있으면 GC 에 맡김
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m core.collection',
+                                     description='저장 폴더의 이미지 색인 요약 및 생성')
+    parser.add_argument('directory', help='크롤링 저장 폴더')
+    parser.add_argument('--rebuild', action='store_true', help='색인 없는 파일을 찾아 색인에 추가')
+    args = parser.parse_args(argv)
+
+    with ImageCollection(args.directory) as collection:
+        if args.rebuild:
+            print(f"색인에 추가: {collection.build_index()}개")
+
+        types = {}
+        total_size = 0
+        for entry in collection:
+            types[entry.get('type')] = types.get(entry.get('type'), 0) + 1
+            total_size += entry.get('length', 0)
+
+        print(f"이미지: {len(collection)}개, {total_size / (1024 * 1024):.1f} MB")
+        for mime, count in sorted(types.items(), key=lambda item: -item[1]):
+            print(f"  {mime or '알 수 없음'}: {count}개")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,40 +6,58 @@ import asyncio
 import time
 from PyQt5.QtCore import QThread, pyqtSignal
 from .image_crawler import ImageCrawler
+from .job_manager import JobManager
+from .profiling import CrawlProfiler
 
 
 class CrawlerThread(QThread):
     # 신호 정의
     progress = pyqtSignal(int, str)  # 진행률(%), 메시지
+    snapshot = pyqtSignal(object)  # ProgressSnapshot
     images_found = pyqtSignal(list)  # 발견된 이미지 목록
     finished_signal = pyqtSignal(list)  # 완료된 결과
     error = pyqtSignal(str)  # 에러 메시지
+    paused = pyqtSignal(bool)  # 일시정지(True) / 재개(False)
     
     def __init__(self, config):
         super().__init__()
         self.config = config
         self.crawler = None
+        self.profile_summary = None  # 프로파일링 결과 요약 (profile_dir 설정 시)
         self._stop_requested = False
+        self._pause_requested = False
         
     def run(self):
         """스레드 실행"""
         try:
-            self._stop_requested = False
-            
-            # 크롤러 인스턴스 생성
+            # 크롤러 인스턴스 생성 (그 사이 중지 요청이 왔으면 바로 중지 상태로)
             self.crawler = ImageCrawler(self.config)
+            if self._stop_requested:
+                self.crawler.stop()
+            elif self._pause_requested:
+                self.crawler.pause()
             
-            # 신호 연결
-            self.crawler.progress_updated.connect(self.progress.emit)
-            self.crawler.images_found.connect(self.images_found.emit)
+            # 크롤러 이벤트를 Qt 신호로 연결
+            self.crawler.events.on('progress', self.progress.emit)
+            self.crawler.events.on('snapshot', self.snapshot.emit)
+            self.crawler.events.on('images_found', self.images_found.emit)
             
             # 이벤트 루프 생성 및 크롤링 실행
             loop = asyncio.new_event_loop()
             asyncio.set_event_loop(loop)
             
+            # 설정에 profile_dir 이 있으면 프로파일링하며 실행
+            profiler = CrawlProfiler.from_config(self.config)
+            
             try:
                 # 비동기 크롤링 실행
-                results = loop.run_until_complete(self.crawler.crawl())
+                if profiler:
+                    profiler.attach(self.crawler)
+                    with profiler.profile(loop):
+                        results = loop.run_until_complete(self.crawler.crawl())
+                    self.profile_summary = profiler.summary
+                else:
+                    results = loop.run_until_complete(self.crawler.crawl())
                 
                 if not self._stop_requested:
                     self.finished_signal.emit(results)
@@ -54,11 +72,88 @@ class CrawlerThread(QThread):
             self.error.emit(f"스레드 초기화 오류: {str(e)}")
             
     def stop(self):
-        """크롤링 중지"""
+        """크롤링 중지 (GUI 스레드에서 호출, 기다리지 않음 - 스레드가 끝나면 finished 신호)"""
         self._stop_requested = True
         if self.crawler:
-            self.crawler.stop()
+            self.crawler.stop()  # 진행 중인 요청은 크롤러 이벤트 루프에서 취소
             
+    def pause(self):
+        """일시정지 (연결 풀, 대기 중인 페이지/이미지, 중복 제거 상태는 유지)"""
+        self._pause_requested = True
+        if self.crawler:
+            self.crawler.pause()
+        self.paused.emit(True)
+        
+    def resume(self):
+        """일시정지한 자리에서 이어서 진행"""
+        self._pause_requested = False
+        if self.crawler:
+            self.crawler.resume()
+        self.paused.emit(False)
+        
+    def is_paused(self):
+        return self._pause_requested
+        
+    def set_bandwidth_limit(self, rate, host_rate):
+        """이미지 수신 속도 제한 변경 (바이트/초, 0 이면 제한 없음) - 받는 중인 전송에도 적용"""
+        self.config['bandwidth_limit'] = rate
+        self.config['host_bandwidth_limit'] = host_rate
+        if self.crawler:
+            self.crawler.set_bandwidth_limit(rate, host_rate)
+        
     def is_stop_requested(self):
         """중지 요청 확인"""
-        return self._stop_requested 
\ No newline at end of file
+        return self._stop_requested
+
+
+class JobManagerThread(QThread):
+    """대기열에 추가한 크롤링 작업들을 한 이벤트 루프와 연결 풀에서 실행하는 스레드
+
+    작업이 없어도 stop() 전까지 이벤트 루프와 세션을 유지하며 새 작업을 기다린다.
+    """
+    job_started = pyqtSignal(int, str)  # 작업 번호, URL
+    job_finished = pyqtSignal(int, str, list)  # 작업 번호, 상태(done/failed/cancelled), 결과
+    job_error = pyqtSignal(int, str)  # 작업 번호, 에러 메시지
+
+    def __init__(self, config=None):
+        super().__init__()
+        self.manager = JobManager(config)
+        self.manager.events.on('job_started', lambda job: self.job_started.emit(
+            job.job_id, job.config.get('url', '')))
+        self.manager.events.on('job_finished', self._on_job_finished)
+
+    def _on_job_finished(self, job):
+        if job.state == 'failed':
+            self.job_error.emit(job.job_id, f"크롤링 중 오류 발생: {job.error}")
+        self.job_finished.emit(job.job_id, job.state, job.results)
+
+    def run(self):
+        """스레드 실행 (stop() 까지)"""
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(self.manager.run(keep_alive=True))
+        except Exception as e:
+            print(f"작업 관리자 오류: {e}")
+        finally:
+            loop.close()
+
+    def submit(self, config, priority=0):
+        """작업 추가 (GUI 스레드에서 호출, 작업 번호 반환)"""
+        return self.manager.submit(config, priority).job_id
+
+    def set_limits(self, max_jobs, max_connections):
+        """동시 작업 수 / 모든 작업이 나눠 쓰는 동시 요청 수 변경 (실행 중에도 적용)"""
+        self.manager.set_limits(max_jobs, max_connections)
+
+    def set_bandwidth_limit(self, rate, host_rate):
+        """모든 작업이 공유하는 수신 속도 제한 변경 (바이트/초, 0 이면 제한 없음)"""
+        self.manager.set_bandwidth_limit(rate, host_rate)
+
+    def active_jobs(self):
+        """대기 중이거나 실행 중인 작업 수"""
+        return sum(1 for job in self.manager.jobs.values() if job.state in ('queued', 'running'))
+
+    def stop(self):
+        """대기 중인 작업은 취소하고 실행 중인 작업을 중지 (기다리지 않음)"""
+        self.manager.close()
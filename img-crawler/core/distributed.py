@@ -0,0 +1,184 @@
+"""
+분산 크롤링 - 공유 작업 대기열을 통한 조정자/작업자 실행
+"""
+
+import asyncio
+import json
+import math
+import os
+import socket
+import time
+import uuid
+
+from .events import EventEmitter
+from .image_crawler import ImageCrawler
+from .sharded import SHARD_INDEX_STRIDE
+from .url_generator import URLGenerator
+
+
+class DistributedCoordinator:
+    """반복 범위를 작업 단위로 나눠 대기열에 넣고 전체 진행 상황을 감시
+
+    이벤트:
+        queue_status (dict): 상태별 작업 수 (poll_interval 마다)
+        requeued (int): 임대 만료로 다시 대기열에 들어간 작업 수
+    """
+
+    def __init__(self, config, work_queue, pages_per_task=50):
+        self.config = config
+        self.work_queue = work_queue
+        self.pages_per_task = pages_per_task
+        self.events = EventEmitter()
+        self._stop_requested = False
+
+    def submit(self):
+        """설정과 작업 목록을 대기열에 등록하고 작업 수 반환
+
+        같은 설정의 작업이 이미 있으면 (조정자 재시작) 다시 등록하지 않고 기존 작업을 이어서 감시한다.
+        """
+        status = self.work_queue.status()
+        queued = sum(status[state] for state in ('pending', 'leased', 'done', 'failed'))
+        if queued and self.work_queue.get_config() == json.loads(json.dumps(self.config)):
+            return queued
+
+        generator = URLGenerator(self.config)
+        num_tasks = math.ceil(generator.get_url_count() / self.pages_per_task)
+        ranges = generator.split_ranges(num_tasks)
+
+        self.work_queue.set_config(self.config)
+        self.work_queue.add_tasks(ranges)
+        return len(ranges)
+
+    def run(self, poll_interval=2.0):
+        """모든 작업이 끝날 때까지 만료된 임대를 회수하며 대기 후 합쳐진 결과 반환"""
+        while not self._stop_requested:
+            requeued = self.work_queue.requeue_expired()
+            if requeued:
+                self.events.emit('requeued', requeued)
+
+            status = self.work_queue.status()
+            self.events.emit('queue_status', status)
+            if status['pending'] == 0 and status['leased'] == 0:
+                break
+            time.sleep(poll_interval)
+
+        return self.work_queue.get_results()
+
+    def stop(self):
+        """감시 중지 (작업자는 계속 실행됨)"""
+        self._stop_requested = True
+
+
+class DistributedWorker:
+    """대기열에서 범위를 하나씩 임대해 크롤링하는 작업자
+
+    다른 작업자가 이미 맡은 이미지 URL 은 다운로드하지 않으며,
+    임대는 lease_seconds / 3 주기로 연장한다. 대기열 호출은 잠긴 DB 를 기다리는 동안
+    다운로드와 페이지 요청이 멈추지 않도록 실행기 스레드에서 한다.
+
+    이벤트:
+        task_started (task_id, payload)
+        task_finished (task_id, statistics)
+        task_failed (task_id, error)
+        snapshot (ProgressSnapshot): 현재 작업의 진행 상황
+    """
+
+    def __init__(self, work_queue, overrides=None, worker_id=None,
+                 lease_seconds=60.0, poll_interval=2.0, max_attempts=3):
+        self.work_queue = work_queue
+        self.overrides = overrides or {}
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.events = EventEmitter()
+        self.crawler = None
+        self.completed_tasks = 0
+        self._stop_requested = False
+
+    async def run(self):
+        """대기열이 빌 때까지 작업 처리"""
+        base_config = await self._queue_call(self.work_queue.get_config)
+        base_config.update(self.overrides)
+
+        while not self._stop_requested:
+            claimed = await self._queue_call(self.work_queue.claim, self.worker_id, self.lease_seconds)
+            if claimed is None:
+                if await self._queue_call(self.work_queue.is_finished):
+                    break
+                # 다른 작업자가 처리 중인 작업의 임대 만료를 기다림
+                await asyncio.sleep(self.poll_interval)
+                continue
+
+            task_id, payload = claimed
+            await self._run_task(base_config, task_id, payload)
+
+        return self.completed_tasks
+
+    def _queue_call(self, func, *args):
+        """대기열 호출을 실행기 스레드에서 실행 (이벤트 루프를 막지 않음)"""
+        return asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+    async def _run_task(self, base_config, task_id, payload):
+        """임대한 범위 하나 크롤링"""
+        config = dict(base_config)
+        config.update(payload)
+        config['index_offset'] = task_id * SHARD_INDEX_STRIDE
+        # 묶음 파일과 색인은 작업자마다 따로 (같은 폴더를 공유해도 겹치지 않도록)
+        config['output_suffix'] = f"{config.get('output_suffix', '')}-{self.worker_id}"
+
+        self.crawler = ImageCrawler(config)
+        self.crawler.events.on('snapshot', lambda snapshot: self.events.emit('snapshot', snapshot))
+        self.crawler.download_filters.append(
+            lambda images: self._claim_images(task_id, images))
+        self.events.emit('task_started', task_id, payload)
+
+        heartbeat = asyncio.ensure_future(self._heartbeat(task_id))
+        try:
+            results = await self.crawler.crawl()
+        except Exception as e:
+            await self._queue_call(self.work_queue.fail, task_id, self.worker_id, str(e), self.max_attempts)
+            self.events.emit('task_failed', task_id, str(e))
+            return
+        finally:
+            lease_lost = heartbeat.done()
+            heartbeat.cancel()
+
+        if lease_lost:
+            # 이미 다른 작업자에게 넘어간 작업: 받은 결과만 저장
+            await self._queue_call(self.work_queue.record_results, [r for r in results if r.get('success')])
+            return
+
+        if self._stop_requested:
+            # 중지된 작업은 다른 작업자가 이어받도록 반환
+            await self._queue_call(self.work_queue.record_results, [r for r in results if r.get('success')])
+            await self._queue_call(self.work_queue.fail, task_id, self.worker_id, 'worker stopped',
+                                   self.max_attempts + 1)
+            return
+
+        await self._queue_call(self.work_queue.record_results, results)
+        statistics = self.crawler.get_statistics()
+        await self._queue_call(self.work_queue.complete, task_id, self.worker_id, statistics)
+        self.completed_tasks += 1
+        self.events.emit('task_finished', task_id, statistics)
+
+    async def _claim_images(self, task_id, images):
+        """다른 작업자가 맡지 않은 이미지만 남김"""
+        claimed = set(await self._queue_call(
+            self.work_queue.claim_urls, [img['url'] for img in images], self.worker_id, task_id))
+        return [img for img in images if img['url'] in claimed]
+
+    async def _heartbeat(self, task_id):
+        """임대 연장 (작업을 잃으면 현재 크롤링 중지)"""
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            if not await self._queue_call(self.work_queue.heartbeat, task_id, self.worker_id, self.lease_seconds):
+                self.events.emit('task_failed', task_id, 'lease lost')
+                self.crawler.stop()
+                return
+
+    def stop(self):
+        """현재 작업을 중지하고 더 이상 작업을 가져오지 않음"""
+        self._stop_requested = True
+        if self.crawler:
+            self.crawler.stop()
@@ -0,0 +1,88 @@
+"""
+DNS 캐시 - 크롤러와 다운로더 세션이 함께 쓰는 비동기 DNS 조회와 TTL 캐시
+
+이미지 URL 은 img1..img9.example.com 처럼 CDN 호스트가 여러 개인 경우가 많아
+호스트마다 첫 요청이 DNS 조회를 기다린다. 페이지에서 새 호스트를 찾는 즉시
+미리 조회(prefetch)해 두면 다운로드는 캐시된 주소로 바로 연결한다.
+
+aiodns 가 설치되어 있으면 aiohttp.AsyncResolver (c-ares, 스레드 없음),
+없으면 aiohttp.ThreadedResolver (getaddrinfo 를 스레드에서) 로 조회한다.
+"""
+
+import asyncio
+import socket
+import time
+from urllib.parse import urlsplit
+
+from aiohttp.abc import AbstractResolver
+from aiohttp.resolver import AsyncResolver, ThreadedResolver
+
+try:
+    import aiodns  # noqa: F401 (AsyncResolver 가 사용)
+except ImportError:
+    aiodns = None
+
+# 조회 결과를 캐시하는 시간 (초)
+DEFAULT_TTL = 300
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+class CachingResolver(AbstractResolver):
+    """TTL 캐시와 동시 조회 합치기를 더한 aiohttp 리졸버 (이벤트 루프 안에서 생성)"""
+
+    def __init__(self, ttl=DEFAULT_TTL):
+        self.ttl = ttl
+        self.backend = AsyncResolver() if aiodns is not None else ThreadedResolver()
+        self._cache = {}  # (host, port, family) -> (만료 시각, 주소 목록)
+        self._pending = {}  # (host, port, family) -> 진행 중인 조회
+        self.stats = {'backend': type(self.backend).__name__, 'hits': 0, 'lookups': 0, 'prefetched': 0}
+
+    async def resolve(self, host, port=0, family=socket.AF_INET):
+        key = (host, port, family)
+        cached = self._cache.get(key)
+        if cached is not None and cached[0] > time.monotonic():
+            self.stats['hits'] += 1
+            return cached[1]
+        # 같은 호스트를 동시에 조회하면 한 번만
+        return await asyncio.shield(self._lookup(key))
+
+    def _lookup(self, key):
+        future = self._pending.get(key)
+        if future is None:
+            self.stats['lookups'] += 1
+            future = asyncio.ensure_future(self.backend.resolve(*key))
+            future.add_done_callback(lambda done: self._store(key, done))
+            self._pending[key] = future
+        return future
+
+    def _store(self, key, future):
+        self._pending.pop(key, None)
+        if future.cancelled() or future.exception() is not None:
+            return  # 실패는 캐시하지 않음 (다음 요청에서 다시 조회)
+        self._cache[key] = (time.monotonic() + self.ttl, future.result())
+
+    def prefetch(self, url, family=socket.AF_UNSPEC):
+        """URL 호스트를 미리 조회 (기다리지 않음, 이미 캐시되어 있으면 무시)
+
+        family 는 TCPConnector 의 기본값(AF_UNSPEC)과 같아야 캐시가 맞는다.
+        """
+        parts = urlsplit(url)
+        host = parts.hostname
+        if not host:
+            return
+        try:
+            port = parts.port or DEFAULT_PORTS.get(parts.scheme, 80)
+        except ValueError:
+            return
+        key = (host, port, family)
+        cached = self._cache.get(key)
+        if key in self._pending or (cached is not None and cached[0] > time.monotonic()):
+            return
+        self.stats['prefetched'] += 1
+        self._lookup(key)
+
+    async def close(self):
+        for future in list(self._pending.values()):
+            future.cancel()
+        await self.backend.close()
@@ -3,13 +3,36 @@
 """
 
 import os
+import re
 import asyncio
-import aiohttp
+import contextlib
+import platform
 import time
-from urllib.parse import urlparse, unquote
+from urllib.parse import urlparse, urlsplit, unquote
 from pathlib import Path
 from datetime import datetime
 
+from .bandwidth import BandwidthLimiter
+from .cancel import CancelScope
+from .image_types import SNIFF_BYTES, detect_image, fix_extension
+from .pause import PauseGate
+from .preflight import ImagePreflight, read_prefix
+from .records import DownloadResult, DownloadStatus, ResultCounts
+from .sinks import create_sink
+from .tracing import RequestTiming, TimingStats
+from .transport import DOWNLOAD_TIMEOUT, create_session
+
+# 파일명 정리에 쓰는 값들 (호출마다 다시 만들지 않도록 모듈 로드 시 한 번만 준비)
+IS_WINDOWS = platform.system() == "Windows"
+# Windows 금지 문자: < > : " | ? * / \
+INVALID_FILENAME_CHARS = re.compile(r'[<>:"/\\|?*]')
+REPEATED_UNDERSCORES = re.compile(r'_+')
+WINDOWS_RESERVED_NAMES = frozenset([
+    'CON', 'PRN', 'AUX', 'NUL',
+    'COM1', 'COM2', 'COM3', 'COM4', 'COM5', 'COM6', 'COM7', 'COM8', 'COM9',
+    'LPT1', 'LPT2', 'LPT3', 'LPT4', 'LPT5', 'LPT6', 'LPT7', 'LPT8', 'LPT9'
+])
+
 
 class ImageDownloader:
     def __init__(self, config):
@@ -18,7 +41,26 @@ class ImageDownloader:
         self.overwrite = config.get('overwrite', False)
         self.create_subfolder = config.get('create_subfolder', True)
         self.concurrent_limit = config.get('concurrent', 3)
+        self.index_offset = config.get('index_offset', 0)  # 샤드별 파일 순번 시작값
+        self.filename_pattern = config.get('filename_pattern', 0)
+        self.verify_content = config.get('verify_content', True)  # 첫 조각으로 실제 이미지인지 확인
+        self._domain_folders = {}  # 도메인 -> 정리된 폴더명
+        self.tracker = None  # ProgressTracker (크롤러가 설정)
+        self.timing_stats = TimingStats()  # 크롤러가 공유 인스턴스로 교체
+        self.in_flight = None  # InFlightRequests (메트릭 사용 시 크롤러가 설정)
+        self.sink = create_sink(config)  # 저장 방식 (output_format: files / tar)
+        self.preflight = ImagePreflight.from_config(config)  # 크기/형식/중복 조건과 사전 확인
+        self.resolver = None  # 크롤러와 공유하는 DNS 캐시 (core/dns.py, 크롤러가 설정)
+        self._session = None  # open() 으로 미리 연 세션
+        self._warm_hosts = set()  # 사전 연결한 (스킴, 호스트)
         self._stop_requested = False
+        self._scope = CancelScope()  # 진행 중인 다운로드 작업 (stop() 에서 취소)
+        self.gate = PauseGate()  # 일시정지 관문 (크롤러가 공유 인스턴스로 교체)
+        self.shared_session = None  # 작업 관리자가 준 공유 세션 (크롤러가 설정)
+        self.slots = None  # 작업 관리자의 요청 슬롯 (크롤러가 설정, 없으면 concurrent 세마포어)
+        # 본문 수신 속도 제한 (전체/호스트별, 작업 관리자에서 실행 중이면 모든 작업이 공유하는 인스턴스)
+        self.throttle = BandwidthLimiter.from_config(config)
+        self.throttle_wait = 0.0  # 속도 제한 때문에 기다린 시간 합 (초)
         
         # 저장 폴더 생성
         os.makedirs(self.save_path, exist_ok=True)
@@ -29,134 +71,248 @@ class ImageDownloader:
             return []
             
         results = []
-        semaphore = asyncio.Semaphore(self.concurrent_limit)
+        semaphore = self.slots or asyncio.Semaphore(self.concurrent_limit)
         
-        # aiohttp 세션 생성
-        timeout = aiohttp.ClientTimeout(total=60)
-        connector = aiohttp.TCPConnector(ssl=False)  # SSL 검증 비활성화
-        async with aiohttp.ClientSession(timeout=timeout, connector=connector) as session:
-            # 병렬 다운로드 작업 생성
+        # 저장 준비 (도메인별 하위 폴더를 미리 한 번에 생성 등)
+        await self.sink.prepare([self._get_file_path(img.get('url', ''), '_') for img in images])
+        
+        async with self._session_scope() as session:
+            # 사전 확인으로 걸러진 이미지는 본문을 받지 않음
+            reasons = [None] * len(images)
+            if self.preflight.enabled and not self._stop_requested:
+                self.preflight.timing_stats = self.timing_stats
+                self.preflight.gate = self.gate
+                self.preflight.slots = self.slots
+                try:
+                    reasons = await self._scope.spawn(
+                        self.preflight.run(session, images, self._request_headers))
+                except asyncio.CancelledError:
+                    if not self._scope.cancelled:
+                        raise  # 중지 요청이 아닌 바깥 작업 취소
+                        
+            # 병렬 다운로드 작업 생성 (파일 순번은 거르기 전 위치 기준)
             tasks = [
-                self._download_single_image(session, semaphore, img, i) 
-                for i, img in enumerate(images)
+                self._scope.spawn(self._filtered(img, reason) if reason else
+                                  self._download_tracked(session, semaphore, img, i))
+                for (i, img), reason in zip(enumerate(images, self.index_offset), reasons)
             ]
             
             # 모든 다운로드 완료 대기
             download_results = await asyncio.gather(*tasks, return_exceptions=True)
             
             # 예외 처리 및 결과 정리
-            for result in download_results:
-                if isinstance(result, Exception):
-                    results.append({
-                        'success': False,
-                        'error': str(result),
-                        'url': 'unknown'
-                    })
+            for image_info, result in zip(images, download_results):
+                if isinstance(result, asyncio.CancelledError):
+                    results.append(DownloadResult.failed(image_info.get('url', ''), 'Download cancelled'))
+                elif isinstance(result, Exception):
+                    results.append(DownloadResult.failed('unknown', str(result)))
                 else:
                     results.append(result)
                     
+        # 남은 저장 작업을 기다린 뒤 정리
+        await self.sink.close()
         return results
         
-    async def _download_single_image(self, session, semaphore, image_info, index):
+    @contextlib.asynccontextmanager
+    async def _session_scope(self):
+        """open() 으로 미리 연 세션 (사전 연결된 연결 재사용) 또는 공유 세션, 없으면 이번 다운로드용 세션"""
+        session = self._session or self.shared_session
+        if session is not None:
+            yield session
+            return
+        # HTTP 세션 생성 (http2 설정 시 호스트마다 연결 하나에 다중화)
+        async with create_session(self.config, timeout=DOWNLOAD_TIMEOUT, resolver=self.resolver) as session:
+            yield session
+            
+    async def open(self):
+        """다운로드 세션을 미리 열기 (크롤링 중 새 호스트에 사전 연결할 때)"""
+        if self._session is None:
+            self._session = self.shared_session or create_session(self.config, timeout=DOWNLOAD_TIMEOUT,
+                                                                  resolver=self.resolver)
+            
+    async def close(self):
+        """open() 으로 연 세션 닫기 (공유 세션은 작업 관리자가 닫음)"""
+        if self._session is not None:
+            if self._session is not self.shared_session:
+                await self._session.close()
+            self._session = None
+        self._warm_hosts = set()
+        
+    async def preconnect(self, image_info):
+        """이미지 호스트에 HEAD 요청으로 연결을 미리 만들어 연결 풀에 보관 (호스트마다 한 번)"""
+        url = image_info.get('url', '')
+        parts = urlparse(url)
+        host = (parts.scheme, parts.netloc)
+        if self._session is None or host in self._warm_hosts:
+            return
+        self._warm_hosts.add(host)
+        try:
+            async with self._session.head(url, headers=self._request_headers(image_info)):
+                pass  # 본문이 없으므로 연결은 바로 풀로 돌아감
+        except Exception:
+            pass  # 실패해도 다운로드 단계에서 다시 연결
+            
+    async def _filtered(self, image_info, reason):
+        """사전 확인에서 걸러진 이미지 (진행 카운터만 기록)"""
+        if self.tracker:
+            self.tracker.add(skipped=1)
+        return self._filtered_result(image_info, reason)
+        
+    def _filtered_result(self, image_info, reason):
+        """조건에 맞지 않아 다운로드하지 않은 이미지 결과"""
+        return DownloadResult.filtered(image_info.get('url', ''), reason)
+        
+    def _request_headers(self, image_info):
+        """이미지 요청 헤더"""
+        return {
+            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+            'Referer': image_info.get('source_url', '')
+        }
+        
+    async def _download_tracked(self, session, semaphore, image_info, index):
+        """단일 이미지 다운로드 후 진행 카운터와 타이밍 기록"""
+        timing = RequestTiming()
+        result = await self._download_single_image(session, semaphore, image_info, index, timing)
+        
+        timing.finish()
+        result['timings'] = timing.to_dict()
+        self.timing_stats.record('image', timing)
+        
+        if self.tracker:
+            if result.state is DownloadStatus.FAILED:
+                self.tracker.add(failed_downloads=1)
+                self.tracker.record_event(f"다운로드 실패: {result.url} ({result.error})")
+            elif result.state is DownloadStatus.DOWNLOADED:
+                self.tracker.add(downloaded=1, bytes_downloaded=result.size)
+            else:
+                self.tracker.add(skipped=1)
+        return result
+        
+    async def _download_single_image(self, session, semaphore, image_info, index, timing=None):
         """단일 이미지 다운로드"""
+        timing = timing or RequestTiming()
         async with semaphore:
+            await self.gate.wait()
+            timing.mark_dequeued()
             if self._stop_requested:
-                return {
-                    'success': False,
-                    'error': 'Download cancelled',
-                    'url': image_info.get('url', '')
-                }
+                return DownloadResult.failed(image_info.get('url', ''), 'Download cancelled')
                 
             start_time = time.time()
+            in_flight_key = self.in_flight.begin('image', image_info.get('url', '')) if self.in_flight else None
             
             try:
                 url = image_info.get('url', '')
                 if not url:
-                    return {
-                        'success': False,
-                        'error': 'No URL provided',
-                        'url': ''
-                    }
+                    return DownloadResult.failed('', 'No URL provided')
                     
-                # 헤더 설정
-                headers = {
-                    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                    'Referer': image_info.get('source_url', '')
-                }
-                
-                async with session.get(url, headers=headers) as response:
+                async with session.get(url, headers=self._request_headers(image_info),
+                                       trace_request_ctx=timing) as response:
                     if response.status == 200:
-                        # 파일명 생성
-                        filename = self._generate_filename(url, image_info, index)
+                        # 첫 조각의 매직 바이트로 형식 확인 (이미지가 아니면 나머지는 받지 않음)
+                        head = b''
+                        image_type = None
+                        if self.verify_content:
+                            head = await read_prefix(response, SNIFF_BYTES)
+                            await self._throttle(url, len(head))  # 형식 확인용으로 받은 앞부분도 속도 제한에 포함
+                            content_type = response.headers.get('Content-Type', '')
+                            image_type = detect_image(head, content_type)
+                            if image_type is None:
+                                response.close()
+                                return DownloadResult.failed(
+                                    url, f"Not an image ({content_type or 'unknown type'})",
+                                    time.time() - start_time)
+                                
+                        # 사전 확인을 건너뛴 이미지도 같은 조건 적용 (걸리면 나머지는 받지 않음)
+                        if self.preflight.has_filters:
+                            reason = self.preflight.check(self.preflight.inspect(response, head), url)
+                            if reason:
+                                response.close()
+                                return self._filtered_result(image_info, reason)
+                                
+                        # 파일명 생성 (확장자는 판별한 형식 기준)
+                        filename = self._generate_filename(url, image_info, index, image_type)
                         file_path = self._get_file_path(url, filename)
                         
                         # 파일이 이미 존재하고 덮어쓰기가 비활성화된 경우
-                        if os.path.exists(file_path) and not self.overwrite:
-                            return {
-                                'success': True,
-                                'url': url,
-                                'filename': filename,
-                                'local_path': file_path,
-                                'size': os.path.getsize(file_path),
-                                'download_time': 0,
-                                'status': 'skipped (already exists)'
-                            }
+                        existing_size = None if self.overwrite else await self.sink.existing_size(file_path)
+                        if existing_size is not None:
+                            result = DownloadResult(DownloadStatus.SKIPPED, url, filename=filename,
+                                                    local_path=file_path, size=existing_size, download_time=0,
+                                                    content_type=image_type[1] if image_type else None)
+                            result.update(self.sink.locate(file_path))
+                            return result
                             
                         # 파일 다운로드
-                        content = await response.read()
+                        content = await self._read_body(response, url)
+                        if head:
+                            content = head + content
+                        timing.mark_body_done()
                         
-                        # 디렉토리 생성
-                        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-                        
-                        # 파일 저장
-                        with open(file_path, 'wb') as f:
-                            f.write(content)
+                        # 파일 저장 (이벤트 루프 밖에서)
+                        timing.begin('write')
+                        location = await self.sink.save(file_path, content, image_info)
+                        timing.end('write')
                             
                         download_time = time.time() - start_time
                         
-                        return {
-                            'success': True,
-                            'url': url,
-                            'filename': filename,
-                            'local_path': file_path,
-                            'size': len(content),
-                            'download_time': round(download_time, 2),
-                            'status': 'downloaded'
-                        }
+                        result = DownloadResult(DownloadStatus.DOWNLOADED, url, filename=filename,
+                                                local_path=file_path, size=len(content),
+                                                download_time=round(download_time, 2),
+                                                content_type=image_type[1] if image_type else None)
+                        result.update(location)
+                        return result
                         
                     else:
-                        return {
-                            'success': False,
-                            'error': f'HTTP {response.status}',
-                            'url': url,
-                            'download_time': time.time() - start_time
-                        }
+                        return DownloadResult.failed(url, f'HTTP {response.status}',
+                                                     time.time() - start_time)
                         
             except Exception as e:
-                return {
-                    'success': False,
-                    'error': str(e),
-                    'url': image_info.get('url', ''),
-                    'download_time': time.time() - start_time
-                }
+                return DownloadResult.failed(image_info.get('url', ''), str(e),
+                                             time.time() - start_time)
+            finally:
+                if in_flight_key:
+                    self.in_flight.end(in_flight_key)
                 
-    def _generate_filename(self, url, image_info, index):
-        """파일명 생성"""
+    async def _read_body(self, response, url):
+        """남은 본문 전체 (속도 제한이 있으면 조각마다 호스트/전체 토큰을 받으며)"""
+        if not self.throttle.active:
+            return await response.read()
+        chunks = []
+        while True:
+            chunk = await response.content.read(self.throttle.chunk_size())
+            if not chunk:
+                break
+            chunks.append(chunk)
+            await self._throttle(url, len(chunk))
+        return b''.join(chunks)
+
+    async def _throttle(self, url, size):
+        """받은 size 바이트만큼 url 호스트/전체 토큰 사용 (기다린 시간은 throttle_wait 에 합산)"""
+        if not size or not self.throttle.active:
+            return
+        started = time.monotonic()
+        await self.throttle.consume(urlsplit(url).hostname or '', size)
+        self.throttle_wait += time.monotonic() - started
+        
+    def _generate_filename(self, url, image_info, index, image_type=None):
+        """파일명 생성 (image_type: 판별한 (형식, MIME))"""
         try:
             # URL에서 원본 파일명 추출
             parsed = urlparse(url)
             original_filename = os.path.basename(unquote(parsed.path))
             
-            # 확장자가 없는 경우 기본값 설정
+            # 파일명이 비어있는 경우
+            if not original_filename:
+                original_filename = f"image_{index}"
+                
+            # 판별한 형식과 확장자가 다르면 수정, 알 수 없으면 기본값 설정
+            if image_type:
+                original_filename = fix_extension(original_filename, *image_type)
             if not os.path.splitext(original_filename)[1]:
                 original_filename += '.jpg'
                 
-            # 파일명이 비어있는 경우
-            if not original_filename or original_filename == '.jpg':
-                original_filename = f"image_{index}.jpg"
-                
             # 파일명 패턴 적용 (설정에 따라)
-            filename_pattern = self.config.get('filename_pattern', 0)
+            filename_pattern = self.filename_pattern
             
             if filename_pattern == 1:  # 원본파일명_타임스탬프
                 name, ext = os.path.splitext(original_filename)
@@ -167,7 +323,7 @@ class ImageDownloader:
                 filename = f"{index:04d}_{original_filename}"
                 
             elif filename_pattern == 3:  # 도메인_순번_원본파일명
-                domain = urlparse(url).netloc.replace('.', '_')
+                domain = parsed.netloc.replace('.', '_')
                 filename = f"{domain}_{index:04d}_{original_filename}"
                 
             else:  # 원본 파일명 유지
@@ -184,14 +340,15 @@ class ImageDownloader:
             
     def _get_file_path(self, url, filename):
         """파일 저장 경로 생성 (크로스 플랫폼 호환)"""
-        from pathlib import Path
-        
         base_path = Path(self.save_path)
         
         if self.create_subfolder:
             # 도메인별 하위 폴더 생성
             domain = urlparse(url).netloc
-            domain_folder = self._sanitize_filename(domain)
+            domain_folder = self._domain_folders.get(domain)
+            if domain_folder is None:
+                domain_folder = self._sanitize_filename(domain)
+                self._domain_folders[domain] = domain_folder
             file_path = base_path / domain_folder / filename
         else:
             file_path = base_path / filename
@@ -200,49 +357,35 @@ class ImageDownloader:
         
     def _sanitize_filename(self, filename):
         """파일명에서 위험한 문자 제거 (Windows 호환)"""
-        import re
-        import platform
+        sanitized = INVALID_FILENAME_CHARS.sub('_', filename)
         
-        # Windows에서 금지된 문자들 제거
-        if platform.system() == "Windows":
-            # Windows 금지 문자: < > : " | ? * / \
-            sanitized = re.sub(r'[<>:"/\\|?*]', '_', filename)
-            
-            # Windows 예약어 처리
-            reserved_names = [
-                'CON', 'PRN', 'AUX', 'NUL',
-                'COM1', 'COM2', 'COM3', 'COM4', 'COM5', 'COM6', 'COM7', 'COM8', 'COM9',
-                'LPT1', 'LPT2', 'LPT3', 'LPT4', 'LPT5', 'LPT6', 'LPT7', 'LPT8', 'LPT9'
-            ]
+        # Windows 예약어 처리
+        if IS_WINDOWS:
             name, ext = os.path.splitext(sanitized)
-            if name.upper() in reserved_names:
-                name = f"_{name}"
-                sanitized = name + ext
-        else:
-            # Unix 계열 시스템 (macOS, Linux)
-            sanitized = re.sub(r'[<>:"/\\|?*]', '_', filename)
+            if name.upper() in WINDOWS_RESERVED_NAMES:
+                sanitized = f"_{name}{ext}"
         
         # 연속된 언더스코어를 하나로 줄임
-        sanitized = re.sub(r'_+', '_', sanitized)
+        sanitized = REPEATED_UNDERSCORES.sub('_', sanitized)
         
         # 앞뒤 공백, 점, 언더스코어 제거
         sanitized = sanitized.strip(' ._')
         
         # Windows: 파일명 끝에 점이나 공백 금지
-        if platform.system() == "Windows":
+        if IS_WINDOWS:
             sanitized = sanitized.rstrip('. ')
         
         # 파일명이 너무 긴 경우 자르기 (확장자 제외하고 100자로 제한)
         name, ext = os.path.splitext(sanitized)
         if len(name) > 100:
-            name = name[:100]
-            sanitized = name + ext
+            sanitized = name[:100] + ext
             
         return sanitized if sanitized else "unnamed_file"
         
     def stop(self):
-        """다운로드 중지"""
+        """다운로드 중지 (다른 스레드에서 호출해도 됨) - 진행 중인 요청과 본문 수신도 바로 취소"""
         self._stop_requested = True
+        self._scope.cancel()
         
     def get_download_stats(self, results):
         """다운로드 통계 계산"""
@@ -255,18 +398,20 @@ class ImageDownloader:
                 'avg_time': 0
             }
             
-        total = len(results)
-        success = len([r for r in results if r.get('success', False)])
-        failed = total - success
-        total_size = sum(r.get('size', 0) for r in results if r.get('success', False))
-        
-        download_times = [r.get('download_time', 0) for r in results if r.get('success', False)]
-        avg_time = sum(download_times) / len(download_times) if download_times else 0
+        counts = ResultCounts()
+        counts.add_all(results)
+        download_time = sum(r.get('download_time', 0) for r in results if r.get('success', False))
+        avg_time = download_time / counts.success if counts.success else 0
         
-        return {
-            'total': total,
-            'success': success,
-            'failed': failed,
-            'total_size': total_size,
-            'avg_time': round(avg_time, 2)
-        } 
\ No newline at end of file
+        stats = {
+            'total': counts.total,
+            'success': counts.success,
+            'failed': counts.failed,
+            'total_size': counts.total_size,
+            'avg_time': round(avg_time, 2),
+            'timings': self.timing_stats.summary().get('image', {})
+        }
+        if self.preflight.stats:
+            # 사전 확인 결과 (확인한 수, 걸러진 수, auto 판단 근거)
+            stats['preflight'] = self.preflight.stats
+        return stats 
\ No newline at end of file
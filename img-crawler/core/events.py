@@ -0,0 +1,39 @@
+"""
+이벤트 전달기 - PyQt 없이 사용할 수 있는 콜백 기반 이벤트
+"""
+
+import sys
+
+
+class EventEmitter:
+    """이벤트 이름별로 콜백을 등록하고 호출
+
+    GUI 에서는 CrawlerThread 가 콜백을 pyqtSignal 로 연결하고,
+    CLI 나 라이브러리 사용 시에는 일반 함수를 그대로 등록한다.
+    """
+
+    def __init__(self):
+        self._handlers = {}
+
+    def on(self, event, callback):
+        """콜백 등록"""
+        self._handlers.setdefault(event, []).append(callback)
+        return callback
+
+    def off(self, event, callback):
+        """콜백 해제"""
+        handlers = self._handlers.get(event, [])
+        if callback in handlers:
+            handlers.remove(callback)
+
+    def emit(self, event, *args):
+        """등록된 콜백 호출"""
+        for callback in list(self._handlers.get(event, ())):
+            try:
+                callback(*args)
+            except Exception as e:
+                print(f"이벤트 처리 오류 ({event}): {e}", file=sys.stderr)
+
+    def has_handlers(self, event):
+        """콜백이 등록되어 있는지 확인"""
+        return bool(self._handlers.get(event))
@@ -0,0 +1,154 @@
+"""
+파일 저장 - 파일 입출력을 이벤트 루프 밖 스레드에서 처리
+"""
+
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+# 저장 중인 파일의 임시 확장자
+PART_SUFFIX = '.part'
+
+
+class FileWriter:
+    """다운로드한 이미지를 스레드 풀에서 저장 (디스크 지연이 네트워크 전송을 막지 않도록)
+
+    - 만든 폴더는 기억해 두고 다시 makedirs 하지 않음
+    - 작은 파일은 같은 루프 반복에서 들어온 것끼리 묶어 스레드 작업 하나로 저장
+    - fsync 옵션 사용 시 저장 후 fsync 도 스레드에서 실행
+    - 임시 파일(.part)에 쓴 뒤 이름을 바꿔 중단된 저장이 완성된 파일처럼 보이지 않도록
+    """
+
+    def __init__(self, max_workers=4, fsync=False, small_file_bytes=64 * 1024,
+                 batch_bytes=1024 * 1024):
+        self.max_workers = max_workers
+        self.fsync = fsync
+        self.small_file_bytes = small_file_bytes  # 0 이면 묶지 않음
+        self.batch_bytes = batch_bytes
+        self._executor = None
+        self._created_dirs = set()
+        self._batch = []  # (경로, 내용, future)
+        self._batch_size = 0
+        self._flush_handle = None
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(max_workers=config.get('io_workers', 4),
+                   fsync=config.get('fsync', False),
+                   small_file_bytes=config.get('small_file_kb', 64) * 1024
+                   if config.get('coalesce_small_files', True) else 0)
+
+    def _run(self, func, *args):
+        """스레드 풀에서 실행 (처음 사용할 때 풀 생성)"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix='file-io')
+        return asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    async def get_size(self, path):
+        """파일 크기 (없으면 None) - exists + getsize 를 stat 한 번으로"""
+        return await self._run(_stat_size, path)
+
+    async def ensure_dirs(self, directories):
+        """아직 만들지 않은 폴더들을 스레드 작업 하나로 생성"""
+        missing = [d for d in set(directories) if d and d not in self._created_dirs]
+        if missing:
+            await self._run(_make_dirs, missing)
+            self._created_dirs.update(missing)
+
+    async def write(self, path, content):
+        """파일 저장 (폴더가 없으면 생성)"""
+        directory = os.path.dirname(path)
+        if directory and directory not in self._created_dirs:
+            await self.ensure_dirs([directory])
+
+        if len(content) <= self.small_file_bytes:
+            await self._queue_small(path, content)
+        else:
+            await self._run(_write_file, path, content, self.fsync)
+
+    def _queue_small(self, path, content):
+        """작은 파일은 현재 루프 반복이 끝날 때 한꺼번에 저장"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._batch.append((path, content, future))
+        self._batch_size += len(content)
+
+        if self._batch_size >= self.batch_bytes:
+            self._flush_batch()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_soon(self._flush_batch)
+        return future
+
+    def _flush_batch(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._batch, self._batch_size = self._batch, [], 0
+        if not batch:
+            return
+
+        job = self._run(_write_batch, [(path, content) for path, content, _ in batch], self.fsync)
+
+        def resolve(job):
+            if job.cancelled():
+                errors = asyncio.CancelledError()
+            else:
+                errors = job.exception() or job.result()
+            for i, (_, _, future) in enumerate(batch):
+                if future.done():
+                    continue
+                error = errors if isinstance(errors, BaseException) else errors[i]
+                if error is None:
+                    future.set_result(None)
+                else:
+                    future.set_exception(error)
+
+        job.add_done_callback(resolve)
+
+    def close(self):
+        """남은 작업을 기다리고 스레드 풀 종료 (다시 사용하면 새로 생성)"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+def _stat_size(path):
+    try:
+        return os.stat(path).st_size
+    except OSError:
+        return None
+
+
+def _make_dirs(directories):
+    for directory in directories:
+        os.makedirs(directory, exist_ok=True)
+
+
+def _write_file(path, content, fsync):
+    """임시 파일에 쓴 뒤 이름 변경 (중단되어도 불완전한 파일이 이미지로 남지 않음)"""
+    part_path = path + PART_SUFFIX
+    try:
+        with open(part_path, 'wb') as f:
+            f.write(content)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(part_path, path)
+    except BaseException:
+        try:
+            os.remove(part_path)
+        except OSError:
+            pass
+        raise
+
+
+def _write_batch(items, fsync):
+    """여러 파일 저장 (파일별 오류를 목록으로 반환)"""
+    errors = []
+    for path, content in items:
+        try:
+            _write_file(path, content, fsync)
+            errors.append(None)
+        except Exception as e:
+            errors.append(e)
+    return errors
@@ -0,0 +1,176 @@
+"""
+링크 대기열 - 링크 따라가기 모드에서 방문할 페이지를 디스크(SQLite)에 보관
+
+수십만 페이지를 따라가도 대기열과 방문 목록을 메모리에 들고 있지 않도록
+정규화한 URL 을 키로 SQLite 파일에 저장하고, 우선순위(작을수록 먼저) 순으로 꺼낸다.
+"""
+
+import os
+import sqlite3
+import tempfile
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# 정규화할 때 생략하는 기본 포트
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+# 페이지 상태
+PENDING = 0
+IN_PROGRESS = 1
+VISITED = 2
+
+
+def normalize_url(url):
+    """같은 페이지를 가리키는 URL 을 하나로 (방문 목록 키)
+
+    - 스킴/호스트 소문자, 기본 포트 생략, 빈 경로는 '/'
+    - #fragment 제거, 쿼리 매개변수 정렬
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    if port and DEFAULT_PORTS.get(scheme) != port:
+        host = f"{host}:{port}"
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, host, parts.path or '/', query, ''))
+
+
+def url_host(url):
+    """URL 의 호스트 이름 (소문자, 포트 제외)"""
+    return (urlsplit(url).hostname or '').lower()
+
+
+class URLFrontier:
+    """디스크 기반 우선순위 대기열 + 방문 목록 (이벤트 루프 스레드 하나에서만 사용)
+
+    path 를 지정하면 크롤링을 다시 시작할 때 이어서 진행하고,
+    지정하지 않으면 임시 파일을 만들고 close() 할 때 지운다.
+    """
+
+    def __init__(self, path=None, max_pages_per_host=0, max_pages=0):
+        self.max_pages_per_host = max_pages_per_host  # 0 이면 제한 없음
+        self.max_pages = max_pages
+        self._temporary = path is None
+        if path is None:
+            fd, path = tempfile.mkstemp(prefix='frontier-', suffix='.sqlite3')
+            os.close(fd)
+        self.path = path
+        self._conn = sqlite3.connect(path)
+        self._conn.executescript("""
+            PRAGMA journal_mode = WAL;
+            PRAGMA synchronous = NORMAL;
+            CREATE TABLE IF NOT EXISTS pages (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                host TEXT NOT NULL,
+                depth INTEGER NOT NULL,
+                priority REAL NOT NULL,
+                state INTEGER NOT NULL DEFAULT 0,
+                seq INTEGER NOT NULL);
+            CREATE INDEX IF NOT EXISTS pages_pending ON pages (state, priority, seq);
+        """)
+        # 호스트별 등록 수 (호스트 수는 페이지 수보다 훨씬 적으므로 메모리에)
+        self.host_counts = dict(self._conn.execute(
+            "SELECT host, COUNT(*) FROM pages GROUP BY host").fetchall())
+        # 이전 실행에서 꺼냈지만 끝내지 못한 페이지는 다시 대기
+        self._conn.execute("UPDATE pages SET state = ? WHERE state = ?", (PENDING, IN_PROGRESS))
+        self._seq = self._conn.execute("SELECT COALESCE(MAX(seq), 0) FROM pages").fetchone()[0]
+        self._pending = self._conn.execute(
+            "SELECT COUNT(*) FROM pages WHERE state = ?", (PENDING,)).fetchone()[0]
+        self._conn.commit()
+
+    def add_many(self, items):
+        """(url, depth, priority) 목록 등록 - 이미 본 URL, 호스트 한도를 넘는 URL 은 제외
+
+        새로 등록한 개수 반환
+        """
+        rows = []
+        keys = set()
+        for url, depth, priority in items:
+            key = normalize_url(url)
+            if key in keys:
+                continue
+            keys.add(key)
+            rows.append((key, url, url_host(key), depth, priority))
+        if not rows:
+            return 0
+
+        # 이미 본 URL 은 한 번의 조회로 걸러냄
+        seen = set()
+        key_list = [row[0] for row in rows]
+        for start in range(0, len(key_list), 500):
+            chunk = key_list[start:start + 500]
+            seen.update(key for (key,) in self._conn.execute(
+                f"SELECT key FROM pages WHERE key IN ({','.join('?' * len(chunk))})", chunk))
+
+        new_rows = []
+        total = self.total
+        for key, url, host, depth, priority in rows:
+            if key in seen:
+                continue
+            if self.max_pages and total + len(new_rows) >= self.max_pages:
+                break
+            count = self.host_counts.get(host, 0)
+            if self.max_pages_per_host and count >= self.max_pages_per_host:
+                continue
+            self.host_counts[host] = count + 1
+            self._seq += 1
+            new_rows.append((key, url, host, depth, priority, self._seq))
+
+        if new_rows:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO pages (key, url, host, depth, priority, seq) VALUES (?, ?, ?, ?, ?, ?)",
+                new_rows)
+            self._conn.commit()
+            self._pending += len(new_rows)
+        return len(new_rows)
+
+    def add(self, url, depth=0, priority=None):
+        """URL 하나 등록 (새로 등록했으면 True)"""
+        return self.add_many([(url, depth, depth if priority is None else priority)]) == 1
+
+    def pop(self):
+        """우선순위가 가장 높은 대기 페이지 (url, depth) - 없으면 None
+
+        처리가 끝나면 done(url) 을 호출한다 (끝내지 못한 페이지는 다음 실행에서 다시 대기).
+        """
+        row = self._conn.execute(
+            "SELECT key, url, depth FROM pages WHERE state = ? ORDER BY priority, seq LIMIT 1",
+            (PENDING,)).fetchone()
+        if row is None:
+            return None
+        self._conn.execute("UPDATE pages SET state = ? WHERE key = ?", (IN_PROGRESS, row[0]))
+        self._conn.commit()
+        self._pending -= 1
+        return row[1], row[2]
+
+    def done(self, url):
+        """페이지 처리 완료"""
+        self._conn.execute("UPDATE pages SET state = ? WHERE key = ?", (VISITED, normalize_url(url)))
+        self._conn.commit()
+
+    def seen(self, url):
+        """이미 등록(방문 또는 대기)된 URL 인지"""
+        return self._conn.execute("SELECT 1 FROM pages WHERE key = ?",
+                                  (normalize_url(url),)).fetchone() is not None
+
+    def __len__(self):
+        """대기 중인 페이지 수"""
+        return self._pending
+
+    @property
+    def total(self):
+        """등록된 전체 페이지 수 (방문 + 대기)"""
+        return sum(self.host_counts.values())
+
+    def close(self):
+        self._conn.close()
+        if self._temporary:
+            for suffix in ('', '-wal', '-shm'):
+                try:
+                    os.remove(self.path + suffix)
+                except OSError:
+                    pass
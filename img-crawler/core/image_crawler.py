@@ -5,111 +5,467 @@
 import os
 import re
 import asyncio
-import aiohttp
-from urllib.parse import urljoin, urlparse
+import contextlib
+import functools
+import inspect
+import sys
+from urllib.parse import urljoin, urlparse, urlsplit
 from bs4 import BeautifulSoup
-from PyQt5.QtCore import QObject, pyqtSignal
+from .cancel import CancelScope
+from .dns import DEFAULT_TTL, CachingResolver
 from .downloader import ImageDownloader
+from .events import EventEmitter
+from .frontier import URLFrontier, url_host
+from .metrics import InFlightRequests, MetricsExporter
+from .pause import PauseGate
+from .page_cache import PageCache, body_hash, extraction_signature
+from .progress import ProgressTracker
+from .records import DownloadStatus, ImageInfo, ResultCounts
+from .tracing import RequestTiming, TimingStats
+from .transport import PAGE_TIMEOUT, accept_encoding, create_session, request_timeout
 from .url_generator import URLGenerator
 
+# 이미지로 인정하는 확장자 (str.endswith 에 그대로 전달)
+VALID_IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp', '.svg')
 
-class ImageCrawler(QObject):
-    # 신호 정의
-    progress_updated = pyqtSignal(int, str)  # 진행률, 메시지
-    images_found = pyqtSignal(list)  # 발견된 이미지들
+
+class ImageCrawler:
+    """웹페이지 크롤러 (PyQt 의존성 없음)
+
+    이벤트 (self.events 에 콜백 등록):
+        progress (int, str): 진행률, 메시지 (단계 전환 시에만)
+        snapshot (ProgressSnapshot): 주기적으로 묶어서 전달되는 진행 상황
+        images_found (list): 발견된 이미지들 (주기적으로 묶어서 전달)
+    """
     
     def __init__(self, config):
-        super().__init__()
         self.config = config
+        self.events = EventEmitter()
         self.url_generator = URLGenerator(config)
         self.downloader = ImageDownloader(config)
         self._stop_requested = False
+        self._scope = CancelScope()  # 진행 중인 페이지 작업 (stop() 에서 취소)
+        self.gate = PauseGate()  # pause()/resume() - 다운로더와 함께 사용
+        self.downloader.gate = self.gate
+        
+        # 작업 관리자(core/job_manager.py)가 설정: 다른 작업과 공유하는 세션과 요청 슬롯
+        self.shared_session = None
+        self.slots = None  # JobSlots (없으면 concurrent 만큼의 세마포어)
         
         # 설정에서 값 가져오기
         self.selectors = config.get('selectors', ['img'])
         self.save_path = config.get('save_path', 'downloads')
         self.concurrent_limit = config.get('concurrent', 3)
+        self.check_extensions = config.get('check_extensions', True)
+        self.strict_extensions = config.get('strict_extensions', False)
+        
+        # HTML 은 5~10배 압축되므로 설치된 디코더로 풀 수 있는 압축을 모두 요청
+        self.accept_encoding = accept_encoding(config.get('http2', False))
+        
+        # 페이지/이미지 세션이 공유하는 DNS 캐시 (0 이면 사용 안 함), 새 이미지 호스트 사전 연결
+        self.dns_cache_ttl = config.get('dns_cache_ttl', DEFAULT_TTL)
+        self.preconnect = config.get('preconnect', True)
+        self.resolver = None  # CachingResolver (크롤링 중에만)
+        self._seen_hosts = set()  # 이미지 호스트
+        self._prefetched_hosts = set()  # 링크(페이지) 호스트
+        self._warmup_tasks = set()
+        
+        # 링크 따라가기 (시작 페이지에서 follow_selectors 에 맞는 링크를 max_depth 단계까지)
+        self.follow_links = config.get('follow_links', False)
+        self.max_depth = config.get('max_depth', 2)
+        self.same_domain = config.get('same_domain', True)
+        self.follow_selectors = config.get('follow_selectors') or ['a[href]']
+        self.frontier = None  # URLFrontier (링크 따라가기 중에만)
+        self._allowed_hosts = set()
+        
+        # 증분 크롤링 (바뀌지 않은 페이지는 이전 추출 결과 재사용, 새 이미지만 다운로드)
+        self.incremental = config.get('incremental', False)
+        self.page_cache = None  # PageCache (크롤링 중에만)
         
         # 크롤링 통계
         self.total_urls = 0
         self.processed_urls = 0
-        self.found_images = []
-        self.download_results = []
+        self.failed_urls = []  # 받지 못한 페이지 (사이트맵 기준 시각을 옮기지 않음)
+        self.unchanged_pages = 0
+        self.known_images = 0
+        self.found_images = []  # ImageInfo
+        self.download_results = []  # DownloadResult
+        self.result_counts = ResultCounts()  # download_results 의 상태별 개수 (추가할 때 갱신)
+        
+        # 다운로드 전에 이미지 목록을 거르는 함수들 (images -> images, 코루틴 함수도 가능)
+        self.download_filters = []
+        if self.incremental:
+            self.download_filters.append(self._skip_downloaded)
+        
+        # 진행 상황은 카운터로 모아 progress_interval 주기로 전달
+        self.tracker = ProgressTracker(
+            snapshot_callback=functools.partial(self.events.emit, 'snapshot'),
+            images_callback=functools.partial(self.events.emit, 'images_found'),
+            interval=config.get('progress_interval', 0.1)
+        )
+        self.downloader.tracker = self.tracker
+        
+        # 페이지/이미지 요청 단계별 소요 시간 히스토그램
+        self.timing_stats = TimingStats()
+        self.downloader.timing_stats = self.timing_stats
+        
+        # 메트릭 내보내기 (metrics_port / metrics_file 설정 시에만)
+        self.metrics = MetricsExporter.from_config(self, config)
+        self.in_flight = InFlightRequests() if self.metrics else None
+        self.downloader.in_flight = self.in_flight
         
     async def crawl(self):
         """크롤링 실행"""
+        reporter = asyncio.ensure_future(self.tracker.run())
+        if self.metrics:
+            await self.metrics.start()
         try:
             # URL 목록 생성
-            urls = self.url_generator.generate_urls()
+            if self.url_generator.needs_network:
+                # 사이트맵 / robots.txt 를 받는 동안 이벤트 루프를 막지 않도록
+                urls = await asyncio.get_running_loop().run_in_executor(
+                    None, self.url_generator.generate_urls)
+            else:
+                urls = self.url_generator.generate_urls()
             self.total_urls = len(urls)
             
-            self.progress_updated.emit(0, f"크롤링 시작: {self.total_urls}개 URL 처리 예정")
+            self.tracker.set(total_urls=self.total_urls)
+            self.tracker.set_phase('crawling')
+            self.events.emit('progress', 0, f"크롤링 시작: {self.total_urls}개 URL 처리 예정")
+            
+            if self.incremental:
+                self.page_cache = PageCache(os.path.join(self.url_generator.state_dir, 'pages.sqlite3'),
+                                            extraction_signature(self.config))
+            
+            # 세마포어로 동시 연결 수 제한 (작업 관리자에서 실행 중이면 다른 작업과 나눠 쓰는 슬롯)
+            semaphore = self.slots or asyncio.Semaphore(self.concurrent_limit)
+            self.downloader.slots = self.slots
+            self.downloader.shared_session = self.shared_session
             
-            # 세마포어로 동시 연결 수 제한
-            semaphore = asyncio.Semaphore(self.concurrent_limit)
+            if self.shared_session is None and self.dns_cache_ttl and not self.config.get('http2', False):
+                self.resolver = CachingResolver(self.dns_cache_ttl)
+                self.downloader.resolver = self.resolver
+            if self.preconnect:
+                # 이미지 호스트에 크롤링 중 미리 연결해 둘 다운로드 세션
+                await self.downloader.open()
             
-            # aiohttp 세션 생성
-            timeout = aiohttp.ClientTimeout(total=30)
-            connector = aiohttp.TCPConnector(ssl=False)  # SSL 검증 비활성화
-            async with aiohttp.ClientSession(timeout=timeout, connector=connector) as session:
-                # 모든 URL 병렬 처리
-                tasks = [self._crawl_single_url(session, semaphore, url) for url in urls]
-                await asyncio.gather(*tasks, return_exceptions=True)
+            async with self._page_session() as session:
+                if self.follow_links:
+                    # 시작 URL 에서 링크를 따라가며 처리
+                    await self._crawl_frontier(session, semaphore, urls)
+                else:
+                    # 모든 URL 병렬 처리
+                    tasks = [self._scope.spawn(self._crawl_single_url(session, semaphore, url))
+                             for url in urls]
+                    await asyncio.gather(*tasks, return_exceptions=True)
+                
+            # 남은 이미지 목록을 먼저 전달한 뒤 다운로드 단계로 전환
+            self.tracker.flush()
                 
             # 이미지 다운로드
-            if self.found_images and not self._stop_requested:
-                self.progress_updated.emit(50, f"이미지 다운로드 시작: {len(self.found_images)}개 이미지")
+            images = await self._apply_download_filters(self.found_images)
+            if images and not self._stop_requested:
+                self.tracker.set(total_downloads=len(images))
+                self.tracker.set_phase('downloading')
+                self.events.emit('progress', 50, f"이미지 다운로드 시작: {len(images)}개 이미지")
                 
-                download_results = await self.downloader.download_images(self.found_images)
+                download_results = await self.downloader.download_images(images)
                 self.download_results.extend(download_results)
+                self.result_counts.add_all(download_results)
+                if self.page_cache is not None:
+                    self.page_cache.mark_downloaded(
+                        result.url for result in download_results
+                        if result.state in (DownloadStatus.DOWNLOADED, DownloadStatus.SKIPPED))
+                
+            if not self._stop_requested:
+                # 다음 실행은 이번 시작 이후 바뀐 사이트맵 페이지만 (받지 못한 페이지는 다시)
+                self.url_generator.commit(self.failed_urls)
                 
-            self.progress_updated.emit(100, f"크롤링 완료: {len(self.download_results)}개 이미지 처리")
+            self.tracker.set_phase('done')
+            self.tracker.flush(force=True)
+            self.events.emit('progress', 100, f"크롤링 완료: {len(self.download_results)}개 이미지 처리")
             return self.download_results
             
         except Exception as e:
             raise Exception(f"크롤링 실행 오류: {str(e)}")
+        finally:
+            reporter.cancel()
+            for task in list(self._warmup_tasks):
+                task.cancel()
+            await self.downloader.close()
+            if self.resolver is not None and self.shared_session is None:
+                await self.resolver.close()
+            if self.page_cache is not None:
+                self.page_cache.close()
+                self.page_cache = None
+            if self.metrics:
+                await self.metrics.stop()
             
-    async def _crawl_single_url(self, session, semaphore, url):
-        """단일 URL 크롤링"""
+    @contextlib.asynccontextmanager
+    async def _page_session(self):
+        """작업 관리자가 준 공유 세션, 없으면 이번 크롤링용 세션"""
+        if self.shared_session is not None:
+            yield self.shared_session
+            return
+        # HTTP 세션 생성 (http2 설정 시 호스트마다 연결 하나에 다중화)
+        async with create_session(self.config, timeout=PAGE_TIMEOUT, resolver=self.resolver) as session:
+            yield session
+            
+    async def _apply_download_filters(self, images):
+        """download_filters 를 차례로 적용"""
+        for download_filter in self.download_filters:
+            if not images:
+                break
+            images = download_filter(images)
+            if inspect.isawaitable(images):
+                images = await images
+        return images
+        
+    def _skip_downloaded(self, images):
+        """이전 실행에서 다운로드한 이미지 제외 (덮어쓰기 설정이면 모두 다운로드)"""
+        if self.page_cache is None or self.downloader.overwrite:
+            return images
+        known = self.page_cache.known_images(image.get('url', '') for image in images)
+        self.known_images += len(known)
+        return [image for image in images if image.get('url', '') not in known]
+        
+    async def _crawl_frontier(self, session, semaphore, seeds):
+        """링크 대기열이 빌 때까지 동시 연결 수만큼의 작업자로 페이지 처리"""
+        self._allowed_hosts = {self._site_host(url_host(url)) for url in seeds}
+        self.frontier = URLFrontier(self.config.get('frontier_path'),
+                                    max_pages_per_host=self.config.get('max_pages_per_host', 0),
+                                    max_pages=self.config.get('max_pages', 0))
+        self.frontier.add_many((url, 0, 0) for url in seeds)
+        self._update_total_urls()
+        
+        active = 0
+        changed = asyncio.Event()  # 처리 중인 페이지가 끝남 (새 링크가 생겼을 수 있음)
+        
+        async def worker():
+            nonlocal active
+            while not self._stop_requested:
+                await self.gate.wait()  # 일시정지 중에는 페이지를 대기열에 둠
+                item = self.frontier.pop()
+                if item is None:
+                    if active == 0:
+                        changed.set()  # 기다리는 작업자도 끝내도록
+                        return
+                    changed.clear()
+                    await changed.wait()
+                    continue
+                    
+                url, depth = item
+                active += 1
+                try:
+                    # 중지로 받지 못한 페이지는 진행 중으로 남겨 다음 실행에서 다시 대기
+                    if await self._crawl_single_url(session, semaphore, url, depth):
+                        self.frontier.done(url)
+                finally:
+                    active -= 1
+                    changed.set()
+                    
+        try:
+            # 중지 요청으로 취소된 작업자의 페이지는 다음 실행에서 다시 대기
+            results = await asyncio.gather(*[self._scope.spawn(worker()) for _ in range(self.concurrent_limit)],
+                                           return_exceptions=True)
+            for result in results:
+                if isinstance(result, Exception):
+                    raise result
+        finally:
+            self.frontier.close()
+            if self.url_generator.robots is not None:
+                self.url_generator.robots.save()
+            
+    def _update_total_urls(self):
+        """링크 따라가기 중에는 등록된 페이지 수가 전체 URL 수"""
+        self.total_urls = self.frontier.total
+        self.tracker.set(total_urls=self.total_urls)
+        
+    @staticmethod
+    def _site_host(host):
+        """같은 사이트 비교용 호스트 (www. 제외)"""
+        return host[4:] if host.startswith('www.') else host
+        
+    def _is_allowed_host(self, host):
+        """시작 URL 과 같은 사이트(하위 도메인 포함)인지"""
+        host = self._site_host((host or '').lower())
+        return any(host == allowed or host.endswith('.' + allowed) for allowed in self._allowed_hosts)
+        
+    def _extract_links(self, soup, base_url):
+        """follow_selectors 에 맞는 링크 중 따라갈 페이지 URL 추출"""
+        links = []
+        for selector in self.follow_selectors:
+            try:
+                elements = soup.select(selector)
+            except Exception as e:
+                print(f"링크 선택자 '{selector}' 처리 오류: {e}", file=sys.stderr)
+                continue
+                
+            for element in elements:
+                href = element.get('href')
+                if not href or href.startswith(('#', 'javascript:', 'mailto:', 'tel:', 'data:')):
+                    continue
+                link = urljoin(base_url, href)
+                parsed = urlsplit(link)
+                if parsed.scheme not in ('http', 'https'):
+                    continue
+                if self.same_domain and not self._is_allowed_host(parsed.hostname):
+                    continue
+                if parsed.path.lower().endswith(VALID_IMAGE_EXTENSIONS):
+                    continue  # 이미지 파일 링크는 페이지가 아님
+                links.append(link)
+        return links
+        
+    def _warm_up(self, images, links):
+        """처음 보는 호스트를 미리 DNS 조회 (이미지 호스트는 다운로드 세션에 사전 연결)"""
+        for image in images:
+            url = image.get('url', '')
+            host = urlsplit(url).netloc
+            if host in self._seen_hosts:
+                continue
+            self._seen_hosts.add(host)
+            if self.preconnect:
+                # 연결하면서 공유 리졸버로 DNS 도 조회
+                task = asyncio.ensure_future(self.downloader.preconnect(image))
+                self._warmup_tasks.add(task)
+                task.add_done_callback(self._warmup_tasks.discard)
+            elif self.resolver is not None:
+                self.resolver.prefetch(url)
+                
+        if self.resolver is not None:
+            for link in links or ():
+                host = urlsplit(link).netloc
+                if host not in self._prefetched_hosts:
+                    self._prefetched_hosts.add(host)
+                    self.resolver.prefetch(link)
+        
+    async def _filter_robots(self, links):
+        """robots.txt 에서 금지한 링크 제외 (처음 보는 호스트의 규칙은 스레드에서 받음)"""
+        robots = self.url_generator.robots
+        if robots is None:
+            return links
+        uncached = [link for link in links if not robots.is_cached(link)]
+        if uncached:
+            await asyncio.get_running_loop().run_in_executor(
+                None, lambda: [robots.parser(link) for link in uncached])
+        return [link for link in links if robots.allowed(link)]
+        
+    async def _crawl_single_url(self, session, semaphore, url, depth=0):
+        """단일 URL 크롤링 (링크 따라가기 중이면 depth 는 시작 페이지로부터의 단계)
+
+        페이지를 요청했으면 (실패 포함) True, 중지 요청으로 요청하지 않았으면 False
+        """
+        timing = RequestTiming()
         async with semaphore:
+            await self.gate.wait()
+            timing.mark_dequeued()
             if self._stop_requested:
-                return
+                return False
                 
+            in_flight_key = self.in_flight.begin('page', url) if self.in_flight else None
             try:
                 # User-Agent 설정
                 headers = {
-                    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+                    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+                    'Accept-Encoding': self.accept_encoding
                 }
                 
-                async with session.get(url, headers=headers) as response:
-                    if response.status == 200:
-                        html = await response.text()
-                        images = self._extract_images(html, url)
+                # 이전 실행의 기록이 있으면 조건부 요청 (304 면 본문을 받지 않음)
+                entry = None
+                if self.page_cache is not None:
+                    entry = self.page_cache.get(url, need_links=self.frontier is not None)
+                    headers.update(PageCache.conditional_headers(entry))
+                
+                # 공유 세션(기본값은 이미지용)에서도 단독 실행과 같은 페이지 제한 시간
+                async with session.get(url, headers=headers, trace_request_ctx=timing,
+                                       timeout=request_timeout(PAGE_TIMEOUT)) as response:
+                    page = None
+                    if response.status == 304 and entry is not None:
+                        timing.mark_body_done()
+                        page = self._cached_page(entry)
+                    elif response.status == 200:
+                        page = await self._parse_page(response, url, depth, entry, timing)
+                        
+                    if page is not None:
+                        images, links, unchanged = page
+                        if self.frontier is None or depth >= self.max_depth:
+                            links = None
+                        
+                        self._warm_up(images, links)
+                        
+                        if links:
+                            links = await self._filter_robots(links)
+                            if self.frontier.add_many((link, depth + 1, depth + 1) for link in links):
+                                self._update_total_urls()
                         
                         if images:
                             self.found_images.extend(images)
-                            self.images_found.emit(images)
+                            self.tracker.add_images(images)
                             
                         self.processed_urls += 1
-                        progress = int((self.processed_urls / self.total_urls) * 50)  # 50%까지만 (다운로드가 나머지 50%)
-                        
-                        self.progress_updated.emit(
-                            progress, 
-                            f"URL 처리 중: {self.processed_urls}/{self.total_urls} ({len(images)}개 이미지 발견)"
-                        )
+                        self.tracker.add(processed_urls=1, found_images=len(images))
+                        if unchanged:
+                            self.unchanged_pages += 1
+                        self.tracker.record_event(f"URL 처리 완료: {url} ({len(images)}개 이미지 발견"
+                                                  f"{', 변경 없음' if unchanged else ''})")
                         
                     else:
                         self.processed_urls += 1
-                        print(f"HTTP {response.status}: {url}")
+                        self.failed_urls.append(url)
+                        self.tracker.add(processed_urls=1, failed_urls=1)
+                        self.tracker.record_event(f"HTTP {response.status}: {url}")
+                        print(f"HTTP {response.status}: {url}", file=sys.stderr)
                         
             except Exception as e:
                 self.processed_urls += 1
-                print(f"URL 크롤링 오류 {url}: {e}")
+                self.failed_urls.append(url)
+                self.tracker.add(processed_urls=1, failed_urls=1)
+                self.tracker.record_event(f"URL 크롤링 오류 {url}: {e}")
+                print(f"URL 크롤링 오류 {url}: {e}", file=sys.stderr)
+            finally:
+                if in_flight_key:
+                    self.in_flight.end(in_flight_key)
+                
+            timing.finish()
+            self.timing_stats.record('page', timing)
+            return True
                 
+    async def _parse_page(self, response, url, depth, entry, timing):
+        """응답 본문에서 (이미지, 링크, 변경 없음) 추출 - 본문 해시가 이전과 같으면 파싱하지 않음"""
+        body = await response.read()
+        timing.mark_body_done()
+        
+        digest = None
+        if self.page_cache is not None:
+            digest = body_hash(body)
+            if entry is not None and entry['hash'] == digest:
+                images, links, unchanged = self._cached_page(entry)
+                if PageCache.validators_changed(entry, response):
+                    self.page_cache.put(url, response, digest, images, links)
+                return images, links, unchanged
+                
+        html = await response.text()  # 이미 읽은 본문을 문자 집합에 맞게 디코딩
+        timing.begin('parse')
+        soup = BeautifulSoup(html, 'html.parser')
+        images = self._extract_images(soup, url)
+        links = None
+        # 캐시에 저장할 때는 다음 실행의 단계가 다를 수 있으므로 항상 링크 추출
+        if self.frontier is not None and (depth < self.max_depth or self.page_cache is not None):
+            links = self._extract_links(soup, str(response.url))
+        timing.end('parse')
+        
+        if self.page_cache is not None:
+            self.page_cache.put(url, response, digest, images, links)
+        return images, links, False
+        
+    def _cached_page(self, entry):
+        """이전 실행에서 저장한 (이미지, 링크, 변경 없음)"""
+        return PageCache.images(entry), PageCache.links(entry), True
+        
     def _extract_images(self, html, base_url):
-        """HTML에서 이미지 URL 추출"""
+        """HTML(또는 파싱한 BeautifulSoup)에서 이미지 URL 추출"""
         try:
-            soup = BeautifulSoup(html, 'html.parser')
+            soup = html if isinstance(html, BeautifulSoup) else BeautifulSoup(html, 'html.parser')
             images = []
             image_urls = set()  # 중복 제거용
             
@@ -129,73 +485,88 @@ class ImageCrawler(QObject):
                             # 상대 URL을 절대 URL로 변환
                             img_url = urljoin(base_url, img_url)
                             
-                            # 중복 체크
+                            # 중복 체크 및 이미지 URL 유효성 검사
                             if img_url not in image_urls:
                                 image_urls.add(img_url)
                                 
-                                # 이미지 정보 구성
-                                image_info = {
-                                    'url': img_url,
-                                    'alt': img.get('alt', ''),
-                                    'title': img.get('title', ''),
-                                    'source_url': base_url,
-                                    'selector': selector
-                                }
-                                
-                                # 이미지 URL 유효성 검사
                                 if self._is_valid_image_url(img_url):
-                                    images.append(image_info)
+                                    # 이미지 정보 구성
+                                    images.append(ImageInfo(img_url, img.get('alt', ''), img.get('title', ''),
+                                                            base_url, selector))
                                     
                 except Exception as e:
-                    print(f"선택자 '{selector}' 처리 오류: {e}")
+                    print(f"선택자 '{selector}' 처리 오류: {e}", file=sys.stderr)
                     continue
                     
             return images
             
         except Exception as e:
-            print(f"HTML 파싱 오류: {e}")
+            print(f"HTML 파싱 오류: {e}", file=sys.stderr)
             return []
             
     def _is_valid_image_url(self, url):
         """이미지 URL 유효성 검사"""
         try:
-            # 기본 URL 형식 검사
-            parsed = urlparse(url)
+            # 확장자가 없어도 이미지일 수 있으므로 엄격 모드에서만 확장자 검사
+            strict = self.check_extensions and self.strict_extensions
+            
+            # 기본 URL 형식 검사 (경로가 필요 없으면 ;params 분리를 하지 않는 urlsplit 사용)
+            parsed = urlparse(url) if strict else urlsplit(url)
             if not parsed.scheme or not parsed.netloc:
                 return False
                 
-            # 이미지 확장자 검사 (선택적)
-            if self.config.get('check_extensions', True):
-                valid_extensions = ['.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp', '.svg']
-                url_lower = url.lower()
-                
-                # URL에 쿼리 매개변수가 있는 경우 제거하고 검사
-                url_path = parsed.path.lower()
-                if any(url_path.endswith(ext) for ext in valid_extensions):
-                    return True
-                    
-                # 확장자가 없어도 이미지일 수 있으므로 허용 (설정에 따라)
-                if not self.config.get('strict_extensions', False):
-                    return True
-                    
-                return False
+            if strict:
+                # 쿼리 매개변수를 제외한 경로로 검사
+                return parsed.path.lower().endswith(VALID_IMAGE_EXTENSIONS)
                 
             return True
             
         except Exception:
             return False
             
+    def pause(self):
+        """일시정지 (다른 스레드에서 호출해도 됨) - 받고 있던 응답은 마저 받고 새 요청은 시작하지 않음"""
+        self.gate.pause()
+        
+    def resume(self):
+        """일시정지한 자리에서 이어서 진행"""
+        self.gate.resume()
+        
+    @property
+    def is_paused(self):
+        return self.gate.paused
+        
+    def set_bandwidth_limit(self, rate=None, host_rate=None):
+        """이미지 수신 속도 제한 변경 (바이트/초, None 은 그대로, 0 은 제한 없음) - 받는 중인 전송에도 적용"""
+        self.downloader.throttle.set_limits(rate, host_rate)
+        
     def stop(self):
-        """크롤링 중지"""
+        """크롤링 중지 (다른 스레드에서 호출해도 됨) - 진행 중인 요청도 제한 시간을 기다리지 않고 취소"""
         self._stop_requested = True
+        self._scope.cancel()
         self.downloader.stop()
         
+    def get_recent_events(self, limit=None):
+        """페이지/다운로드 단위 상세 이벤트 조회"""
+        return self.tracker.recent_events(limit)
+        
+    def get_timing_summary(self, include_buckets=False):
+        """페이지/이미지 요청의 단계별 소요 시간 요약 (밀리초)"""
+        return self.timing_stats.summary(include_buckets)
+        
     def get_statistics(self):
         """크롤링 통계 반환"""
+        counts = self.result_counts
         return {
             'total_urls': self.total_urls,
             'processed_urls': self.processed_urls,
             'found_images': len(self.found_images),
-            'downloaded_images': len([r for r in self.download_results if r.get('success', False)]),
-            'failed_downloads': len([r for r in self.download_results if not r.get('success', False)])
+            'downloaded_images': counts.downloaded + counts.skipped,
+            'filtered_images': counts.filtered,
+            'unchanged_pages': self.unchanged_pages,
+            'known_images': self.known_images,
+            'dns_lookups': self.resolver.stats['lookups'] if self.resolver else 0,
+            'dns_cache_hits': self.resolver.stats['hits'] if self.resolver else 0,
+            'throttle_wait_ms': int(self.downloader.throttle_wait * 1000),
+            'failed_downloads': counts.failed
         } 
\ No newline at end of file
@@ -0,0 +1,163 @@
+"""
+이미지 형식 판별 - 파일 앞부분(매직 바이트)으로 형식과 크기 확인
+"""
+
+import mimetypes
+import os
+import struct
+
+# 형식 이름 -> (MIME 타입, 확장자)
+IMAGE_TYPES = {
+    'jpeg': ('image/jpeg', '.jpg'),
+    'png': ('image/png', '.png'),
+    'gif': ('image/gif', '.gif'),
+    'webp': ('image/webp', '.webp'),
+    'bmp': ('image/bmp', '.bmp'),
+    'svg': ('image/svg+xml', '.svg'),
+    'avif': ('image/avif', '.avif'),
+    'ico': ('image/x-icon', '.ico'),
+    'heic': ('image/heic', '.heic'),
+    'tiff': ('image/tiff', '.tif'),
+}
+
+# 확장자 -> 형식 이름 (같은 형식의 다른 표기는 파일명을 바꾸지 않음)
+EXTENSION_FORMATS = {
+    '.jpg': 'jpeg', '.jpeg': 'jpeg', '.jpe': 'jpeg', '.jfif': 'jpeg',
+    '.png': 'png', '.gif': 'gif', '.webp': 'webp', '.bmp': 'bmp',
+    '.svg': 'svg', '.avif': 'avif', '.ico': 'ico',
+    '.heic': 'heic', '.heif': 'heic', '.tif': 'tiff', '.tiff': 'tiff',
+}
+
+# JPEG 크기 정보가 들어 있는 SOF 마커 (DHT, JPG, DAC 제외)
+JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+# 형식 판별에 필요한 앞부분 길이
+SNIFF_BYTES = 512
+
+
+def sniff_format(data):
+    """앞부분 바이트로 이미지 형식 이름 반환 (이미지가 아니면 None)"""
+    head = bytes(data[:SNIFF_BYTES])
+    if head.startswith(b'\xff\xd8\xff'):
+        return 'jpeg'
+    if head.startswith(b'\x89PNG\r\n\x1a\n'):
+        return 'png'
+    if head[:6] in (b'GIF87a', b'GIF89a'):
+        return 'gif'
+    if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+        return 'webp'
+    if head[:2] == b'BM' and len(head) >= 26:
+        return 'bmp'
+    if head[4:8] == b'ftyp' and head[8:12] in (b'avif', b'avis'):
+        return 'avif'
+    if head[4:8] == b'ftyp' and head[8:12] in (b'heic', b'heix', b'heim', b'heis', b'mif1'):
+        return 'heic'
+    if head[:4] == b'\x00\x00\x01\x00':
+        return 'ico'
+    if head[:4] in (b'II*\x00', b'MM\x00*'):
+        return 'tiff'
+    text = head.lstrip(b'\xef\xbb\xbf \t\r\n').lower()
+    if text.startswith(b'<svg') or (text.startswith(b'<?xml') and b'<svg' in text):
+        return 'svg'
+    return None
+
+
+def sniff_mime(data):
+    """앞부분 바이트로 MIME 타입 반환 (이미지가 아니면 None)"""
+    image_format = sniff_format(data)
+    return IMAGE_TYPES[image_format][0] if image_format else None
+
+
+def image_dimensions(data, image_format=None):
+    """헤더만 읽어 (너비, 높이) 반환 (알 수 없으면 None)"""
+    image_format = image_format or sniff_format(data)
+    try:
+        if image_format == 'png':
+            return struct.unpack('>II', bytes(data[16:24]))
+        if image_format == 'gif':
+            return struct.unpack('<HH', bytes(data[6:10]))
+        if image_format == 'bmp':
+            width, height = struct.unpack('<ii', bytes(data[18:26]))
+            return width, abs(height)
+        if image_format == 'webp':
+            return _webp_dimensions(bytes(data[:30]))
+        if image_format == 'jpeg':
+            return _jpeg_dimensions(data)
+    except struct.error:
+        return None
+    return None
+
+
+def _webp_dimensions(head):
+    chunk = head[12:16]
+    if chunk == b'VP8 ':
+        width, height = struct.unpack('<HH', head[26:30])
+        return width & 0x3FFF, height & 0x3FFF
+    if chunk == b'VP8L':
+        bits = int.from_bytes(head[21:25], 'little')
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if chunk == b'VP8X':
+        return int.from_bytes(head[24:27], 'little') + 1, int.from_bytes(head[27:30], 'little') + 1
+    return None
+
+
+def _jpeg_dimensions(data):
+    """SOF 마커를 찾을 때까지 세그먼트를 건너뜀"""
+    view = memoryview(data)
+    position = 2
+    size = len(view)
+    while position + 9 <= size:
+        if view[position] != 0xFF:
+            return None
+        marker = view[position + 1]
+        if marker == 0xFF:  # 채움 바이트
+            position += 1
+            continue
+        if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7:  # 길이 없는 마커
+            position += 2
+            continue
+        length = (view[position + 2] << 8) | view[position + 3]
+        if marker in JPEG_SOF_MARKERS:
+            height = (view[position + 5] << 8) | view[position + 6]
+            width = (view[position + 7] << 8) | view[position + 8]
+            return width, height
+        position += 2 + length
+    return None
+
+
+def describe_image(data):
+    """색인에 기록할 형식 정보 {'type', 'width', 'height'}"""
+    image_format = sniff_format(data)
+    if image_format is None:
+        return {'type': None, 'width': None, 'height': None}
+    dimensions = image_dimensions(data, image_format) or (None, None)
+    return {'type': IMAGE_TYPES[image_format][0], 'width': dimensions[0], 'height': dimensions[1]}
+
+
+def detect_image(head, content_type=''):
+    """첫 조각과 Content-Type 으로 (형식, MIME) 판별 (이미지가 아니면 None)
+
+    바이트로 판별되면 Content-Type 보다 우선한다. 판별하지 못한 형식은 서버가
+    image/* 로 보냈을 때만 이미지로 인정한다 (형식은 None).
+    """
+    image_format = sniff_format(head)
+    if image_format:
+        return image_format, IMAGE_TYPES[image_format][0]
+    mime = (content_type or '').split(';', 1)[0].strip().lower()
+    if mime.startswith('image/'):
+        return None, mime
+    return None
+
+
+def fix_extension(filename, image_format, mime):
+    """판별한 형식에 맞게 확장자 수정 (이미지 확장자는 교체, 그 밖은 뒤에 추가)"""
+    name, ext = os.path.splitext(filename)
+    ext = ext.lower()
+    if image_format and EXTENSION_FORMATS.get(ext) == image_format:
+        return filename
+    extension = IMAGE_TYPES[image_format][1] if image_format else mimetypes.guess_extension(mime)
+    if not extension or ext == extension:
+        return filename
+    if ext in EXTENSION_FORMATS:
+        return name + extension
+    return filename + extension
@@ -0,0 +1,354 @@
+"""
+작업 관리자 - 여러 크롤링 설정을 한 이벤트 루프와 연결 풀에서 동시에 실행
+
+작업마다 스레드, 이벤트 루프, 세션을 새로 만들지 않고 DNS 캐시와 HTTP 세션(연결 풀)을
+모든 작업이 공유한다. 제출한 작업은 우선순위 순서로 대기열에 들어가 max_jobs 개까지
+자동으로 시작된다.
+
+요청 슬롯 (max_connections):
+    모든 작업의 페이지/이미지 요청이 나눠 쓰는 동시 요청 수. 슬롯이 비면 기다리는 작업 중
+    (사용 중인 슬롯 / 가중치) 가 가장 작은 작업에 준다. 가중치는 priority + 1 이므로
+    priority 가 높은 작업이 더 많은 몫을 받고, 낮은 작업도 굶지는 않는다.
+    작업 하나의 동시 요청 수는 여전히 그 작업의 concurrent 설정을 넘지 않는다.
+
+대역폭 (bandwidth_limit / host_bandwidth_limit, 바이트/초):
+    모든 작업의 이미지 본문 수신 속도 합과 호스트별 합 (core/bandwidth.py, 0 이면 제한 없음)
+    작업 설정의 같은 키는 무시하고 관리자 설정을 모든 작업이 공유한다.
+"""
+
+import asyncio
+import heapq
+import itertools
+import threading
+
+from .bandwidth import BandwidthLimiter
+from .dns import DEFAULT_TTL, CachingResolver
+from .events import EventEmitter
+from .image_crawler import ImageCrawler
+from .transport import DOWNLOAD_TIMEOUT, create_session
+
+# 작업 상태
+JOB_STATES = ('queued', 'running', 'done', 'failed', 'cancelled')
+
+
+class CrawlJob:
+    """대기열의 크롤링 작업 하나"""
+
+    def __init__(self, job_id, config, priority=0):
+        self.job_id = job_id
+        self.config = config
+        self.priority = priority
+        self.weight = max(1, priority + 1)  # 요청 슬롯 배분 가중치
+        self.state = 'queued'
+        self.stop_requested = False
+        self.crawler = None  # ImageCrawler (실행 중에만)
+        self.results = []
+        self.statistics = {}
+        self.error = None
+
+    def to_dict(self):
+        return {
+            'job_id': self.job_id,
+            'url': self.config.get('url', ''),
+            'priority': self.priority,
+            'state': self.state,
+            'error': self.error,
+            'statistics': self.statistics,
+        }
+
+
+class FairShare:
+    """작업들이 나눠 쓰는 요청 슬롯 (가중치 공평 배분)"""
+
+    def __init__(self, capacity):
+        self.capacity = max(1, capacity)
+        self.in_use = 0
+        self._active = {}  # job -> 사용 중인 슬롯 수
+        self._waiters = {}  # job -> 슬롯을 기다리는 Future 목록
+
+    async def acquire(self, job):
+        if self.in_use < self.capacity and not self._waiters:
+            self._grant(job)
+            return
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(job, []).append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release(job)  # 슬롯을 받은 직후 취소됨
+            else:
+                self._remove_waiter(job, future)
+            raise
+
+    def set_capacity(self, capacity):
+        """슬롯 수 변경 (늘어난 슬롯은 기다리는 작업에 바로 배분)"""
+        self.capacity = max(1, capacity)
+        self._dispatch()
+
+    def release(self, job):
+        self.in_use -= 1
+        self._active[job] -= 1
+        if not self._active[job]:
+            del self._active[job]
+        self._dispatch()
+
+    def _grant(self, job):
+        self.in_use += 1
+        self._active[job] = self._active.get(job, 0) + 1
+
+    def _remove_waiter(self, job, future):
+        waiters = self._waiters.get(job)
+        if waiters and future in waiters:
+            waiters.remove(future)
+            if not waiters:
+                del self._waiters[job]
+
+    def _dispatch(self):
+        """빈 슬롯을 몫 대비 가장 적게 쓰고 있는 작업에 배분"""
+        while self.in_use < self.capacity and self._waiters:
+            job = min(self._waiters, key=lambda waiting: (
+                self._active.get(waiting, 0) / waiting.weight, -waiting.priority, waiting.job_id))
+            waiters = self._waiters[job]
+            future = waiters.pop(0)
+            if not waiters:
+                del self._waiters[job]
+            if future.done():
+                continue  # 기다리다 취소됨
+            self._grant(job)
+            future.set_result(None)
+
+
+class JobSlots:
+    """작업 하나의 요청 슬롯 (asyncio.Semaphore 대신 async with 로 사용)
+
+    작업의 concurrent 제한을 먼저 지킨 뒤 공유 슬롯을 받는다. 일시정지한 작업은
+    공유 슬롯을 받지 않고 기다려 다른 작업이 쓰도록 한다.
+    """
+
+    def __init__(self, share, job, gate, limit):
+        self.share = share
+        self.job = job
+        self.gate = gate
+        self._local = asyncio.Semaphore(limit)
+
+    async def __aenter__(self):
+        await self._local.acquire()
+        try:
+            while True:
+                await self.gate.wait()
+                await self.share.acquire(self.job)
+                if not self.gate.paused:
+                    return self
+                self.share.release(self.job)  # 기다리는 사이 일시정지됨
+        except BaseException:
+            self._local.release()
+            raise
+
+    async def __aexit__(self, *exc_info):
+        self.share.release(self.job)
+        self._local.release()
+
+
+class JobManager:
+    """여러 크롤링 작업을 한 이벤트 루프에서 실행 (PyQt 의존성 없음, submit/cancel/pause 는 어느 스레드에서나)
+
+    이벤트 (self.events 에 콜백 등록):
+        job_queued (CrawlJob)
+        job_started (CrawlJob)
+        job_snapshot (int, ProgressSnapshot): 작업 번호, 진행 상황
+        job_finished (CrawlJob): 완료, 실패, 취소 모두 (job.state 로 구분)
+    """
+
+    def __init__(self, config=None):
+        config = config or {}
+        self.config = config
+        self.max_jobs = max(1, config.get('max_jobs', 4))
+        self.share = FairShare(config.get('max_connections', 16))
+        self.bandwidth = BandwidthLimiter.from_config(config)
+        self.http2 = config.get('http2', False)
+        self.dns_cache_ttl = config.get('dns_cache_ttl', DEFAULT_TTL)
+        self.events = EventEmitter()
+        self.jobs = {}  # job_id -> CrawlJob (제출 순서)
+        self._pending = []  # (-priority, job_id, CrawlJob) 힙
+        self._lock = threading.Lock()  # _pending 은 다른 스레드에서도 추가
+        self._ids = itertools.count(1)
+        self._running = set()  # 실행 중인 asyncio.Task
+        self._closing = False
+        self._loop = None
+        self._wakeup = None
+
+    def submit(self, config, priority=0):
+        """작업 제출 (대기열에 넣고 자리가 나면 자동 시작)"""
+        config = dict(config)
+        config['http2'] = self.http2  # 세션을 공유하므로 모든 작업이 같은 전송 방식
+        with self._lock:
+            job = CrawlJob(next(self._ids), config, priority)
+            self.jobs[job.job_id] = job
+            heapq.heappush(self._pending, (-priority, job.job_id, job))
+        self.events.emit('job_queued', job)
+        self._wake()
+        return job
+
+    def cancel(self, job_id):
+        """대기 중인 작업은 대기열에서 빼고, 실행 중인 작업은 중지"""
+        job = self.jobs.get(job_id)
+        if job is None:
+            return
+        with self._lock:
+            queued = job.state == 'queued'
+            if queued:
+                job.state = 'cancelled'  # 힙에서는 꺼낼 때 건너뜀
+        if queued:
+            self.events.emit('job_finished', job)
+            return
+        job.stop_requested = True
+        if job.crawler is not None:
+            job.crawler.stop()
+
+    def pause(self, job_id):
+        job = self.jobs.get(job_id)
+        if job is not None and job.crawler is not None:
+            job.crawler.pause()
+
+    def resume(self, job_id):
+        job = self.jobs.get(job_id)
+        if job is not None and job.crawler is not None:
+            job.crawler.resume()
+
+    def set_limits(self, max_jobs=None, max_connections=None):
+        """동시 작업 수 / 공유 요청 슬롯 수 변경 (실행 중에도 적용)"""
+        if max_jobs:
+            self.max_jobs = max(1, max_jobs)
+        if max_connections:
+            self._call_soon(self.share.set_capacity, max_connections)
+        self._wake()
+
+    def set_bandwidth_limit(self, rate=None, host_rate=None):
+        """전체/호스트별 대역폭 변경 (바이트/초, 0 이면 제한 없음) - 진행 중인 전송에도 바로 적용"""
+        self._call_soon(self.bandwidth.set_limits, rate, host_rate)
+
+    def close(self):
+        """대기 중인 작업은 취소하고 실행 중인 작업을 중지한 뒤 run() 종료"""
+        self._closing = True
+        with self._lock:
+            pending, self._pending = self._pending, []
+            cancelled = [job for _, _, job in pending if job.state == 'queued']
+            for job in cancelled:
+                job.state = 'cancelled'
+        for job in cancelled:
+            self.events.emit('job_finished', job)  # cancel() 과 같이 리스너에 알림
+        for job in list(self.jobs.values()):
+            job.stop_requested = True
+            if job.crawler is not None:
+                job.crawler.stop()
+        self._wake()
+
+    def status(self):
+        """작업별 상태 목록 (제출 순서)"""
+        return [job.to_dict() for job in self.jobs.values()]
+
+    def _call_soon(self, callback, *args):
+        """루프 스레드에서 callback 실행 (실행 전이면 바로, 다른 스레드면 루프에 예약)"""
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            callback(*args)
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            callback(*args)
+            return
+        try:
+            loop.call_soon_threadsafe(callback, *args)
+        except RuntimeError:
+            pass  # 루프가 그 사이 닫힘
+
+    def _wake(self):
+        """run() 루프 깨우기"""
+        if self._loop is not None:
+            self._call_soon(self._wakeup.set)
+
+    def _next_job(self):
+        with self._lock:
+            while self._pending:
+                _, _, job = heapq.heappop(self._pending)
+                if job.state == 'queued':
+                    job.state = 'running'
+                    return job
+        return None
+
+    async def run(self, keep_alive=False):
+        """대기열의 작업 실행 (keep_alive 면 대기열이 비어도 close() 까지 새 작업을 기다림)"""
+        self._wakeup = asyncio.Event()
+        self._loop = asyncio.get_running_loop()
+        resolver = None
+        if self.dns_cache_ttl and not self.http2:
+            resolver = CachingResolver(self.dns_cache_ttl)
+        # 이미지 요청은 단독 실행과 같은 세션 기본값, 페이지 요청은 요청마다 PAGE_TIMEOUT 지정
+        session = create_session(self.config, timeout=DOWNLOAD_TIMEOUT, resolver=resolver)
+        try:
+            while True:
+                self._wakeup.clear()
+                while len(self._running) < self.max_jobs and not self._closing:
+                    job = self._next_job()
+                    if job is None:
+                        break
+                    task = asyncio.ensure_future(self._run_job(job, session, resolver))
+                    self._running.add(task)
+                    task.add_done_callback(self._on_job_done)
+                if not self._running and (self._closing or not keep_alive):
+                    with self._lock:
+                        if self._closing or not self._pending:
+                            break
+                await self._wakeup.wait()
+        finally:
+            for task in list(self._running):
+                task.cancel()
+            if self._running:
+                await asyncio.gather(*self._running, return_exceptions=True)
+            await session.close()
+            if resolver is not None:
+                await resolver.close()
+            self._loop = None
+        return list(self.jobs.values())
+
+    def _on_job_done(self, task):
+        self._running.discard(task)
+        self._wakeup.set()
+
+    async def _run_job(self, job, session, resolver):
+        """작업 하나 실행 (공유 세션, DNS 캐시, 요청 슬롯, 대역폭 사용)"""
+        try:
+            crawler = ImageCrawler(job.config)
+        except Exception as e:
+            job.state = 'failed'
+            job.error = str(e)
+            self.events.emit('job_finished', job)
+            return
+
+        crawler.shared_session = session
+        crawler.resolver = resolver
+        crawler.slots = JobSlots(self.share, job, crawler.gate, crawler.concurrent_limit)
+        crawler.downloader.throttle = self.bandwidth
+        crawler.events.on('snapshot', lambda snapshot: self.events.emit('job_snapshot', job.job_id, snapshot))
+        job.crawler = crawler
+        if job.stop_requested:
+            crawler.stop()  # 시작하는 사이 취소됨
+        self.events.emit('job_started', job)
+
+        try:
+            job.results = await crawler.crawl()
+            job.state = 'cancelled' if job.stop_requested else 'done'
+        except asyncio.CancelledError:
+            job.state = 'cancelled'
+            raise
+        except Exception as e:
+            job.state = 'failed'
+            job.error = str(e)
+        finally:
+            job.statistics = crawler.get_statistics()
+            job.crawler = None
+            self.events.emit('job_finished', job)
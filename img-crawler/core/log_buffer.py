@@ -0,0 +1,86 @@
+"""
+로그 버퍼 - 고정 크기 링 버퍼와 비동기 파일 저장
+"""
+
+import logging
+import os
+import queue
+from collections import deque
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+
+class LogBuffer:
+    """최근 로그만 보관하는 고정 크기 링 버퍼
+
+    화면 출력용 대기열도 같은 크기로 제한되므로 크롤링이 아무리 길어도
+    메모리 사용량은 capacity 에 비례해 일정하게 유지된다.
+    """
+
+    def __init__(self, capacity=5000):
+        self.capacity = capacity
+        self._lines = deque(maxlen=capacity)
+        self._pending = deque(maxlen=capacity)
+        self._spill_logger = None
+        self._listener = None
+
+    def append(self, line):
+        """로그 한 줄 추가"""
+        self._lines.append(line)
+        self._pending.append(line)
+        if self._spill_logger:
+            self._spill_logger.info(line)
+
+    def drain(self):
+        """아직 화면에 출력되지 않은 줄을 꺼내 반환"""
+        lines = list(self._pending)
+        self._pending.clear()
+        return lines
+
+    def lines(self):
+        """보관 중인 전체 로그 (오래된 순)"""
+        return list(self._lines)
+
+    def clear(self):
+        """버퍼 비우기"""
+        self._lines.clear()
+        self._pending.clear()
+
+    def __len__(self):
+        return len(self._lines)
+
+    def enable_spill(self, file_path, max_bytes=5 * 1024 * 1024, backup_count=3):
+        """로그를 회전 파일로 저장 (파일 쓰기는 별도 스레드에서 수행)"""
+        if self._listener:
+            return
+
+        os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
+        file_handler = RotatingFileHandler(file_path, maxBytes=max_bytes,
+                                           backupCount=backup_count, encoding='utf-8')
+        file_handler.setFormatter(logging.Formatter('%(message)s'))
+
+        log_queue = queue.SimpleQueue()
+        self._listener = QueueListener(log_queue, file_handler)
+        self._listener.start()
+
+        self._spill_logger = logging.getLogger(f"{__name__}.spill.{id(self)}")
+        self._spill_logger.setLevel(logging.INFO)
+        self._spill_logger.propagate = False
+        self._spill_logger.addHandler(QueueHandler(log_queue))
+
+    def disable_spill(self):
+        """파일 저장 중지 (남은 로그는 모두 기록한 뒤 종료)"""
+        if not self._listener:
+            return
+
+        for handler in list(self._spill_logger.handlers):
+            self._spill_logger.removeHandler(handler)
+        self._spill_logger = None
+
+        self._listener.stop()
+        for handler in self._listener.handlers:
+            handler.close()
+        self._listener = None
+
+    @property
+    def spill_enabled(self):
+        return self._listener is not None
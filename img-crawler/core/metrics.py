@@ -0,0 +1,214 @@
+"""
+메트릭 내보내기 - Prometheus 텍스트 엔드포인트와 주기적 JSON 스냅샷 파일
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+from urllib.parse import urlsplit
+
+from aiohttp import web
+
+from .tracing import TimingHistogram
+
+# 메트릭 이름 접두사
+METRIC_PREFIX = 'imgcrawler'
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# (스냅샷 필드, 메트릭 이름, 종류, 설명)
+COUNTER_METRICS = (
+    ('total_urls', 'urls', 'gauge', '크롤링할 전체 페이지 수'),
+    ('processed_urls', 'pages_processed_total', 'counter', '처리한 페이지 수'),
+    ('failed_urls', 'pages_failed_total', 'counter', '실패한 페이지 수'),
+    ('found_images', 'images_found_total', 'counter', '발견한 이미지 수'),
+    ('total_downloads', 'downloads', 'gauge', '다운로드할 전체 이미지 수'),
+    ('downloaded', 'images_downloaded_total', 'counter', '다운로드한 이미지 수'),
+    ('skipped', 'images_skipped_total', 'counter', '건너뛴 이미지 수'),
+    ('failed_downloads', 'images_failed_total', 'counter', '다운로드 실패 이미지 수'),
+    ('bytes_downloaded', 'bytes_downloaded_total', 'counter', '다운로드한 바이트 수'),
+)
+
+
+class InFlightRequests:
+    """요청 종류(page/image)와 호스트별 진행 중인 요청 수"""
+
+    def __init__(self):
+        self.counts = {}
+
+    def begin(self, kind, url):
+        """요청 시작 (end 에 넘길 키 반환)"""
+        key = (kind, urlsplit(url).netloc)
+        self.counts[key] = self.counts.get(key, 0) + 1
+        return key
+
+    def end(self, key):
+        """요청 종료"""
+        count = self.counts.get(key, 0) - 1
+        if count > 0:
+            self.counts[key] = count
+        else:
+            self.counts.pop(key, None)
+
+    def total(self, kind):
+        return sum(count for (k, _), count in self.counts.items() if k == kind)
+
+    def to_dict(self):
+        """{kind: {host: count}}"""
+        result = {}
+        for (kind, host), count in self.counts.items():
+            result.setdefault(kind, {})[host] = count
+        return result
+
+
+def _escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(**labels):
+    return '{' + ','.join(f'{k}="{_escape_label(v)}"' for k, v in labels.items()) + '}'
+
+
+class MetricsExporter:
+    """크롤러 카운터를 읽어 HTTP(/metrics, /metrics.json)와 JSON 파일로 내보냄
+
+    크롤링 경로에는 호스트별 요청 수 증감만 추가되고, 나머지는 요청이 올 때
+    (또는 파일 저장 주기마다) 이미 누적된 카운터와 히스토그램을 읽기만 한다.
+    """
+
+    def __init__(self, crawler, port=None, file_path=None, interval=5.0, host='127.0.0.1'):
+        self.crawler = crawler
+        self.port = port
+        self.file_path = file_path
+        self.interval = interval
+        self.host = host
+        self._runner = None
+        self._writer = None
+
+    @classmethod
+    def from_config(cls, crawler, config):
+        """metrics_port / metrics_file 이 설정된 경우에만 생성"""
+        port = config.get('metrics_port')
+        file_path = config.get('metrics_file')
+        if not port and not file_path:
+            return None
+        return cls(crawler, port=port, file_path=file_path,
+                   interval=config.get('metrics_interval', 5.0),
+                   host=config.get('metrics_host', '127.0.0.1'))
+
+    async def start(self):
+        """엔드포인트와 파일 저장 태스크 시작"""
+        if self.port:
+            app = web.Application()
+            app.router.add_get('/metrics', self.handle_metrics)
+            app.router.add_get('/metrics.json', self.handle_json)
+            self._runner = web.AppRunner(app, access_log=None)
+            await self._runner.setup()
+            try:
+                await web.TCPSite(self._runner, self.host, self.port).start()
+            except OSError as e:
+                print(f"메트릭 엔드포인트 시작 오류 {self.host}:{self.port}: {e}", file=sys.stderr)
+                await self._runner.cleanup()
+                self._runner = None
+
+        if self.file_path:
+            self._writer = asyncio.ensure_future(self._write_loop())
+
+    async def stop(self):
+        """엔드포인트를 닫고 마지막 스냅샷 저장"""
+        if self._writer:
+            self._writer.cancel()
+            self._writer = None
+            self.write_file()
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _write_loop(self):
+        while True:
+            self.write_file()
+            await asyncio.sleep(self.interval)
+
+    def write_file(self):
+        """JSON 스냅샷 파일 저장 (임시 파일에 쓴 뒤 교체)"""
+        try:
+            directory = os.path.dirname(self.file_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            temp_path = f"{self.file_path}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.collect(), f, ensure_ascii=False, indent=2)
+            os.replace(temp_path, self.file_path)
+        except Exception as e:
+            print(f"메트릭 파일 저장 오류 {self.file_path}: {e}", file=sys.stderr)
+
+    def collect(self):
+        """현재 메트릭을 dict 로 수집"""
+        snapshot = self.crawler.tracker.snapshot()
+        in_flight = self.crawler.in_flight
+        pages_in_flight = in_flight.total('page') if in_flight else 0
+        images_in_flight = in_flight.total('image') if in_flight else 0
+
+        return {
+            'timestamp': time.time(),
+            'progress': snapshot.to_dict(),
+            'in_flight': in_flight.to_dict() if in_flight else {},
+            'queue_depth': {
+                'pages': max(0, snapshot.total_urls - snapshot.processed_urls - pages_in_flight),
+                'downloads': max(0, snapshot.total_downloads - snapshot.processed_images
+                                 - images_in_flight),
+            },
+            'timings': self.crawler.get_timing_summary(include_buckets=True),
+        }
+
+    def render_prometheus(self):
+        """Prometheus 텍스트 형식으로 변환"""
+        data = self.collect()
+        progress = data['progress']
+        lines = []
+
+        for field, name, metric_type, help_text in COUNTER_METRICS:
+            metric = f"{METRIC_PREFIX}_{name}"
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} {metric_type}")
+            lines.append(f"{metric} {progress[field]}")
+
+        metric = f"{METRIC_PREFIX}_elapsed_seconds"
+        lines.append(f"# HELP {metric} 크롤링 경과 시간")
+        lines.append(f"# TYPE {metric} gauge")
+        lines.append(f"{metric} {progress['elapsed']}")
+
+        metric = f"{METRIC_PREFIX}_in_flight_requests"
+        lines.append(f"# HELP {metric} 호스트별 진행 중인 요청 수")
+        lines.append(f"# TYPE {metric} gauge")
+        for kind, hosts in sorted(data['in_flight'].items()):
+            for host, count in sorted(hosts.items()):
+                lines.append(f"{metric}{_labels(kind=kind, host=host)} {count}")
+
+        metric = f"{METRIC_PREFIX}_queue_depth"
+        lines.append(f"# HELP {metric} 동시 연결 제한을 기다리는 요청 수")
+        lines.append(f"# TYPE {metric} gauge")
+        for queue, depth in sorted(data['queue_depth'].items()):
+            lines.append(f"{metric}{_labels(queue=queue)} {depth}")
+
+        metric = f"{METRIC_PREFIX}_request_phase_seconds"
+        lines.append(f"# HELP {metric} 요청 단계별 소요 시간")
+        lines.append(f"# TYPE {metric} histogram")
+        for (kind, phase), histogram in sorted(self.crawler.timing_stats.histograms.items()):
+            cumulative = 0
+            bounds = [str(b / 1000) for b in TimingHistogram.BUCKETS] + ['+Inf']
+            for bound, count in zip(bounds, histogram.counts):
+                cumulative += count
+                lines.append(f"{metric}_bucket{_labels(kind=kind, phase=phase, le=bound)} {cumulative}")
+            lines.append(f"{metric}_sum{_labels(kind=kind, phase=phase)} {round(histogram.total / 1000, 6)}")
+            lines.append(f"{metric}_count{_labels(kind=kind, phase=phase)} {histogram.count}")
+
+        return '\n'.join(lines) + '\n'
+
+    async def handle_metrics(self, request):
+        return web.Response(text=self.render_prometheus(),
+                            headers={'Content-Type': PROMETHEUS_CONTENT_TYPE})
+
+    async def handle_json(self, request):
+        return web.json_response(self.collect())
@@ -0,0 +1,132 @@
+"""
+묶음 저장 - 이미지를 tar 묶음 파일에 이어 붙이고 색인(URL -> 묶음, 위치, 길이) 기록
+
+저장 구조 (save_path):
+    <prefix>-00000.tar, <prefix>-00001.tar ...  shard_bytes 를 넘으면 다음 묶음으로
+    <prefix>.index.jsonl                        이미지마다 한 줄 (name, url, shard, offset, length,
+                                                type, width, height ...)
+
+묶음은 표준 tar 파일이라 tar 명령으로도 풀 수 있고, offset/length 는 tar 헤더를 제외한
+이미지 바이트의 위치라 mmap 으로 바로 읽을 수 있다.
+"""
+
+import glob
+import json
+import os
+import re
+import tarfile
+import time
+
+TAR_BLOCK_SIZE = tarfile.BLOCKSIZE  # 512
+INDEX_SUFFIX = '.index.jsonl'
+SHARD_NAME = re.compile(r'-(\d{5})\.tar$')
+
+
+class PackWriter:
+    """tar 묶음 파일에 순서대로 추가 (한 스레드에서만 호출)"""
+
+    def __init__(self, directory, prefix='pack', shard_bytes=1024 * 1024 * 1024, fsync=False):
+        self.directory = directory
+        self.prefix = prefix
+        self.shard_bytes = shard_bytes
+        self.fsync = fsync
+        self.index_path = os.path.join(directory, f"{prefix}{INDEX_SUFFIX}")
+        self.entries = {}  # 저장된 이름 -> 색인 항목 (이전 실행 포함)
+        self._shard_number = 0
+        self._shard_file = None
+        self._shard_name = None
+        self._index_file = None
+
+        os.makedirs(directory, exist_ok=True)
+        self._load_existing()
+
+    def _load_existing(self):
+        """이전 실행의 색인을 읽고 다음 묶음 번호 결정 (기존 묶음에는 덧붙이지 않음)"""
+        for entry in read_index(self.index_path):
+            self.entries[entry['name']] = entry
+
+        existing = glob.glob(os.path.join(glob.escape(self.directory), f"{glob.escape(self.prefix)}-*.tar"))
+        numbers = [int(m.group(1)) for m in (SHARD_NAME.search(path) for path in existing) if m]
+        self._shard_number = max(numbers) + 1 if numbers else 0
+
+    def _open_shard(self):
+        self._shard_name = f"{self.prefix}-{self._shard_number:05d}.tar"
+        self._shard_file = open(os.path.join(self.directory, self._shard_name), 'wb')
+        self._shard_number += 1
+
+    def _close_shard(self):
+        if self._shard_file is None:
+            return
+        # tar 끝 표시 (빈 블록 두 개)
+        self._shard_file.write(b'\0' * TAR_BLOCK_SIZE * 2)
+        self._shard_file.flush()
+        if self.fsync:
+            os.fsync(self._shard_file.fileno())
+        self._shard_file.close()
+        self._shard_file = None
+
+    def add(self, name, content, **metadata):
+        """이미지 하나 추가 후 색인 항목 반환"""
+        if (self._shard_file is not None and self._shard_file.tell() > 0
+                and self._shard_file.tell() + len(content) > self.shard_bytes):
+            self._close_shard()
+        if self._shard_file is None:
+            self._open_shard()
+
+        info = tarfile.TarInfo(name)
+        info.size = len(content)
+        info.mtime = int(time.time())
+        info.mode = 0o644
+        header = info.tobuf(format=tarfile.PAX_FORMAT, encoding='utf-8', errors='surrogateescape')
+
+        f = self._shard_file
+        offset = f.tell() + len(header)
+        f.write(header)
+        f.write(content)
+        remainder = len(content) % TAR_BLOCK_SIZE
+        if remainder:
+            f.write(b'\0' * (TAR_BLOCK_SIZE - remainder))
+
+        entry = dict(metadata, name=name, shard=self._shard_name, offset=offset,
+                     length=len(content), mtime=info.mtime)
+        if self._index_file is None:
+            self._index_file = open(self.index_path, 'a', encoding='utf-8')
+        self._index_file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        self.entries[name] = entry
+        return entry
+
+    def flush(self):
+        """묶음과 색인을 디스크에 반영"""
+        for f in (self._shard_file, self._index_file):
+            if f is not None:
+                f.flush()
+                if self.fsync:
+                    os.fsync(f.fileno())
+
+    def close(self):
+        self._close_shard()
+        if self._index_file is not None:
+            self.flush()
+            self._index_file.close()
+            self._index_file = None
+
+
+def append_index(index_path, entries):
+    """색인 항목들을 한 번에 추가"""
+    if entries:
+        with open(index_path, 'a', encoding='utf-8') as f:
+            f.write(''.join(json.dumps(entry, ensure_ascii=False) + '\n' for entry in entries))
+
+
+def read_index(index_path):
+    """색인 파일 읽기 (마지막 줄이 잘린 경우 무시)"""
+    entries = []
+    if not os.path.exists(index_path):
+        return entries
+    with open(index_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                continue
+    return entries
@@ -0,0 +1,132 @@
+"""
+페이지 캐시 - 다시 크롤링할 때 바뀌지 않은 페이지는 파싱하지 않고 이전 추출 결과 재사용
+
+페이지마다 ETag / Last-Modified 와 본문 해시, 추출한 이미지/링크 목록을
+state_dir/pages.sqlite3 에 저장한다.
+
+- 다음 실행에서는 If-None-Match / If-Modified-Since 로 요청해 304 면 본문도 받지 않음
+- 200 이어도 본문 해시가 같으면 파싱하지 않음
+- 다운로드에 성공한 이미지 URL 도 기록해 새 이미지만 다운로더에 전달
+
+선택자 설정이 바뀌면 (signature 가 다르면) 이전 결과는 쓰지 않는다.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+from .records import ImageInfo
+
+# 변경 사항을 디스크에 반영하는 주기 (페이지 수)
+COMMIT_EVERY = 200
+
+
+def body_hash(body):
+    """페이지 본문 지문"""
+    return hashlib.blake2b(body, digest_size=16).hexdigest()
+
+
+def extraction_signature(config):
+    """추출 결과에 영향을 주는 설정의 지문 (바뀌면 캐시한 추출 결과를 쓰지 않음)"""
+    keys = ('selectors', 'follow_selectors', 'check_extensions', 'strict_extensions')
+    return body_hash(json.dumps({key: config.get(key) for key in keys}, sort_keys=True).encode())
+
+
+class PageCache:
+    """페이지별 지문과 추출 결과, 다운로드한 이미지 URL 저장소 (이벤트 루프 스레드 하나에서만 사용)"""
+
+    def __init__(self, path, signature=''):
+        self.path = path
+        self.signature = signature
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        # 여러 작업자 프로세스가 같은 상태 폴더를 쓸 수 있으므로 잠금 대기 시간을 둠
+        self._conn = sqlite3.connect(path, timeout=30)
+        self._conn.executescript("""
+            PRAGMA journal_mode = WAL;
+            PRAGMA synchronous = NORMAL;
+            CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY,
+                signature TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                hash TEXT NOT NULL,
+                images TEXT NOT NULL,
+                links TEXT,
+                fetched REAL NOT NULL);
+            CREATE TABLE IF NOT EXISTS images (url TEXT PRIMARY KEY);
+        """)
+        self._pending = 0
+
+    def get(self, url, need_links=False):
+        """이전 실행의 페이지 기록 (없거나 선택자 설정이 다르면 None)
+
+        need_links 면 링크를 추출하지 않고 저장한 기록도 None
+        """
+        row = self._conn.execute(
+            "SELECT etag, last_modified, hash, images, links FROM pages WHERE url = ? AND signature = ?",
+            (url, self.signature)).fetchone()
+        if row is None or (need_links and row[4] is None):
+            return None
+        etag, last_modified, digest, images, links = row
+        return {'etag': etag, 'last_modified': last_modified, 'hash': digest,
+                'images': images, 'links': links}
+
+    @staticmethod
+    def conditional_headers(entry):
+        """이전 기록으로 조건부 요청 헤더 구성"""
+        headers = {}
+        if entry and entry['etag']:
+            headers['If-None-Match'] = entry['etag']
+        if entry and entry['last_modified']:
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    @staticmethod
+    def images(entry):
+        return [ImageInfo.from_dict(image) for image in json.loads(entry['images'])]
+
+    @staticmethod
+    def links(entry):
+        """저장한 링크 목록 (링크를 추출하지 않은 페이지면 None)"""
+        return None if entry['links'] is None else json.loads(entry['links'])
+
+    @staticmethod
+    def validators_changed(entry, response):
+        """ETag / Last-Modified 가 저장한 값과 다른지 (본문은 같아도 다음 조건부 요청을 위해 갱신)"""
+        return (entry['etag'] != response.headers.get('ETag')
+                or entry['last_modified'] != response.headers.get('Last-Modified'))
+
+    def put(self, url, response, digest, images, links=None):
+        """페이지 추출 결과 저장"""
+        self._conn.execute(
+            "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (url, self.signature, response.headers.get('ETag'), response.headers.get('Last-Modified'),
+             digest, json.dumps([image.to_dict() for image in images], ensure_ascii=False),
+             None if links is None else json.dumps(links, ensure_ascii=False), time.time()))
+        self._maybe_commit()
+
+    def known_images(self, urls):
+        """이미 다운로드한 이미지 URL 집합"""
+        urls = list(urls)
+        known = set()
+        for start in range(0, len(urls), 500):
+            chunk = urls[start:start + 500]
+            known.update(url for (url,) in self._conn.execute(
+                f"SELECT url FROM images WHERE url IN ({','.join('?' * len(chunk))})", chunk))
+        return known
+
+    def mark_downloaded(self, urls):
+        self._conn.executemany("INSERT OR IGNORE INTO images VALUES (?)", ((url,) for url in urls))
+        self._conn.commit()
+
+    def _maybe_commit(self):
+        self._pending += 1
+        if self._pending >= COMMIT_EVERY:
+            self._conn.commit()
+            self._pending = 0
+
+    def close(self):
+        self._conn.commit()
+        self._conn.close()
@@ -0,0 +1,50 @@
+"""
+일시정지 - 작업자가 새 요청을 시작하기 전에 지나가는 관문
+
+일시정지하면 작업자는 다음 요청 직전에 멈춰 기다리고, 세션(연결 풀), 대기 중인
+페이지/이미지 목록, 중복 제거 집합은 그대로 둔다. 재개하면 멈춘 자리에서 이어서 진행한다.
+이미 받고 있던 응답은 끝까지 받는다.
+"""
+
+import asyncio
+
+
+class PauseGate:
+    """일시정지 관문 (pause/resume 은 어느 스레드에서 호출해도 됨)"""
+
+    def __init__(self):
+        self.paused = False
+        self._event = None  # asyncio.Event (처음 기다릴 때 루프에서 생성)
+        self._loop = None
+
+    async def wait(self):
+        """일시정지 중이면 재개될 때까지 대기"""
+        while self.paused:
+            if self._event is None:
+                self._event = asyncio.Event()
+                self._loop = asyncio.get_running_loop()
+            self._event.clear()
+            if not self.paused:
+                break  # 이벤트를 만드는 사이 재개됨 (resume 이 깨울 이벤트가 없었음)
+            await self._event.wait()
+
+    def pause(self):
+        self.paused = True
+
+    def resume(self):
+        """기다리는 작업자를 모두 깨움 (루프 스레드가 아니면 루프에 예약)"""
+        self.paused = False
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._event.set()
+            return
+        try:
+            loop.call_soon_threadsafe(self._event.set)
+        except RuntimeError:
+            pass  # 루프가 그 사이 닫힘
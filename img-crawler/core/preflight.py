@@ -0,0 +1,245 @@
+"""
+사전 확인 - 본문을 받기 전에 HEAD / Range 요청으로 이미지를 분류해 걸러내기
+
+대부분의 후보가 크기, 형식, 중복으로 걸러지는 크롤링에서는 본문 전체를 받기 전에
+앞부분(1KB)만 높은 동시성으로 받아 Content-Length, Content-Type, ETag, 헤더의 가로/세로를
+확인하고 남은 이미지만 다운로드한다.
+
+설정:
+    preflight: auto (기본값, 비용 모델로 판단) / on / off
+    preflight_method: range (앞부분 1KB, 기본값) / head (가로/세로는 알 수 없음)
+    max_file_size_mb, min_width, min_height, allowed_types, dedupe_etag: 거르는 조건
+"""
+
+import asyncio
+import re
+
+from .image_types import IMAGE_TYPES, detect_image, image_dimensions
+from .tracing import RequestTiming
+
+PREFLIGHT_MODES = ('auto', 'on', 'off')
+PREFLIGHT_METHODS = ('range', 'head')
+
+# Range 요청으로 받을 앞부분 길이 (대부분 형식의 가로/세로가 들어 있음)
+RANGE_BYTES = 1024
+
+# Content-Range: bytes 0-1023/123456 의 전체 길이
+CONTENT_RANGE_TOTAL = re.compile(r'/(\d+)\s*$')
+
+
+async def read_prefix(response, size):
+    """응답 본문의 앞부분만 읽기 (본문이 더 짧으면 전체)"""
+    head = b''
+    while len(head) < size:
+        chunk = await response.content.read(size - len(head))
+        if not chunk:
+            break
+        head += chunk
+    return head
+
+
+class ImagePreflight:
+    """사전 확인과 거르는 조건 (조건은 사전 확인을 하지 않을 때도 본 다운로드에서 적용)
+
+    비용 모델 (auto):
+        처음 sample_size 개를 확인해 걸러지는 비율 r, 확인 요청 시간 t, 평균 크기 S 를 구하고
+        r * (t + S / 대역폭) / 다운로드 동시성 > t / 확인 동시성 이면 나머지도 확인한다.
+        (걸러서 아끼는 다운로드 시간이 확인에 드는 시간보다 클 때만)
+    """
+
+    def __init__(self, mode='auto', method='range', concurrent=16, max_bytes=0,
+                 min_width=0, min_height=0, allowed_types=None, dedupe_etag=False,
+                 reject_non_images=True, download_concurrent=3, sample_size=32,
+                 bandwidth_mbps=5.0):
+        self.mode = mode
+        self.method = method
+        self.concurrent = concurrent
+        self.max_bytes = max_bytes  # 0 이면 제한 없음
+        self.min_width = min_width
+        self.min_height = min_height
+        self.allowed_types = allowed_types  # MIME 집합 (None 이면 모두 허용)
+        self.dedupe_etag = dedupe_etag
+        self.reject_non_images = reject_non_images
+        self.download_concurrent = download_concurrent
+        self.sample_size = sample_size
+        self.bandwidth = bandwidth_mbps * 1024 * 1024  # 연결 하나의 예상 대역폭 (바이트/초)
+        self.timing_stats = None  # TimingStats (다운로더가 설정)
+        self.gate = None  # PauseGate (다운로더가 설정)
+        self.slots = None  # 작업 관리자의 요청 슬롯 (있으면 concurrent 대신 사용)
+        self.stats = {}
+        self._etags = {}  # (ETag, 길이) -> 처음 본 URL
+        self._latencies = []  # 확인 요청 시간 (초, 대기 제외)
+        self._sizes = []
+
+    @classmethod
+    def from_config(cls, config):
+        mode = config.get('preflight', 'auto')
+        if mode not in PREFLIGHT_MODES:
+            raise ValueError(f"지원하지 않는 사전 확인 방식: {mode} "
+                             f"(가능한 값: {', '.join(PREFLIGHT_MODES)})")
+        method = config.get('preflight_method', 'range')
+        if method not in PREFLIGHT_METHODS:
+            raise ValueError(f"지원하지 않는 사전 확인 요청: {method} "
+                             f"(가능한 값: {', '.join(PREFLIGHT_METHODS)})")
+
+        allowed_types = None
+        if config.get('allowed_types'):
+            # 형식 이름(jpeg, png ...), 확장자(.jpg), MIME(image/png) 모두 허용
+            names = config['allowed_types']
+            if isinstance(names, str):
+                names = [names]
+            allowed_types = set()
+            for name in filter(None, ','.join(names).split(',')):
+                name = name.strip().lower().lstrip('.')
+                name = {'jpg': 'jpeg', 'tif': 'tiff'}.get(name, name)
+                allowed_types.add(IMAGE_TYPES[name][0] if name in IMAGE_TYPES else name)
+
+        concurrent = config.get('concurrent', 3)
+        return cls(mode=mode, method=method,
+                   concurrent=config.get('preflight_concurrent', concurrent * 4),
+                   max_bytes=int(config.get('max_file_size_mb', 0) * 1024 * 1024),
+                   min_width=config.get('min_width', 0),
+                   min_height=config.get('min_height', 0),
+                   allowed_types=allowed_types,
+                   dedupe_etag=config.get('dedupe_etag', False),
+                   reject_non_images=config.get('verify_content', True),
+                   download_concurrent=concurrent,
+                   bandwidth_mbps=config.get('assumed_bandwidth_mbps', 5.0))
+
+    @property
+    def has_filters(self):
+        return bool(self.max_bytes or self.min_width or self.min_height
+                    or self.allowed_types or self.dedupe_etag)
+
+    @property
+    def enabled(self):
+        """사전 확인 단계를 실행할지 (거를 조건이 없으면 얻을 것이 없음)"""
+        return self.mode != 'off' and self.has_filters
+
+    def inspect(self, response, head=b''):
+        """응답 헤더와 앞부분으로 크기, 형식, ETag, 가로/세로 확인"""
+        content_type = response.headers.get('Content-Type', '')
+        info = {'size': None, 'type': None, 'etag': response.headers.get('ETag'),
+                'width': None, 'height': None, 'is_image': None}
+
+        content_range = CONTENT_RANGE_TOTAL.search(response.headers.get('Content-Range', ''))
+        if response.status == 206 and content_range:
+            info['size'] = int(content_range.group(1))
+        elif response.content_length is not None and response.status != 206:
+            info['size'] = response.content_length
+
+        if head:
+            detected = detect_image(head, content_type)
+            info['is_image'] = detected is not None
+            if detected:
+                image_format, info['type'] = detected
+                dimensions = image_dimensions(head, image_format) if image_format else None
+                if dimensions:
+                    info['width'], info['height'] = dimensions
+        elif content_type:
+            # HEAD: 본문이 없으므로 Content-Type 만으로 판단
+            mime = content_type.split(';', 1)[0].strip().lower()
+            info['is_image'] = mime.startswith('image/')
+            info['type'] = mime if info['is_image'] else None
+        return info
+
+    def check(self, info, url):
+        """거를 이유 (통과하면 None, 알 수 없는 값은 통과)"""
+        if info['is_image'] is False and self.reject_non_images:
+            return 'not an image'
+        if self.allowed_types and info['type'] and info['type'] not in self.allowed_types:
+            return f"type {info['type']}"
+        if self.max_bytes and info['size'] and info['size'] > self.max_bytes:
+            return f"size {info['size']}"
+        if (info['width'] and info['height']
+                and (info['width'] < self.min_width or info['height'] < self.min_height)):
+            return f"dimensions {info['width']}x{info['height']}"
+        if self.dedupe_etag and info['etag']:
+            key = (info['etag'], info['size'])
+            first_url = self._etags.setdefault(key, url)
+            if first_url != url:
+                return f"duplicate of {first_url}"
+        return None
+
+    async def _probe(self, session, semaphore, url, headers):
+        """이미지 하나 사전 확인 (실패하면 None - 다운로드 단계에서 다시 시도)"""
+        timing = RequestTiming()
+        async with semaphore:
+            if self.gate is not None:
+                await self.gate.wait()
+            timing.mark_dequeued()
+            try:
+                if self.method == 'head':
+                    async with session.head(url, headers=headers, allow_redirects=True,
+                                            trace_request_ctx=timing) as response:
+                        if response.status not in (200, 206):
+                            return None
+                        return self.inspect(response)
+
+                headers = dict(headers, Range=f'bytes=0-{RANGE_BYTES - 1}')
+                async with session.get(url, headers=headers, trace_request_ctx=timing) as response:
+                    if response.status not in (200, 206):
+                        return None
+                    head = await read_prefix(response, RANGE_BYTES)
+                    timing.mark_body_done()
+                    if response.status == 200:
+                        response.close()  # Range 를 무시한 서버: 나머지는 받지 않음
+                    return self.inspect(response, head)
+            except Exception:
+                return None
+            finally:
+                timing.finish()
+                if self.timing_stats is not None:
+                    self.timing_stats.record('preflight', timing)
+                self._latencies.append(timing.durations['total'] - timing.durations.get('queue_wait', 0))
+
+    async def _probe_all(self, session, semaphore, images, headers_for):
+        infos = await asyncio.gather(*[
+            self._probe(session, semaphore, image.get('url', ''), headers_for(image))
+            for image in images
+        ])
+        self._sizes.extend(info['size'] for info in infos if info)
+        return [self.check(info, image.get('url', '')) if info else None
+                for image, info in zip(images, infos)]
+
+    def pays_off(self, reasons):
+        """표본 결과로 나머지도 사전 확인할지 판단"""
+        if not reasons or not self._latencies:
+            return False
+        filtered_ratio = sum(1 for reason in reasons if reason) / len(reasons)
+        latency = sum(self._latencies) / len(self._latencies)
+        sizes = [size for size in self._sizes if size]
+        average_size = sum(sizes) / len(sizes) if sizes else 0
+
+        download_cost = (latency + average_size / self.bandwidth) / max(1, self.download_concurrent)
+        preflight_cost = latency / max(1, self.concurrent)
+        self.stats.update(filtered_ratio=round(filtered_ratio, 3),
+                          latency_ms=round(latency * 1000, 1),
+                          average_size=int(average_size))
+        return filtered_ratio * download_cost > preflight_cost
+
+    async def run(self, session, images, headers_for):
+        """이미지 목록을 사전 확인해 이미지마다 거를 이유(통과는 None) 목록 반환"""
+        self._latencies = []
+        self._sizes = []
+        self.stats = {'mode': self.mode, 'method': self.method, 'probed': 0, 'filtered': 0}
+        # 작업 관리자에서 실행하면 공유 연결 몫을 넘지 않도록 작업의 요청 슬롯을 사용
+        semaphore = self.slots or asyncio.Semaphore(self.concurrent)
+
+        probe_count = len(images)
+        if self.mode == 'auto' and len(images) > self.sample_size:
+            probe_count = self.sample_size
+
+        reasons = await self._probe_all(session, semaphore, images[:probe_count], headers_for)
+        if probe_count < len(images):
+            if self.pays_off(reasons):
+                self.stats['decision'] = 'preflight'
+                reasons += await self._probe_all(session, semaphore, images[probe_count:], headers_for)
+                probe_count = len(images)
+            else:
+                self.stats['decision'] = 'download'
+                reasons += [None] * (len(images) - probe_count)
+
+        self.stats['probed'] = probe_count
+        self.stats['filtered'] = sum(1 for reason in reasons if reason)
+        return reasons
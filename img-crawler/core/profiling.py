@@ -0,0 +1,298 @@
+"""
+프로파일링 - 크롤링 실행의 CPU 프로파일, 느린 콜백, 단계별 메모리 스냅샷 기록
+
+출력 파일 (output_dir):
+    cpu.prof                    cProfile 결과 (python -m pstats, snakeviz 등으로 확인)
+    slow_callbacks.json         이벤트 루프를 slow_callback_ms 이상 점유한 콜백 목록
+    tracemalloc_<n>_<단계>.snap 단계 전환 시점의 메모리 스냅샷 (tracemalloc.Snapshot.load)
+    summary.json / summary.txt  루프를 막은 호출 상위 목록과 분류별 시간
+"""
+
+import asyncio
+import contextlib
+import cProfile
+import json
+import logging
+import os
+import pstats
+import re
+import sys
+import time
+import tracemalloc
+
+# 루프를 막는 호출 분류 (pstats 의 "파일:함수" 문자열에 포함되는 부분)
+BLOCKING_CATEGORIES = {
+    'html_parse': ('bs4', 'html/parser.py', 'soupsieve', '_extract_images'),
+    'file_io': ("'_io.", 'io.open', 'posix.stat', 'posix.mkdir', 'posix.replace',
+                'os.py:makedirs', 'genericpath.py'),
+    'url_parse': ('urllib/parse.py',),
+    'json': ('json/',),
+}
+
+# 이벤트 대기 시간 (루프가 쉬고 있는 시간이므로 차단 시간에서 제외)
+IDLE_MARKERS = ("'select.", 'selectors.py', "'_overlapped.", 'windows_events.py')
+
+# 프로파일링 자체의 비용 (디버그 모드의 호출 위치 기록, tracemalloc)
+OVERHEAD_MARKERS = ('traceback.py', 'linecache.py', 'tracemalloc', 'asyncio/format_helpers.py',
+                    'core/profiling.py')
+
+# asyncio 느린 콜백 경고에서 코루틴 이름 추출
+CORO_NAME = re.compile(r"coro=<([\w.]+)\(")
+
+
+def _label(key):
+    """pstats 키 (파일, 줄, 함수) 를 분류용 문자열로 변환"""
+    file_name, _, func_name = key
+    return f"{file_name}:{func_name}" if file_name != '~' else func_name
+
+
+class _SlowCallbackHandler(logging.Handler):
+    """asyncio 의 'Executing ... took N seconds' 경고 수집"""
+
+    def __init__(self):
+        super().__init__(logging.WARNING)
+        self.records = []
+
+    def emit(self, record):
+        # asyncio 로거에는 다른 형식의 메시지 (str 이 아닌 msg, 인자 없음) 도 들어옴
+        if not (isinstance(record.msg, str) and record.msg.startswith('Executing')
+                and isinstance(record.args, tuple) and len(record.args) >= 2):
+            return
+        handle, duration = record.args[0], record.args[1]
+        match = CORO_NAME.search(str(handle))
+        self.records.append({
+            'callback': match.group(1) if match else str(handle)[:120],
+            'duration_ms': round(duration * 1000, 3),
+            'time': record.created,
+        })
+
+
+class CrawlProfiler:
+    """크롤링 실행 한 번을 프로파일링
+
+    사용법:
+        profiler = CrawlProfiler('profile')
+        profiler.attach(crawler)
+        with profiler.profile(loop):
+            loop.run_until_complete(crawler.crawl())
+        profiler.summary  # 결과 요약 (파일에도 저장됨)
+    """
+
+    def __init__(self, output_dir, slow_callback_ms=100, tracemalloc_frames=10, top=15):
+        self.output_dir = output_dir
+        self.slow_callback_ms = slow_callback_ms
+        self.tracemalloc_frames = tracemalloc_frames
+        self.top = top
+        self.summary = None
+        self._crawler = None
+        self._snapshots = []  # (단계, 파일 경로, Snapshot)
+
+    @classmethod
+    def from_config(cls, config):
+        """profile_dir 이 설정된 경우에만 생성"""
+        output_dir = config.get('profile_dir')
+        if not output_dir:
+            return None
+        return cls(output_dir, slow_callback_ms=config.get('slow_callback_ms', 100))
+
+    def attach(self, crawler):
+        """단계 전환(progress 이벤트)마다 메모리 스냅샷 저장"""
+        self._crawler = crawler
+        crawler.events.on('progress', self._on_progress)
+
+    def _on_progress(self, percentage, message):
+        if tracemalloc.is_tracing():
+            self._take_snapshot(self._crawler.tracker.phase)
+
+    def _take_snapshot(self, phase):
+        snapshot = tracemalloc.take_snapshot()
+        file_path = os.path.join(self.output_dir, f"tracemalloc_{len(self._snapshots)}_{phase}.snap")
+        snapshot.dump(file_path)
+        self._snapshots.append((phase, file_path, snapshot))
+
+    @contextlib.contextmanager
+    def profile(self, loop):
+        """loop 를 실행하는 동안 프로파일링 (loop 를 실행하는 스레드에서 호출)"""
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        previous_debug = loop.get_debug()
+        previous_slow = loop.slow_callback_duration
+        loop.set_debug(True)
+        loop.slow_callback_duration = self.slow_callback_ms / 1000
+
+        slow_handler = _SlowCallbackHandler()
+        asyncio_logger = logging.getLogger('asyncio')
+        asyncio_logger.addHandler(slow_handler)
+
+        started_tracemalloc = not tracemalloc.is_tracing()
+        if started_tracemalloc:
+            tracemalloc.start(self.tracemalloc_frames)
+        self._take_snapshot('start')
+
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        profiler.enable()
+        try:
+            yield self
+        finally:
+            profiler.disable()
+            wall_time = time.perf_counter() - start
+
+            self._take_snapshot('end')
+            if started_tracemalloc:
+                tracemalloc.stop()
+            asyncio_logger.removeHandler(slow_handler)
+            loop.set_debug(previous_debug)
+            loop.slow_callback_duration = previous_slow
+
+            try:
+                self._write_outputs(profiler, slow_handler.records, wall_time)
+            except Exception as e:
+                print(f"프로파일 저장 오류 {self.output_dir}: {e}", file=sys.stderr)
+
+    def run(self, coro):
+        """새 이벤트 루프에서 coro 를 프로파일링하며 실행 (asyncio.run 대체)"""
+        loop = asyncio.new_event_loop()
+        try:
+            asyncio.set_event_loop(loop)
+            with self.profile(loop):
+                return loop.run_until_complete(coro)
+        finally:
+            loop.run_until_complete(loop.shutdown_asyncgens())
+            asyncio.set_event_loop(None)
+            loop.close()
+
+    def _write_outputs(self, profiler, slow_callbacks, wall_time):
+        """프로파일 파일과 요약 저장"""
+        profile_path = os.path.join(self.output_dir, 'cpu.prof')
+        profiler.dump_stats(profile_path)
+
+        with open(os.path.join(self.output_dir, 'slow_callbacks.json'), 'w', encoding='utf-8') as f:
+            json.dump(slow_callbacks, f, ensure_ascii=False, indent=2)
+
+        self.summary = {
+            'wall_time_s': round(wall_time, 3),
+            'profile': profile_path,
+            **self._summarize_profile(pstats.Stats(profiler), wall_time),
+            'slow_callbacks': self._summarize_slow_callbacks(slow_callbacks),
+            'memory': self._summarize_memory(),
+        }
+
+        with open(os.path.join(self.output_dir, 'summary.json'), 'w', encoding='utf-8') as f:
+            json.dump(self.summary, f, ensure_ascii=False, indent=2)
+        with open(os.path.join(self.output_dir, 'summary.txt'), 'w', encoding='utf-8') as f:
+            f.write(format_summary(self.summary))
+
+    def _summarize_profile(self, stats, wall_time):
+        """루프 스레드의 차단 시간과 상위 호출 정리"""
+        idle_time = 0.0
+        overhead_time = 0.0
+        categories = dict.fromkeys(BLOCKING_CATEGORIES, 0.0)
+        functions = []
+
+        for key, (_, calls, tottime, cumtime, callers) in stats.stats.items():
+            label = _label(key)
+            if any(marker in label for marker in IDLE_MARKERS):
+                idle_time += tottime
+                continue
+            if any(marker in label for marker in OVERHEAD_MARKERS):
+                overhead_time += tottime
+                continue
+
+            # 프로파일링 코드에서 호출된 몫 (예: linecache 의 os.stat) 제외
+            overhead_share = sum(caller_stats[2] for caller, caller_stats in callers.items()
+                                 if any(marker in _label(caller) for marker in OVERHEAD_MARKERS))
+            overhead_time += overhead_share
+            tottime -= overhead_share
+            if tottime <= 0:
+                continue
+
+            for category, markers in BLOCKING_CATEGORIES.items():
+                if any(marker in label for marker in markers):
+                    categories[category] += tottime
+                    break
+            line = key[1]
+            functions.append((tottime, cumtime, calls, f"{label}:{line}" if line else label))
+
+        functions.sort(reverse=True)
+        return {
+            'loop_idle_s': round(idle_time, 3),
+            'loop_busy_s': round(max(0.0, wall_time - idle_time - overhead_time), 3),
+            'profiler_overhead_s': round(overhead_time, 3),
+            'blocking_by_category_s': {k: round(v, 3) for k, v in categories.items()},
+            'top_functions': [
+                {'function': name, 'calls': calls, 'tottime_s': round(tottime, 4),
+                 'cumtime_s': round(cumtime, 4)}
+                for tottime, cumtime, calls, name in functions[:self.top]
+            ],
+        }
+
+    def _summarize_slow_callbacks(self, records):
+        """콜백별 느린 실행 횟수와 시간"""
+        grouped = {}
+        for record in records:
+            entry = grouped.setdefault(record['callback'], {'count': 0, 'total_ms': 0.0, 'max_ms': 0.0})
+            entry['count'] += 1
+            entry['total_ms'] += record['duration_ms']
+            entry['max_ms'] = max(entry['max_ms'], record['duration_ms'])
+
+        ranked = sorted(grouped.items(), key=lambda item: item[1]['total_ms'], reverse=True)
+        return {
+            'threshold_ms': self.slow_callback_ms,
+            'count': len(records),
+            'top': [dict(callback=name, total_ms=round(entry['total_ms'], 3),
+                         count=entry['count'], max_ms=entry['max_ms'])
+                    for name, entry in ranked[:self.top]],
+        }
+
+    def _summarize_memory(self):
+        """단계별 메모리 사용량과 직전 단계 대비 증가가 큰 위치"""
+        phases = []
+        previous = None
+        for phase, file_path, snapshot in self._snapshots:
+            entry = {
+                'phase': phase,
+                'file': file_path,
+                'traced_mb': round(sum(stat.size for stat in snapshot.statistics('filename')) / 1048576, 3),
+            }
+            if previous is not None:
+                entry['top_growth'] = [
+                    {'location': str(diff.traceback), 'size_diff_kb': round(diff.size_diff / 1024, 1)}
+                    for diff in snapshot.compare_to(previous, 'lineno')[:5]
+                ]
+            phases.append(entry)
+            previous = snapshot
+        self._snapshots = []
+        return phases
+
+
+def format_summary(summary):
+    """사람이 읽을 수 있는 요약 텍스트"""
+    lines = [
+        f"전체 시간: {summary['wall_time_s']}초 "
+        f"(루프 실행 {summary['loop_busy_s']}초 / 대기 {summary['loop_idle_s']}초 / "
+        f"프로파일링 비용 {summary['profiler_overhead_s']}초)",
+        f"CPU 프로파일: {summary['profile']}",
+        "",
+        "[루프를 막은 시간 (분류별)]",
+    ]
+    for category, seconds in sorted(summary['blocking_by_category_s'].items(),
+                                    key=lambda item: item[1], reverse=True):
+        lines.append(f"  {category:<12}{seconds:>10.3f}초")
+
+    slow = summary['slow_callbacks']
+    lines += ["", f"[느린 콜백 ({slow['threshold_ms']}ms 이상, {slow['count']}회)]"]
+    for entry in slow['top']:
+        lines.append(f"  {entry['total_ms']:>10.1f}ms  {entry['count']:>5}회  "
+                     f"최대 {entry['max_ms']:.1f}ms  {entry['callback']}")
+
+    lines += ["", "[자체 실행 시간 상위 함수]"]
+    for entry in summary['top_functions']:
+        lines.append(f"  {entry['tottime_s']:>10.4f}초  {entry['calls']:>8}회  {entry['function']}")
+
+    lines += ["", "[단계별 메모리 (tracemalloc)]"]
+    for entry in summary['memory']:
+        lines.append(f"  {entry['phase']:<12}{entry['traced_mb']:>10.3f}MB  {entry['file']}")
+        for growth in entry.get('top_growth', []):
+            lines.append(f"      {growth['size_diff_kb']:+}KB  {growth['location']}")
+    return '\n'.join(lines) + '\n'
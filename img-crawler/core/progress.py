@@ -0,0 +1,180 @@
+"""
+진행 상황 추적기 - 크롤링 카운터를 모아 일정 주기로 스냅샷 전달
+"""
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, fields
+
+
+@dataclass(frozen=True)
+class ProgressSnapshot:
+    """특정 시점의 크롤링 진행 상황"""
+    phase: str = 'idle'  # idle, crawling, downloading, done
+    percentage: int = 0
+    total_urls: int = 0
+    processed_urls: int = 0
+    failed_urls: int = 0
+    found_images: int = 0
+    total_downloads: int = 0
+    downloaded: int = 0
+    skipped: int = 0
+    failed_downloads: int = 0
+    bytes_downloaded: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def processed_images(self):
+        """처리 완료된 이미지 수 (다운로드 + 건너뜀)"""
+        return self.downloaded + self.skipped
+
+    def to_dict(self):
+        """딕셔너리로 변환"""
+        data = {f.name: getattr(self, f.name) for f in fields(self)}
+        data['processed_images'] = self.processed_images
+        return data
+
+    def describe(self):
+        """사람이 읽을 수 있는 요약 문자열"""
+        if self.phase == 'crawling':
+            return (f"URL 처리 중: {self.processed_urls}/{self.total_urls} "
+                    f"({self.found_images}개 이미지 발견)")
+        if self.phase == 'downloading':
+            done = self.processed_images + self.failed_downloads
+            return (f"이미지 다운로드 중: {done}/{self.total_downloads}, "
+                    f"처리됨: {self.processed_images}, 실패: {self.failed_downloads}")
+        if self.phase == 'done':
+            return f"크롤링 완료: {self.processed_images + self.failed_downloads}개 이미지 처리"
+        return "대기 중..."
+
+
+# 스냅샷에 포함되는 정수 카운터 목록
+COUNTER_FIELDS = tuple(
+    f.name for f in fields(ProgressSnapshot)
+    if f.name not in ('phase', 'percentage', 'elapsed')
+)
+
+
+def snapshot_from_dict(data):
+    """to_dict() 결과로 스냅샷 복원 (프로세스 간 전달용)"""
+    names = {f.name for f in fields(ProgressSnapshot)}
+    return ProgressSnapshot(**{k: v for k, v in data.items() if k in names})
+
+
+def merge_snapshots(snapshots):
+    """여러 샤드/작업자의 스냅샷을 하나로 합침"""
+    snapshots = list(snapshots)
+    if not snapshots:
+        return ProgressSnapshot()
+
+    totals = dict.fromkeys(COUNTER_FIELDS, 0)
+    for snapshot in snapshots:
+        for name in COUNTER_FIELDS:
+            totals[name] += getattr(snapshot, name)
+
+    # 모두 끝나야 완료, 아직 페이지를 처리 중인 샤드가 있으면 크롤링 단계
+    phases = {s.phase for s in snapshots}
+    if phases == {'done'}:
+        phase = 'done'
+    elif phases == {'idle'}:
+        phase = 'idle'
+    elif phases & {'idle', 'crawling'}:
+        phase = 'crawling'
+    else:
+        phase = 'downloading'
+
+    percentage = sum(s.percentage for s in snapshots) // len(snapshots)
+    elapsed = max(s.elapsed for s in snapshots)
+    return ProgressSnapshot(phase=phase, percentage=percentage, elapsed=elapsed, **totals)
+
+
+class ProgressTracker:
+    """카운터를 누적하고 변경분을 일정 주기로 묶어 전달"""
+
+    def __init__(self, snapshot_callback=None, images_callback=None,
+                 interval=0.1, max_events=500):
+        self.snapshot_callback = snapshot_callback
+        self.images_callback = images_callback
+        self.interval = interval
+        self.phase = 'idle'
+        self.counters = dict.fromkeys(COUNTER_FIELDS, 0)
+        self._pending_images = []
+        self._events = deque(maxlen=max_events)  # 이벤트 상세 (필요할 때만 조회)
+        self._dirty = True
+        self._start_time = time.monotonic()
+
+    def set_phase(self, phase):
+        """진행 단계 변경"""
+        self.phase = phase
+        self._dirty = True
+
+    def add(self, **deltas):
+        """카운터 증가"""
+        for name, delta in deltas.items():
+            self.counters[name] += delta
+        self._dirty = True
+
+    def set(self, **values):
+        """카운터 값 설정"""
+        self.counters.update(values)
+        self._dirty = True
+
+    def add_images(self, images):
+        """발견된 이미지를 다음 전달 시점까지 모아둠"""
+        if images:
+            self._pending_images.extend(images)
+            self._dirty = True
+
+    def record_event(self, message):
+        """개별 이벤트 상세 기록 (스냅샷과 별도로 보관)"""
+        self._events.append((time.time(), message))
+
+    def recent_events(self, limit=None):
+        """최근 이벤트 목록 반환 (오래된 순)"""
+        events = list(self._events)
+        if limit is not None:
+            events = events[-limit:]
+        return events
+
+    def snapshot(self):
+        """현재 카운터로 스냅샷 생성"""
+        c = self.counters
+        if self.phase == 'crawling':
+            ratio = c['processed_urls'] / c['total_urls'] if c['total_urls'] else 0
+            percentage = int(ratio * 50)  # 50%까지만 (다운로드가 나머지 50%)
+        elif self.phase == 'downloading':
+            done = c['downloaded'] + c['skipped'] + c['failed_downloads']
+            ratio = done / c['total_downloads'] if c['total_downloads'] else 0
+            percentage = 50 + int(ratio * 50)
+        elif self.phase == 'done':
+            percentage = 100
+        else:
+            percentage = 0
+
+        return ProgressSnapshot(
+            phase=self.phase,
+            percentage=min(percentage, 100),
+            elapsed=round(time.monotonic() - self._start_time, 3),
+            **c
+        )
+
+    def flush(self, force=False):
+        """변경된 내용이 있으면 스냅샷과 모아둔 이미지 전달"""
+        if not self._dirty and not force:
+            return
+        self._dirty = False
+
+        if self._pending_images:
+            images, self._pending_images = self._pending_images, []
+            if self.images_callback:
+                self.images_callback(images)
+
+        if self.snapshot_callback:
+            self.snapshot_callback(self.snapshot())
+
+    async def run(self):
+        """interval 주기로 flush (크롤링 동안 백그라운드 태스크로 실행)"""
+        while True:
+            await asyncio.sleep(self.interval)
+            self.flush()
@@ -0,0 +1,206 @@
+"""
+이미지/다운로드 결과 레코드 - 이미지마다 dict 대신 __slots__ 객체
+
+수백만 개를 담는 found_images / download_results 에서 이미지마다 dict(키 해시 테이블)를
+만들지 않도록 필드를 __slots__ 로 고정한다. 페이지 주소, 선택자, MIME 처럼 여러 이미지가
+같은 값을 갖는 문자열은 sys.intern 으로 하나만 보관한다 (페이지 캐시에서 읽은 값 포함).
+
+기존 코드와 호환되도록 dict 처럼 record['url'], record.get('url', ''), 'pack' in record,
+dict(record) 를 지원한다. 값이 None 인 필드는 dict 에 키가 없던 것과 같게 취급한다.
+JSON 으로 저장할 때는 to_dict() 를 쓴다.
+"""
+
+import enum
+import os
+import sys
+from urllib.parse import urlsplit
+
+from .tracing import TIMING_PHASES
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class Record:
+    """dict 처럼 읽고 쓸 수 있는 __slots__ 레코드 (KEYS: dict 로 보이는 키)"""
+    __slots__ = ()
+    KEYS = ()
+
+    def get(self, key, default=None):
+        if key not in self.KEYS:
+            return default
+        value = getattr(self, key)
+        return default if value is None else value
+
+    def __getitem__(self, key):
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        if key not in self.KEYS:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def keys(self):
+        return [key for key in self.KEYS if getattr(self, key) is not None]
+
+    def items(self):
+        return [(key, getattr(self, key)) for key in self.keys()]
+
+    def update(self, values):
+        for key, value in values.items():
+            self[key] = value
+
+    def to_dict(self):
+        return dict(self.items())
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+class ImageInfo(Record):
+    """페이지에서 찾은 이미지 하나"""
+    __slots__ = ('url', 'alt', 'title', 'source_url', 'selector')
+    KEYS = __slots__
+
+    def __init__(self, url, alt='', title='', source_url='', selector=''):
+        self.url = url
+        self.alt = alt or ''
+        self.title = title or ''
+        self.source_url = _intern(source_url)
+        self.selector = _intern(selector)
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data.get('url', ''), data.get('alt', ''), data.get('title', ''),
+                   data.get('source_url', ''), data.get('selector', ''))
+
+
+class DownloadStatus(enum.Enum):
+    """다운로드 결과 상태"""
+    DOWNLOADED = 'downloaded'
+    SKIPPED = 'skipped'  # 같은 파일이 이미 있음
+    FILTERED = 'filtered'  # 크기/형식/중복 조건에 걸려 받지 않음
+    FAILED = 'failed'
+
+
+class DownloadResult(Record):
+    """이미지 하나의 다운로드 결과 (success, status 는 state 에서 계산)"""
+    __slots__ = ('state', 'reason', 'url', 'error', 'filename', 'local_path', 'pack', 'size',
+                 'download_time', 'content_type', '_timings')
+    KEYS = ('success', 'url', 'error', 'filename', 'local_path', 'pack', 'size',
+            'download_time', 'status', 'content_type', 'timings')
+
+    def __init__(self, state, url, error=None, filename=None, local_path=None, size=None,
+                 download_time=None, reason=None, content_type=None):
+        self.state = state
+        self.reason = reason
+        self.url = url
+        self.error = error
+        self.filename = filename
+        self.local_path = local_path
+        self.pack = None  # 묶음 저장 위치 (tar 형식)
+        self.size = size
+        self.download_time = download_time
+        self.content_type = _intern(content_type)
+        self._timings = None  # TIMING_PHASES 순서의 밀리초 튜플 (결과마다 dict 를 두지 않음)
+
+    @classmethod
+    def failed(cls, url, error, download_time=None):
+        return cls(DownloadStatus.FAILED, url, error=error, download_time=download_time)
+
+    @classmethod
+    def filtered(cls, url, reason):
+        return cls(DownloadStatus.FILTERED, url, local_path='', size=0, download_time=0,
+                   reason=_intern(reason))
+
+    @property
+    def success(self):
+        return self.state is not DownloadStatus.FAILED
+
+    @property
+    def status(self):
+        """이전 dict 결과의 status 문자열 (실패는 None)"""
+        if self.state is DownloadStatus.SKIPPED:
+            return 'skipped (already exists)'
+        if self.state is DownloadStatus.FILTERED:
+            return f'filtered ({self.reason})'
+        if self.state is DownloadStatus.DOWNLOADED:
+            return 'downloaded'
+        return None
+
+    @property
+    def timings(self):
+        """단계별 시간 (밀리초, RequestTiming.to_dict 형식)"""
+        if self._timings is None:
+            return None
+        return {phase: value for phase, value in zip(TIMING_PHASES, self._timings) if value is not None}
+
+    @timings.setter
+    def timings(self, values):
+        self._timings = None if values is None else tuple(values.get(phase) for phase in TIMING_PHASES)
+
+    def __setitem__(self, key, value):
+        if key in ('success', 'status'):
+            raise KeyError(f"{key} 는 state 로 바꿔주세요")
+        super().__setitem__(key, value)
+
+
+class ResultCounts:
+    """상태별 다운로드 결과 수와 성공한 결과의 크기 합, 확장자/도메인별 수 (결과를 추가할 때마다 갱신, 목록을 다시 훑지 않음)"""
+    __slots__ = ('downloaded', 'skipped', 'filtered', 'failed', 'total_size', 'file_types', 'domains')
+
+    def __init__(self):
+        self.downloaded = 0
+        self.skipped = 0
+        self.filtered = 0
+        self.failed = 0
+        self.total_size = 0
+        self.file_types = {}  # 성공한 결과의 확장자 -> 수
+        self.domains = {}  # 성공한 결과의 도메인 -> 수
+
+    def add(self, result):
+        state = getattr(result, 'state', None)
+        if state is None:
+            # dict 결과 (다른 프로세스/대기열에서 받은 결과)
+            status = result.get('status') or ''
+            if not result.get('success', False):
+                state = DownloadStatus.FAILED
+            elif status.startswith('filtered'):
+                state = DownloadStatus.FILTERED
+            elif status.startswith('skipped'):
+                state = DownloadStatus.SKIPPED
+            else:
+                state = DownloadStatus.DOWNLOADED
+        if state is not DownloadStatus.FAILED:
+            self.total_size += result.get('size', 0)
+            ext = os.path.splitext(result.get('filename', ''))[1].lower()
+            self.file_types[ext] = self.file_types.get(ext, 0) + 1
+            domain = urlsplit(result.get('url', '')).netloc
+            self.domains[domain] = self.domains.get(domain, 0) + 1
+        if state is DownloadStatus.DOWNLOADED:
+            self.downloaded += 1
+        elif state is DownloadStatus.SKIPPED:
+            self.skipped += 1
+        elif state is DownloadStatus.FILTERED:
+            self.filtered += 1
+        else:
+            self.failed += 1
+
+    def add_all(self, results):
+        for result in results:
+            self.add(result)
+
+    @property
+    def total(self):
+        return self.downloaded + self.skipped + self.filtered + self.failed
+
+    @property
+    def success(self):
+        return self.total - self.failed
@@ -0,0 +1,174 @@
+"""
+샤드 크롤러 - URL 범위를 여러 프로세스로 나눠 병렬 크롤링
+"""
+
+import asyncio
+import multiprocessing
+import os
+import queue
+import signal
+import threading
+import time
+
+from .events import EventEmitter
+from .progress import merge_snapshots, snapshot_from_dict
+from .url_generator import URLGenerator, default_state_dir
+
+# 샤드마다 파일 순번(index)이 겹치지 않도록 띄우는 간격
+SHARD_INDEX_STRIDE = 1_000_000
+
+# 결과를 큐로 보낼 때 한 번에 묶는 개수
+RESULT_CHUNK_SIZE = 1000
+
+
+def _run_shard(shard_id, config, result_queue, stop_event):
+    """작업자 프로세스 진입점 (프로세스마다 자체 이벤트 루프와 연결 풀 사용)"""
+    from .image_crawler import ImageCrawler
+
+    # Ctrl+C 는 조정자가 받아서 stop_event 로 전달
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    crawler = ImageCrawler(config)
+    crawler.events.on('snapshot', lambda snapshot: result_queue.put(
+        ('snapshot', shard_id, snapshot.to_dict())))
+
+    def watch_stop():
+        stop_event.wait()
+        crawler.stop()
+
+    threading.Thread(target=watch_stop, daemon=True).start()
+
+    try:
+        results = asyncio.run(crawler.crawl())
+        for i in range(0, len(results), RESULT_CHUNK_SIZE):
+            result_queue.put(('results', shard_id, results[i:i + RESULT_CHUNK_SIZE]))
+    except Exception as e:
+        result_queue.put(('error', shard_id, str(e)))
+    finally:
+        result_queue.put(('done', shard_id, crawler.get_statistics()))
+
+
+class ShardedCrawler:
+    """반복 범위를 N 개 프로세스에 나눠 크롤링하고 진행 상황을 합쳐서 전달
+
+    이벤트는 ImageCrawler 와 같은 이름(progress, snapshot)을 사용하며,
+    각 샤드가 끝날 때마다 shard_finished (shard_id, statistics) 가 추가로 전달된다.
+    """
+
+    def __init__(self, config, workers=None):
+        self.config = config
+        self.workers = workers or os.cpu_count() or 1
+        self.interval = config.get('progress_interval', 0.1)
+        self.events = EventEmitter()
+        self._ctx = multiprocessing.get_context('spawn')
+        self._stop_event = self._ctx.Event()
+
+        self.shard_snapshots = {}
+        self.shard_statistics = {}
+        self.download_results = []
+        self.errors = []
+
+    def build_shard_configs(self):
+        """샤드별 설정 생성 (범위와 파일 순번 시작값만 다름)"""
+        ranges = URLGenerator(self.config).split_ranges(self.workers)
+        base_offset = self.config.get('index_offset', 0)
+
+        shard_configs = []
+        for shard_id, range_override in enumerate(ranges):
+            shard_config = dict(self.config)
+            shard_config.update(range_override)
+            shard_config['index_offset'] = base_offset + shard_id * SHARD_INDEX_STRIDE
+            # 묶음 파일과 색인은 샤드마다 따로 (같은 폴더에 동시에 쓰지 않도록)
+            shard_config['output_suffix'] = f"{shard_config.get('output_suffix', '')}-s{shard_id}"
+            # 페이지 캐시, robots.txt 캐시, 사이트맵 상태도 샤드마다 따로 (같은 파일을 동시에 쓰지 않도록)
+            shard_config['state_dir'] = os.path.join(default_state_dir(self.config), f"shard{shard_id}")
+            # 메트릭 엔드포인트/파일은 샤드마다 따로 (포트 +shard_id, 파일명에 샤드 번호)
+            if shard_config.get('metrics_port'):
+                shard_config['metrics_port'] += shard_id
+            if shard_config.get('metrics_file'):
+                root, ext = os.path.splitext(shard_config['metrics_file'])
+                shard_config['metrics_file'] = f"{root}.shard{shard_id}{ext}"
+            # 수신 속도 제한은 전체 합이 설정값이 되도록 샤드 수로 나눔
+            for key in ('bandwidth_limit', 'host_bandwidth_limit'):
+                if shard_config.get(key):
+                    shard_config[key] = max(1, shard_config[key] // len(ranges))
+            shard_configs.append(shard_config)
+        return shard_configs
+
+    def run(self):
+        """모든 샤드를 실행하고 합쳐진 결과 반환 (완료될 때까지 대기)"""
+        shard_configs = self.build_shard_configs()
+        result_queue = self._ctx.Queue()
+        processes = [
+            self._ctx.Process(target=_run_shard, daemon=True,
+                              args=(shard_id, shard_config, result_queue, self._stop_event))
+            for shard_id, shard_config in enumerate(shard_configs)
+        ]
+        for process in processes:
+            process.start()
+
+        self.events.emit('progress', 0, f"샤드 크롤링 시작: {len(processes)}개 프로세스")
+
+        pending = set(range(len(processes)))
+        last_emit = 0.0
+        while pending:
+            try:
+                kind, shard_id, payload = result_queue.get(timeout=self.interval)
+            except queue.Empty:
+                self._check_crashed(processes, pending)
+                continue
+            except KeyboardInterrupt:
+                self.stop()
+                continue
+
+            self._handle_message(kind, shard_id, payload, pending)
+
+            now = time.monotonic()
+            if now - last_emit >= self.interval:
+                last_emit = now
+                self.events.emit('snapshot', self.merged_snapshot())
+
+        for process in processes:
+            process.join()
+
+        self.events.emit('snapshot', self.merged_snapshot())
+        self.events.emit('progress', 100, f"크롤링 완료: {len(self.download_results)}개 이미지 처리")
+        return self.download_results
+
+    def _handle_message(self, kind, shard_id, payload, pending):
+        """작업자 프로세스에서 온 메시지 처리"""
+        if kind == 'snapshot':
+            self.shard_snapshots[shard_id] = snapshot_from_dict(payload)
+        elif kind == 'results':
+            self.download_results.extend(payload)
+        elif kind == 'error':
+            self.errors.append(f"샤드 {shard_id}: {payload}")
+        elif kind == 'done':
+            self.shard_statistics[shard_id] = payload
+            pending.discard(shard_id)
+            self.events.emit('shard_finished', shard_id, payload)
+
+    def _check_crashed(self, processes, pending):
+        """메시지 없이 비정상 종료된 프로세스 처리"""
+        for shard_id in list(pending):
+            process = processes[shard_id]
+            if not process.is_alive() and process.exitcode not in (0, None):
+                self.errors.append(f"샤드 {shard_id}: 프로세스 비정상 종료 (exitcode={process.exitcode})")
+                pending.discard(shard_id)
+
+    def merged_snapshot(self):
+        """샤드 스냅샷 합계"""
+        return merge_snapshots(self.shard_snapshots.values())
+
+    def stop(self):
+        """모든 샤드에 중지 요청"""
+        self._stop_event.set()
+
+    def get_statistics(self):
+        """샤드 통계 합계"""
+        totals = {}
+        for statistics in self.shard_statistics.values():
+            for key, value in statistics.items():
+                totals[key] = totals.get(key, 0) + value
+        totals['shards'] = len(self.shard_statistics)
+        return totals
@@ -0,0 +1,156 @@
+"""
+저장 방식 - 다운로드한 이미지를 개별 파일 또는 묶음 파일로 저장
+
+config['output_format'] 으로 선택:
+    files: save_path/<도메인>/<파일명> 에 이미지마다 파일 하나 (기본값)
+    tar:   save_path/pack-00000.tar ... 묶음 파일과 색인 (core/pack.py)
+"""
+
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .file_writer import FileWriter
+from .image_types import describe_image
+from .pack import INDEX_SUFFIX, PackWriter, append_index
+
+
+class FileSink:
+    """이미지마다 개별 파일로 저장 (크기, 형식, 원본 페이지는 files.index.jsonl 에 기록)"""
+
+    INDEX_FLUSH_COUNT = 500
+
+    def __init__(self, config):
+        self.save_path = config.get('save_path', 'downloads')
+        # save_path/files.index.jsonl (샤드/작업자별로 output_suffix 가 붙음)
+        self.index_path = os.path.join(self.save_path, f"files{config.get('output_suffix', '')}{INDEX_SUFFIX}")
+        self.writer = FileWriter.from_config(config)
+        self._index_entries = []
+        self._index_lock = threading.Lock()
+
+    async def prepare(self, file_paths):
+        """저장 폴더(도메인별 하위 폴더)를 미리 한 번에 생성"""
+        await self.writer.ensure_dirs([os.path.dirname(path) for path in file_paths])
+
+    async def existing_size(self, file_path):
+        """이미 저장된 파일 크기 (없으면 None)"""
+        return await self.writer.get_size(file_path)
+
+    async def save(self, file_path, content, image_info):
+        """저장 후 결과에 추가할 위치 정보 반환"""
+        await self.writer.write(file_path, content)
+
+        self._index_entries.append(dict(
+            describe_image(content),
+            name=os.path.relpath(file_path, self.save_path).replace(os.sep, '/'),
+            url=image_info.get('url', ''),
+            source_url=image_info.get('source_url', ''),
+            length=len(content),
+            mtime=int(time.time()),
+        ))
+        if len(self._index_entries) >= self.INDEX_FLUSH_COUNT:
+            await self._flush_index()
+        return self.locate(file_path)
+
+    async def _flush_index(self):
+        entries, self._index_entries = self._index_entries, []
+        await asyncio.get_running_loop().run_in_executor(None, self._append_index, entries)
+
+    def _append_index(self, entries):
+        with self._index_lock:
+            append_index(self.index_path, entries)
+
+    def locate(self, file_path):
+        """이미 저장된 이미지의 위치 정보"""
+        return {'local_path': file_path}
+
+    async def close(self):
+        """남은 저장 작업과 색인을 기록한 뒤 스레드 풀 정리"""
+        await self._flush_index()
+        await asyncio.get_running_loop().run_in_executor(None, self.writer.close)
+
+
+class PackSink:
+    """tar 묶음 파일에 이어 붙여 저장 (파일 수가 많을 때 inode/폴더 목록 비용 절감)
+
+    묶음 안의 이름은 files 형식의 save_path 기준 상대 경로와 같다.
+    """
+
+    def __init__(self, config):
+        self.save_path = config.get('save_path', 'downloads')
+        self.prefix = f"pack{config.get('output_suffix', '')}"
+        self.shard_bytes = config.get('pack_shard_mb', 1024) * 1024 * 1024
+        self.fsync = config.get('fsync', False)
+        self.writer = None
+        # 묶음 파일은 순서대로 써야 하므로 스레드 하나만 사용
+        self._executor = None
+
+    def _run(self, func, *args, **kwargs):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(1, thread_name_prefix='pack-writer')
+        return asyncio.get_running_loop().run_in_executor(
+            self._executor, lambda: func(*args, **kwargs))
+
+    def _member_name(self, file_path):
+        return os.path.relpath(file_path, self.save_path).replace(os.sep, '/')
+
+    async def prepare(self, file_paths):
+        """이전 색인을 읽고 묶음 작성 준비"""
+        if self.writer is None:
+            self.writer = await self._run(PackWriter, self.save_path, self.prefix,
+                                          self.shard_bytes, self.fsync)
+
+    async def existing_size(self, file_path):
+        await self.prepare(())
+        entry = self.writer.entries.get(self._member_name(file_path))
+        return entry['length'] if entry else None
+
+    async def save(self, file_path, content, image_info):
+        await self.prepare(())
+        entry = await self._run(self.writer.add, self._member_name(file_path), content,
+                                url=image_info.get('url', ''),
+                                source_url=image_info.get('source_url', ''),
+                                **describe_image(content))
+        return self._location(entry)
+
+    def locate(self, file_path):
+        return self._location(self.writer.entries[self._member_name(file_path)])
+
+    def _location(self, entry):
+        """결과에 추가할 묶음 위치 (개별 파일은 없음)"""
+        return {
+            'local_path': '',
+            'pack': {
+                'shard': os.path.join(self.save_path, entry['shard']),
+                'offset': entry['offset'],
+                'length': entry['length'],
+            },
+        }
+
+    async def close(self):
+        """현재 묶음을 닫고 색인을 디스크에 반영"""
+        if self.writer is not None:
+            await self._run(self.writer.close)
+            self.writer = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+# 저장 방식 이름 -> 클래스 (새 방식은 여기에 등록)
+OUTPUT_FORMATS = {
+    'files': FileSink,
+    'tar': PackSink,
+}
+
+
+def create_sink(config):
+    """설정의 output_format 에 맞는 저장 방식 생성"""
+    output_format = config.get('output_format', 'files')
+    sink_class = OUTPUT_FORMATS.get(output_format)
+    if sink_class is None:
+        raise ValueError(f"지원하지 않는 저장 형식: {output_format} "
+                         f"(가능한 값: {', '.join(OUTPUT_FORMATS)})")
+    return sink_class(config)
@@ -0,0 +1,256 @@
+"""
+사이트맵과 robots.txt - 페이지 번호를 추측하는 대신 사이트가 알려 주는 URL 로 시작
+
+- sitemap.xml (사이트맵 색인, .gz 포함) 을 스트리밍으로 읽어 URL 과 lastmod 추출
+- 이전 실행 이후 lastmod 가 바뀐 페이지만 다시 크롤링 (상태는 state_dir/sitemap.json)
+- robots.txt 규칙은 호스트별로 메모리와 state_dir/robots.json 에 캐시해
+  금지된 URL 을 요청 전에 걸러냄
+
+URLGenerator.generate_urls 에서 동기적으로 호출하므로 크롤러는 스레드에서 실행한다.
+"""
+
+import gzip
+import io
+import json
+import os
+import sys
+import time
+import urllib.error
+import urllib.request
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from urllib.parse import urljoin, urlsplit
+from urllib.robotparser import RobotFileParser
+
+# robots.txt 를 다시 받기 전까지 캐시를 쓰는 시간 (초)
+ROBOTS_TTL = 24 * 60 * 60
+
+# 사이트맵 색인이 다른 색인을 가리킬 때 따라가는 최대 깊이
+MAX_SITEMAP_DEPTH = 3
+
+REQUEST_TIMEOUT = 30
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (compatible; img-crawler)'
+
+# robots.txt 를 받을 수 없을 때 쓰는 규칙 (RobotFileParser.read 와 같은 기준)
+ALLOW_ALL = []
+DISALLOW_ALL = ['User-agent: *', 'Disallow: /']
+
+
+def _open(url, user_agent, timeout=REQUEST_TIMEOUT):
+    """URL 응답 스트림 (sitemap.xml.gz 나 gzip 전송이면 풀면서 읽음)"""
+    request = urllib.request.Request(url, headers={'User-Agent': user_agent,
+                                                   'Accept-Encoding': 'gzip'})
+    stream = io.BufferedReader(urllib.request.urlopen(request, timeout=timeout))
+    if stream.peek(2)[:2] == b'\x1f\x8b':  # gzip 매직 바이트
+        return gzip.GzipFile(fileobj=stream)
+    return stream
+
+
+def parse_lastmod(value):
+    """W3C 날짜 (2024-01-02, 2024-01-02T03:04:05+09:00) -> UNIX 시간 (알 수 없으면 None)"""
+    value = (value or '').strip()
+    if not value:
+        return None
+    if value.endswith('Z'):
+        value = value[:-1] + '+00:00'
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def iter_sitemap(stream):
+    """사이트맵 스트림에서 ('url' 또는 'sitemap', loc, lastmod) 를 하나씩 (문서 전체를 메모리에 올리지 않음)"""
+    loc = lastmod = None
+    for event, element in ET.iterparse(stream, events=('end',)):
+        tag = element.tag.rsplit('}', 1)[-1]  # 네임스페이스 제거
+        if tag == 'loc':
+            loc = (element.text or '').strip()
+        elif tag == 'lastmod':
+            lastmod = parse_lastmod(element.text)
+        elif tag in ('url', 'sitemap'):
+            if loc:
+                yield tag, loc, lastmod
+            loc = lastmod = None
+            element.clear()  # 처리한 항목은 바로 해제
+
+
+class RobotsCache:
+    """호스트별 robots.txt 규칙 캐시"""
+
+    def __init__(self, user_agent='*', cache_path=None, ttl=ROBOTS_TTL,
+                 fetch_user_agent=DEFAULT_USER_AGENT):
+        self.user_agent = user_agent  # 규칙을 찾을 User-agent 이름
+        self.cache_path = cache_path
+        self.ttl = ttl
+        self.fetch_user_agent = fetch_user_agent
+        self._parsers = {}  # 'scheme://host' -> RobotFileParser
+        self._stored = {}  # 'scheme://host' -> {'fetched': 시간, 'lines': [...]}
+        self._dirty = False
+        if cache_path and os.path.exists(cache_path):
+            try:
+                with open(cache_path, 'r', encoding='utf-8') as f:
+                    self._stored = json.load(f)
+            except (OSError, ValueError):
+                self._stored = {}
+
+    @staticmethod
+    def _origin(url):
+        parts = urlsplit(url)
+        return f"{parts.scheme}://{parts.netloc.lower()}"
+
+    def is_cached(self, url):
+        """규칙을 받지 않고 바로 판단할 수 있는지"""
+        return self._origin(url) in self._parsers
+
+    def parser(self, url):
+        """URL 호스트의 robots.txt 규칙 (처음 보는 호스트면 받아서 캐시)"""
+        origin = self._origin(url)
+        parser = self._parsers.get(origin)
+        if parser is not None:
+            return parser
+
+        stored = self._stored.get(origin)
+        if stored and time.time() - stored['fetched'] <= self.ttl:
+            lines = stored['lines']
+        else:
+            lines, persist = self._fetch(origin)
+            if persist:
+                self._stored[origin] = {'fetched': time.time(), 'lines': lines}
+                self._dirty = True
+
+        parser = RobotFileParser(origin + '/robots.txt')
+        parser.parse(lines)
+        self._parsers[origin] = parser
+        return parser
+
+    def _fetch(self, origin):
+        """robots.txt 내용과 파일에 저장할지 여부 -> (lines, persist)
+
+        401/403 은 모두 금지, 그 밖의 4xx (없음) 는 모두 허용으로 저장한다.
+        5xx 나 네트워크 오류는 이번 실행에서만 모두 금지하고 저장하지 않는다 (다음 실행에서 다시 받음).
+        """
+        try:
+            with _open(origin + '/robots.txt', self.fetch_user_agent, timeout=10) as f:
+                return f.read().decode('utf-8', errors='replace').splitlines(), True
+        except urllib.error.HTTPError as e:
+            if e.code in (401, 403):
+                return DISALLOW_ALL, True
+            if 400 <= e.code < 500:
+                return ALLOW_ALL, True
+            print(f"robots.txt 를 받을 수 없음 {origin}: {e} (이번 실행은 모두 금지)", file=sys.stderr)
+            return DISALLOW_ALL, False
+        except (urllib.error.URLError, OSError, ValueError) as e:
+            print(f"robots.txt 를 받을 수 없음 {origin}: {e} (이번 실행은 모두 금지)", file=sys.stderr)
+            return DISALLOW_ALL, False
+
+    def allowed(self, url):
+        """robots.txt 가 URL 요청을 허용하는지"""
+        return self.parser(url).can_fetch(self.user_agent, url)
+
+    def sitemaps(self, url):
+        """robots.txt 의 Sitemap: 항목"""
+        return self.parser(url).site_maps() or []
+
+    def save(self):
+        """받은 규칙을 파일에 저장 (다음 실행에서 재사용)"""
+        if not self.cache_path or not self._dirty:
+            return
+        os.makedirs(os.path.dirname(self.cache_path) or '.', exist_ok=True)
+        tmp_path = f"{self.cache_path}.{os.getpid()}.tmp"  # 같은 폴더를 쓰는 다른 프로세스와 겹치지 않도록
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._stored, f, ensure_ascii=False)
+        os.replace(tmp_path, self.cache_path)
+        self._dirty = False
+
+
+class SitemapReader:
+    """사이트맵에서 크롤링할 페이지 URL 수집
+
+    incremental 이면 이전에 commit() 한 실행 시작 시각 이후 lastmod 가 바뀐 URL 만
+    (lastmod 가 없는 URL 은 항상) 돌려준다. 색인의 하위 사이트맵도 lastmod 로 건너뛴다.
+    받지 못한 페이지가 있는 사이트맵은 commit 하지 않아 다음 실행에서 다시 읽는다.
+    """
+
+    def __init__(self, sitemap_url, robots=None, state_path=None, incremental=True,
+                 user_agent=DEFAULT_USER_AGENT):
+        self.sitemap_url = sitemap_url  # URL 또는 'auto' (robots.txt 의 Sitemap:, 없으면 /sitemap.xml)
+        self.robots = robots
+        self.state_path = state_path
+        self.incremental = incremental
+        self.user_agent = user_agent
+        self.stats = {}
+        self._state = {}
+        self._started = None
+        self._read_sitemaps = set()
+        self._sources = {}  # 페이지 URL -> 그 URL 이 있던 사이트맵
+        if state_path and os.path.exists(state_path):
+            try:
+                with open(state_path, 'r', encoding='utf-8') as f:
+                    self._state = json.load(f)
+            except (OSError, ValueError):
+                self._state = {}
+
+    def _start_urls(self, base_url):
+        if self.sitemap_url != 'auto':
+            return [self.sitemap_url]
+        robots = self.robots or RobotsCache(fetch_user_agent=self.user_agent)
+        return robots.sitemaps(base_url) or [urljoin(base_url, '/sitemap.xml')]
+
+    def read(self, base_url=''):
+        """페이지 URL 목록 (중복 제거, 사이트맵 순서 유지)"""
+        self._started = time.time()
+        self.stats = {'sitemaps': 0, 'skipped_sitemaps': 0, 'urls': 0, 'unchanged': 0}
+        urls = {}
+        pending = [(url, 0) for url in self._start_urls(base_url)]
+        seen_sitemaps = set()
+
+        while pending:
+            sitemap_url, depth = pending.pop(0)
+            if sitemap_url in seen_sitemaps:
+                continue
+            seen_sitemaps.add(sitemap_url)
+            since = self._state.get(sitemap_url) if self.incremental else None
+            try:
+                with _open(sitemap_url, self.user_agent) as stream:
+                    self.stats['sitemaps'] += 1
+                    for kind, loc, lastmod in iter_sitemap(stream):
+                        if kind == 'sitemap':
+                            if depth >= MAX_SITEMAP_DEPTH:
+                                continue
+                            child_since = self._state.get(loc) if self.incremental else None
+                            if child_since and lastmod and lastmod <= child_since:
+                                self.stats['skipped_sitemaps'] += 1
+                                continue
+                            pending.append((loc, depth + 1))
+                        elif since and lastmod and lastmod <= since:
+                            self.stats['unchanged'] += 1
+                        else:
+                            urls[loc] = sitemap_url
+            except (urllib.error.URLError, OSError, ET.ParseError, EOFError) as e:
+                print(f"사이트맵 읽기 오류 {sitemap_url}: {e}", file=sys.stderr)
+                seen_sitemaps.discard(sitemap_url)  # commit 하지 않도록
+
+        self._read_sitemaps = seen_sitemaps
+        self._sources = urls
+        self.stats['urls'] = len(urls)
+        return list(urls)
+
+    def commit(self, failed_urls=()):
+        """이번 실행 시작 시각을 읽은 사이트맵별로 저장 (크롤링을 끝까지 마친 뒤 호출)
+
+        failed_urls: 받지 못한 페이지 - 이 페이지가 있던 사이트맵은 기준 시각을 옮기지 않음
+        """
+        if not self.state_path or self._started is None:
+            return
+        incomplete = {self._sources.get(url) for url in failed_urls}
+        for sitemap_url in self._read_sitemaps - incomplete:
+            self._state[sitemap_url] = self._started
+        os.makedirs(os.path.dirname(self.state_path) or '.', exist_ok=True)
+        tmp_path = f"{self.state_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._state, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.state_path)
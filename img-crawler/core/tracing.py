@@ -0,0 +1,185 @@
+"""
+요청 타이밍 - aiohttp TraceConfig 로 단계별 소요 시간 측정
+"""
+
+import bisect
+import time
+
+import aiohttp
+
+# 단계 이름 (밀리초 단위로 기록)
+#   queue_wait: 동시 연결 제한(세마포어) 대기
+#   pool_wait: 연결 풀에서 빈 연결 대기
+#   dns: 호스트 이름 조회
+#   connect: TCP 연결 (HTTPS 는 TLS 핸드셰이크 포함, aiohttp 가 따로 구분하지 않음)
+#   ttfb: 요청 시작부터 응답 헤더 수신까지
+#   transfer: 응답 헤더 수신부터 본문 수신 완료까지
+#   parse: HTML 파싱 (페이지)
+#   write: 파일 저장 (이미지)
+#   total: 대기를 포함한 전체 시간
+TIMING_PHASES = ('queue_wait', 'pool_wait', 'dns', 'connect', 'ttfb',
+                 'transfer', 'parse', 'write', 'total')
+
+
+class RequestTiming:
+    """요청 하나의 단계별 시간 (trace_request_ctx 로 전달)"""
+
+    __slots__ = ('created', 'dequeued', 'request_start', 'headers_received',
+                 'body_done', 'durations', '_marks')
+
+    def __init__(self):
+        self.created = time.perf_counter()
+        self.dequeued = None
+        self.request_start = None
+        self.headers_received = None
+        self.body_done = None
+        self.durations = {}
+        self._marks = {}
+
+    def mark_dequeued(self):
+        """동시 연결 제한을 통과한 시점"""
+        self.dequeued = time.perf_counter()
+        self.durations['queue_wait'] = self.dequeued - self.created
+
+    def mark_body_done(self):
+        """응답 본문 수신 완료 시점"""
+        self.body_done = time.perf_counter()
+        if self.headers_received is not None:
+            self.durations['transfer'] = self.body_done - self.headers_received
+
+    def begin(self, phase):
+        """단계 시작"""
+        self._marks[phase] = time.perf_counter()
+
+    def end(self, phase):
+        """단계 종료 (같은 단계가 여러 번이면 합산)"""
+        start = self._marks.pop(phase, None)
+        if start is not None:
+            self.durations[phase] = self.durations.get(phase, 0.0) + time.perf_counter() - start
+
+    def finish(self):
+        """전체 시간 확정"""
+        self.durations['total'] = time.perf_counter() - self.created
+
+    def to_dict(self):
+        """단계별 시간 (밀리초)"""
+        return {phase: round(value * 1000, 3) for phase, value in self.durations.items()}
+
+
+async def _on_request_start(session, trace_config_ctx, params):
+    timing = trace_config_ctx.trace_request_ctx
+    if isinstance(timing, RequestTiming) and timing.request_start is None:
+        timing.request_start = time.perf_counter()
+
+
+async def _on_request_end(session, trace_config_ctx, params):
+    timing = trace_config_ctx.trace_request_ctx
+    if isinstance(timing, RequestTiming) and timing.request_start is not None:
+        timing.headers_received = time.perf_counter()
+        timing.durations['ttfb'] = timing.headers_received - timing.request_start
+
+
+def _phase_callbacks(phase):
+    """단계 시작/종료 콜백 쌍 생성"""
+    async def on_start(session, trace_config_ctx, params):
+        timing = trace_config_ctx.trace_request_ctx
+        if isinstance(timing, RequestTiming):
+            timing.begin(phase)
+
+    async def on_end(session, trace_config_ctx, params):
+        timing = trace_config_ctx.trace_request_ctx
+        if isinstance(timing, RequestTiming):
+            timing.end(phase)
+
+    return on_start, on_end
+
+
+def create_trace_config():
+    """RequestTiming 을 채우는 TraceConfig 생성 (세션마다 하나씩)"""
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_request_start.append(_on_request_start)
+    trace_config.on_request_end.append(_on_request_end)
+
+    pool_start, pool_end = _phase_callbacks('pool_wait')
+    trace_config.on_connection_queued_start.append(pool_start)
+    trace_config.on_connection_queued_end.append(pool_end)
+
+    dns_start, dns_end = _phase_callbacks('dns')
+    trace_config.on_dns_resolvehost_start.append(dns_start)
+    trace_config.on_dns_resolvehost_end.append(dns_end)
+
+    connect_start, connect_end = _phase_callbacks('connect')
+    trace_config.on_connection_create_start.append(connect_start)
+    trace_config.on_connection_create_end.append(connect_end)
+    return trace_config
+
+
+class TimingHistogram:
+    """고정 버킷 히스토그램 (밀리초)"""
+
+    BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000)
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BUCKETS) + 1)  # 마지막은 +Inf
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value_ms):
+        self.counts[bisect.bisect_left(self.BUCKETS, value_ms)] += 1
+        self.count += 1
+        self.total += value_ms
+        if value_ms > self.max:
+            self.max = value_ms
+
+    def percentile(self, pct):
+        """버킷 상한으로 근사한 백분위수"""
+        if not self.count:
+            return 0.0
+        target = pct / 100 * self.count
+        cumulative = 0
+        for i, bucket_count in enumerate(self.counts):
+            cumulative += bucket_count
+            if cumulative >= target:
+                # 버킷 상한이 실제 최댓값보다 크면 최댓값 사용
+                return round(float(min(self.BUCKETS[i], self.max)), 3) if i < len(self.BUCKETS) else self.max
+        return self.max
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'avg_ms': round(self.total / self.count, 3) if self.count else 0.0,
+            'p50_ms': self.percentile(50),
+            'p99_ms': self.percentile(99),
+            'max_ms': round(self.max, 3),
+            'buckets': dict(zip([str(b) for b in self.BUCKETS] + ['+Inf'], self.counts)),
+        }
+
+
+class TimingStats:
+    """요청 종류(page/image)와 단계별 히스토그램 모음"""
+
+    def __init__(self):
+        self.histograms = {}
+
+    def histogram(self, kind, phase):
+        key = (kind, phase)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = TimingHistogram()
+        return histogram
+
+    def record(self, kind, timing):
+        """RequestTiming 의 모든 단계 기록"""
+        for phase, value in timing.durations.items():
+            self.histogram(kind, phase).observe(value * 1000)
+
+    def summary(self, include_buckets=False):
+        """{kind: {phase: {...}}} 요약"""
+        result = {}
+        for (kind, phase), histogram in sorted(self.histograms.items()):
+            data = histogram.to_dict()
+            if not include_buckets:
+                data.pop('buckets')
+            result.setdefault(kind, {})[phase] = data
+        return result
@@ -0,0 +1,191 @@
+"""
+HTTP 전송 계층 - 크롤러/다운로더가 쓰는 세션 생성
+
+config['http2'] 로 선택:
+    False: aiohttp (HTTP/1.1, 호스트마다 여러 연결, 기본값)
+    True:  httpx + h2 (HTTP/2, 호스트마다 연결 하나에 요청을 다중화)
+
+httpx 세션은 aiohttp 세션과 같은 방식으로 쓸 수 있도록 감싼다
+(session.get/head 를 async with 로 열고 status, headers, url, content_length,
+content.read(n), read(), text(), close() 사용). httpx 에는 TraceConfig 가 없으므로
+RequestTiming 의 pool_wait/dns/connect 단계는 기록되지 않는다.
+"""
+
+import importlib.util
+import sys
+import time
+
+import aiohttp
+from aiohttp import compression_utils
+
+from .tracing import RequestTiming, create_trace_config
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+# 요청 하나의 제한 시간 (초) - 페이지는 짧게, 큰 이미지 본문은 길게
+PAGE_TIMEOUT = 30
+DOWNLOAD_TIMEOUT = 60
+
+
+def _installed(*modules):
+    return any(importlib.util.find_spec(module) is not None for module in modules)
+
+
+def accept_encoding(http2=False):
+    """HTML 요청의 Accept-Encoding (설치된 디코더로 풀 수 있는 압축만)"""
+    if http2:
+        brotli = _installed('brotli', 'brotlicffi')
+        zstd = _installed('zstandard')
+    else:
+        brotli = compression_utils.HAS_BROTLI
+        zstd = getattr(compression_utils, 'HAS_ZSTD', False)  # aiohttp 3.12 이상
+    encodings = []
+    if zstd:
+        encodings.append('zstd')
+    if brotli:
+        encodings.append('br')
+    encodings += ['gzip', 'deflate']
+    return ', '.join(encodings)
+
+
+def http2_available():
+    """HTTP/2 전송에 필요한 패키지(httpx, h2)가 설치되어 있는지"""
+    return httpx is not None and _installed('h2')
+
+
+def request_timeout(seconds):
+    """요청별 제한 시간 (session.get/head 의 timeout 인자, 세션 기본값보다 우선)"""
+    return aiohttp.ClientTimeout(total=seconds)
+
+
+def create_session(config, timeout=PAGE_TIMEOUT, resolver=None):
+    """설정에 맞는 HTTP 세션 (async with 로 쓰거나 직접 close(), timeout 은 요청 하나의 제한 시간(초))
+
+    resolver: 세션 사이에 공유하는 aiohttp 리졸버 (core/dns.py, httpx 세션은 사용하지 않음)
+    """
+    if config.get('http2', False):
+        if http2_available():
+            return HttpxSession(timeout)
+        print("HTTP/2 를 사용하려면 httpx[http2] 를 설치해주세요 (pip install 'httpx[http2]'). HTTP/1.1 로 진행합니다.",
+              file=sys.stderr)
+
+    connector = aiohttp.TCPConnector(ssl=False, resolver=resolver)  # SSL 검증 비활성화
+    return aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=timeout), connector=connector,
+                                 trace_configs=[create_trace_config()])
+
+
+class HttpxSession:
+    """aiohttp.ClientSession 처럼 쓰는 httpx HTTP/2 세션"""
+
+    def __init__(self, timeout=30):
+        self._client = httpx.AsyncClient(http2=True, verify=False, timeout=timeout,
+                                         limits=httpx.Limits(max_connections=None,
+                                                             max_keepalive_connections=None))
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        await self._client.aclose()
+
+    def get(self, url, headers=None, allow_redirects=True, trace_request_ctx=None, timeout=None):
+        return _HttpxRequest(self._client, 'GET', url, headers, allow_redirects, trace_request_ctx, timeout)
+
+    def head(self, url, headers=None, allow_redirects=False, trace_request_ctx=None, timeout=None):
+        return _HttpxRequest(self._client, 'HEAD', url, headers, allow_redirects, trace_request_ctx, timeout)
+
+
+class _HttpxRequest:
+    """요청 하나 (async with 로 응답을 열고 나갈 때 스트림을 닫음)"""
+
+    def __init__(self, client, method, url, headers, allow_redirects, timing, timeout=None):
+        self._client = client
+        if timeout is None:
+            self._request = client.build_request(method, url, headers=headers)
+        else:
+            self._request = client.build_request(method, url, headers=headers, timeout=timeout.total)
+        self._allow_redirects = allow_redirects
+        self._timing = timing if isinstance(timing, RequestTiming) else None
+        self._response = None
+
+    async def __aenter__(self):
+        if self._timing is not None:
+            self._timing.request_start = time.perf_counter()
+        self._response = await self._client.send(self._request, stream=True,
+                                                 follow_redirects=self._allow_redirects)
+        if self._timing is not None:
+            self._timing.headers_received = time.perf_counter()
+            self._timing.durations['ttfb'] = self._timing.headers_received - self._timing.request_start
+        return HttpxResponse(self._response)
+
+    async def __aexit__(self, *exc_info):
+        if self._response is not None:
+            await self._response.aclose()  # HTTP/2 는 스트림만 닫고 연결은 유지
+
+
+class HttpxResponse:
+    """aiohttp.ClientResponse 와 같은 속성/메서드를 가진 httpx 응답"""
+
+    def __init__(self, response):
+        self._response = response
+        self.status = response.status_code
+        self.headers = response.headers
+        self.url = str(response.url)
+        self.content = _StreamReader(response)
+        self._body = None
+
+    @property
+    def content_length(self):
+        value = self.headers.get('Content-Length')
+        return int(value) if value and value.isdigit() else None
+
+    async def read(self):
+        """남은 본문 전체 (content.read(n) 으로 앞부분을 읽었으면 그 뒤부터)"""
+        if self._body is None:
+            self._body = await self.content.read()
+        return self._body
+
+    async def text(self, encoding=None):
+        body = await self.read()
+        return body.decode(encoding or self._response.charset_encoding or 'utf-8', errors='replace')
+
+    def close(self):
+        """나머지 본문은 받지 않음 (스트림은 async with 를 나갈 때 닫힘)"""
+        self.content.discard()
+
+
+class _StreamReader:
+    """압축을 푼 본문을 원하는 길이만큼 읽는 스트림 (aiohttp StreamReader.read 와 같은 동작)"""
+
+    def __init__(self, response):
+        self._chunks = response.aiter_bytes()
+        self._buffer = b''
+        self._eof = False
+
+    async def _fill(self):
+        try:
+            self._buffer += await self._chunks.__anext__()
+        except StopAsyncIteration:
+            self._eof = True
+
+    async def read(self, n=-1):
+        """최대 n 바이트 (n < 0 이면 끝까지, 끝이면 b'')"""
+        if n < 0:
+            while not self._eof:
+                await self._fill()
+            data, self._buffer = self._buffer, b''
+            return data
+        while not self._buffer and not self._eof:
+            await self._fill()
+        data, self._buffer = self._buffer[:n], self._buffer[n:]
+        return data
+
+    def discard(self):
+        self._buffer = b''
+        self._eof = True
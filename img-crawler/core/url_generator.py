@@ -1,9 +1,17 @@
 """
-URL 생성기 - 반복 패턴 기반으로 URL 목록 생성
+URL 생성기 - 반복 패턴 또는 사이트맵 기반으로 URL 목록 생성
 """
 
+import os
 from urllib.parse import urlparse
 
+from .sitemap import RobotsCache, SitemapReader
+
+
+def default_state_dir(config):
+    """크롤링 사이의 상태를 저장할 폴더 (state_dir, 없으면 <저장 폴더>/.crawl_state)"""
+    return config.get('state_dir') or os.path.join(config.get('save_path', 'downloads'), '.crawl_state')
+
 
 class URLGenerator:
     def __init__(self, config):
@@ -14,8 +22,46 @@ class URLGenerator:
         self.end_value = config.get('end_value', 10)
         self.step_value = config.get('step_value', 1)
         
+        # 크롤링 사이의 상태 (사이트맵 lastmod 기준 시각, robots.txt 캐시, 페이지 캐시)
+        self.state_dir = default_state_dir(config)
+        
+        # robots.txt 에서 금지한 URL 은 요청 전에 제외
+        self.robots = None
+        if config.get('respect_robots', False):
+            self.robots = RobotsCache(config.get('robots_user_agent', '*'),
+                                      cache_path=os.path.join(self.state_dir, 'robots.json'))
+            
+        # sitemap_url: 사이트맵 URL 또는 'auto' (robots.txt 의 Sitemap: 항목, 없으면 /sitemap.xml)
+        self.sitemap = None
+        if config.get('sitemap_url'):
+            self.sitemap = SitemapReader(config['sitemap_url'], robots=self.robots,
+                                         state_path=os.path.join(self.state_dir, 'sitemap.json'),
+                                         incremental=config.get('sitemap_incremental', True))
+            
+    @property
+    def needs_network(self):
+        """URL 목록을 만들 때 네트워크 요청이 필요한지 (크롤러는 스레드에서 실행)"""
+        return self.sitemap is not None or self.robots is not None
+        
     def generate_urls(self):
-        """URL 목록 생성"""
+        """URL 목록 생성 (robots.txt 사용 시 금지된 URL 제외)"""
+        if self.sitemap is not None:
+            urls = self.sitemap.read(self.base_url)
+        else:
+            urls = self._pattern_urls()
+            
+        if self.robots is not None:
+            urls = [url for url in urls if self.robots.allowed(url)]
+            self.robots.save()
+        return urls
+        
+    def commit(self, failed_urls=()):
+        """크롤링을 끝까지 마친 뒤 호출 - 다음 실행은 이번 시작 이후 바뀐 페이지만 (failed_urls 는 다시)"""
+        if self.sitemap is not None:
+            self.sitemap.commit(failed_urls)
+            
+    def _pattern_urls(self):
+        """반복 패턴 (또는 단일 URL) 으로 URL 목록 생성"""
         if not self.base_url:
             return []
             
@@ -34,6 +80,31 @@ class URLGenerator:
             
         return urls
         
+    def split_ranges(self, num_parts):
+        """반복 범위를 연속된 num_parts 개의 하위 범위로 분할
+
+        각 항목은 설정에 덮어쓸 수 있는 {'start_value', 'end_value'} 딕셔너리이며,
+        반복이 없으면 전체 설정을 그대로 쓰는 빈 딕셔너리 하나만 반환한다.
+        """
+        if not self.repeat_enabled or '{}' not in self.base_url:
+            return [{}]
+            
+        values = range(self.start_value, self.end_value + 1, self.step_value)
+        num_parts = max(1, min(num_parts, len(values)))
+        chunk_size, remainder = divmod(len(values), num_parts)
+        
+        parts = []
+        offset = 0
+        for i in range(num_parts):
+            size = chunk_size + (1 if i < remainder else 0)
+            if size == 0:
+                continue
+            chunk = values[offset:offset + size]
+            parts.append({'start_value': chunk[0], 'end_value': chunk[-1]})
+            offset += size
+            
+        return parts
+        
     def get_url_count(self):
         """생성될 URL 개수 반환"""
         if not self.repeat_enabled or '{}' not in self.base_url:
@@ -43,6 +114,9 @@ class URLGenerator:
         
     def validate_pattern(self):
         """URL 패턴 유효성 검사"""
+        if self.sitemap is not None:
+            return True, "사이트맵에서 URL 을 가져옵니다."
+            
         if not self.base_url:
             return False, "URL이 입력되지 않았습니다."
             
@@ -61,7 +135,7 @@ class URLGenerator:
                 return False, f"생성될 URL이 너무 많습니다 ({url_count}개). 1000개 이하로 설정해주세요."
                 
         # 테스트 URL 생성해서 유효성 확인
-        test_urls = self.generate_urls()[:3]  # 처음 3개만 테스트
+        test_urls = self._pattern_urls()[:3]  # 처음 3개만 테스트
         for url in test_urls:
             parsed = urlparse(url)
             if not parsed.scheme or not parsed.netloc:
@@ -0,0 +1,357 @@
+"""
+작업 대기열 - 여러 노드가 페이지 범위를 나눠 가져가는 임대(lease) 기반 대기열
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+
+
+class WorkQueue(ABC):
+    """작업 대기열 백엔드 인터페이스
+
+    작업(task)은 URLGenerator 설정에 덮어쓸 범위 딕셔너리이며,
+    작업자는 임대 기간 동안만 작업을 소유하고 heartbeat 로 임대를 연장한다.
+    시간은 time.time() 을 사용하므로 노드 간 시계가 동기화되어 있어야 한다.
+    """
+
+    @abstractmethod
+    def set_config(self, config):
+        """크롤링 설정 저장 (작업자가 같은 설정으로 실행)"""
+
+    @abstractmethod
+    def get_config(self):
+        """저장된 크롤링 설정 반환"""
+
+    @abstractmethod
+    def add_tasks(self, payloads):
+        """작업 추가"""
+
+    @abstractmethod
+    def claim(self, worker_id, lease_seconds):
+        """대기 중이거나 임대가 만료된 작업 하나를 가져옴 -> (task_id, payload) 또는 None"""
+
+    @abstractmethod
+    def heartbeat(self, task_id, worker_id, lease_seconds):
+        """임대 연장 (작업을 잃었으면 False)"""
+
+    @abstractmethod
+    def complete(self, task_id, worker_id, statistics):
+        """작업 완료 처리"""
+
+    @abstractmethod
+    def fail(self, task_id, worker_id, error, max_attempts=3):
+        """작업 실패 처리 (시도 횟수가 남았으면 다시 대기열로)"""
+
+    @abstractmethod
+    def requeue_expired(self):
+        """임대가 만료된 작업을 대기열로 되돌리고 개수 반환"""
+
+    @abstractmethod
+    def claim_urls(self, urls, worker_id, task_id):
+        """아직 아무도 맡지 않은 이미지 URL 만 골라 소유권을 가져옴"""
+
+    @abstractmethod
+    def record_results(self, results):
+        """다운로드 결과 저장 (URL 기준으로 합침)"""
+
+    @abstractmethod
+    def get_results(self):
+        """저장된 전체 다운로드 결과"""
+
+    @abstractmethod
+    def status(self):
+        """상태별 작업 수 {'pending', 'leased', 'done', 'failed', 'results'}"""
+
+    def is_finished(self):
+        """모든 작업이 완료 또는 실패 상태인지 확인"""
+        counts = self.status()
+        return counts['pending'] == 0 and counts['leased'] == 0
+
+    def close(self):
+        """연결 정리"""
+
+
+class MemoryWorkQueue(WorkQueue):
+    """프로세스 내부 대기열 (테스트 및 단일 노드용)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._config = {}
+        self._tasks = {}  # task_id -> dict
+        self._next_id = 1
+        self._url_owners = {}  # url -> task_id
+        self._results = {}
+
+    def set_config(self, config):
+        with self._lock:
+            self._config = dict(config)
+
+    def get_config(self):
+        with self._lock:
+            return dict(self._config)
+
+    def add_tasks(self, payloads):
+        with self._lock:
+            for payload in payloads:
+                self._tasks[self._next_id] = {
+                    'payload': dict(payload), 'state': 'pending', 'worker': None,
+                    'lease_until': 0.0, 'attempts': 0, 'statistics': None
+                }
+                self._next_id += 1
+
+    def claim(self, worker_id, lease_seconds):
+        now = time.time()
+        with self._lock:
+            for task_id, task in sorted(self._tasks.items()):
+                expired = task['state'] == 'leased' and task['lease_until'] < now
+                if task['state'] == 'pending' or expired:
+                    if expired:
+                        self._release_urls(task_id)
+                    task.update(state='leased', worker=worker_id,
+                                lease_until=now + lease_seconds,
+                                attempts=task['attempts'] + 1)
+                    return task_id, dict(task['payload'])
+        return None
+
+    def heartbeat(self, task_id, worker_id, lease_seconds):
+        with self._lock:
+            task = self._tasks.get(task_id)
+            if not task or task['state'] != 'leased' or task['worker'] != worker_id:
+                return False
+            task['lease_until'] = time.time() + lease_seconds
+            return True
+
+    def complete(self, task_id, worker_id, statistics):
+        with self._lock:
+            task = self._tasks.get(task_id)
+            if task and task['worker'] == worker_id:
+                task.update(state='done', statistics=statistics)
+
+    def fail(self, task_id, worker_id, error, max_attempts=3):
+        with self._lock:
+            task = self._tasks.get(task_id)
+            if not task or task['worker'] != worker_id:
+                return
+            self._release_urls(task_id)
+            state = 'failed' if task['attempts'] >= max_attempts else 'pending'
+            task.update(state=state, worker=None, statistics={'error': error})
+
+    def requeue_expired(self):
+        now = time.time()
+        count = 0
+        with self._lock:
+            for task_id, task in self._tasks.items():
+                if task['state'] == 'leased' and task['lease_until'] < now:
+                    self._release_urls(task_id)
+                    task.update(state='pending', worker=None)
+                    count += 1
+        return count
+
+    def _release_urls(self, task_id):
+        """완료되지 않은 URL 소유권 해제 (잠금 상태에서 호출)"""
+        for url in [u for u, owner in self._url_owners.items()
+                    if owner == task_id and u not in self._results]:
+            del self._url_owners[url]
+
+    def claim_urls(self, urls, worker_id, task_id):
+        claimed = []
+        with self._lock:
+            for url in urls:
+                if url not in self._url_owners:
+                    self._url_owners[url] = task_id
+                    claimed.append(url)
+        return claimed
+
+    def record_results(self, results):
+        with self._lock:
+            for result in results:
+                if result.get('url'):
+                    self._results[result['url']] = dict(result)
+
+    def get_results(self):
+        with self._lock:
+            return list(self._results.values())
+
+    def status(self):
+        counts = dict.fromkeys(('pending', 'leased', 'done', 'failed'), 0)
+        with self._lock:
+            for task in self._tasks.values():
+                counts[task['state']] += 1
+            counts['results'] = len(self._results)
+        return counts
+
+
+class SQLiteWorkQueue(WorkQueue):
+    """SQLite 파일 기반 대기열 (NFS 등 공유 경로에 두고 여러 노드가 사용)
+
+    NFS 에서는 WAL 을 쓸 수 없으므로 기본 롤백 저널과 BEGIN IMMEDIATE 잠금을 사용한다.
+    """
+
+    def __init__(self, path, busy_timeout=30.0):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=busy_timeout,
+                                     isolation_level=None, check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE IF NOT EXISTS tasks (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                payload TEXT NOT NULL,
+                state TEXT NOT NULL DEFAULT 'pending',
+                worker TEXT,
+                lease_until REAL NOT NULL DEFAULT 0,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                statistics TEXT);
+            CREATE INDEX IF NOT EXISTS tasks_state ON tasks (state, lease_until);
+            CREATE TABLE IF NOT EXISTS url_owners (
+                url TEXT PRIMARY KEY, task_id INTEGER NOT NULL);
+            CREATE INDEX IF NOT EXISTS url_owners_task ON url_owners (task_id);
+            CREATE TABLE IF NOT EXISTS results (
+                url TEXT PRIMARY KEY, record TEXT NOT NULL);
+        """)
+
+    def _transaction(self, func, *args):
+        """쓰기 잠금을 잡고 func(cursor, *args) 실행"""
+        with self._lock:
+            cur = self._conn.cursor()
+            cur.execute("BEGIN IMMEDIATE")
+            try:
+                result = func(cur, *args)
+            except Exception:
+                cur.execute("ROLLBACK")
+                raise
+            cur.execute("COMMIT")
+            return result
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def set_config(self, config):
+        self._transaction(lambda cur: cur.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('config', ?)",
+            (json.dumps(config, ensure_ascii=False),)))
+
+    def get_config(self):
+        rows = self._query("SELECT value FROM meta WHERE key = 'config'")
+        return json.loads(rows[0][0]) if rows else {}
+
+    def add_tasks(self, payloads):
+        self._transaction(lambda cur: cur.executemany(
+            "INSERT INTO tasks (payload) VALUES (?)",
+            [(json.dumps(p),) for p in payloads]))
+
+    def claim(self, worker_id, lease_seconds):
+        def do_claim(cur):
+            now = time.time()
+            row = cur.execute(
+                "SELECT id, payload, state FROM tasks "
+                "WHERE state = 'pending' OR (state = 'leased' AND lease_until < ?) "
+                "ORDER BY id LIMIT 1", (now,)).fetchone()
+            if not row:
+                return None
+            task_id, payload, state = row
+            if state == 'leased':
+                self._release_urls(cur, task_id)
+            cur.execute(
+                "UPDATE tasks SET state = 'leased', worker = ?, lease_until = ?, "
+                "attempts = attempts + 1 WHERE id = ?",
+                (worker_id, now + lease_seconds, task_id))
+            return task_id, json.loads(payload)
+
+        return self._transaction(do_claim)
+
+    def heartbeat(self, task_id, worker_id, lease_seconds):
+        def do_heartbeat(cur):
+            cur.execute(
+                "UPDATE tasks SET lease_until = ? "
+                "WHERE id = ? AND worker = ? AND state = 'leased'",
+                (time.time() + lease_seconds, task_id, worker_id))
+            return cur.rowcount == 1
+
+        return self._transaction(do_heartbeat)
+
+    def complete(self, task_id, worker_id, statistics):
+        self._transaction(lambda cur: cur.execute(
+            "UPDATE tasks SET state = 'done', statistics = ? WHERE id = ? AND worker = ?",
+            (json.dumps(statistics), task_id, worker_id)))
+
+    def fail(self, task_id, worker_id, error, max_attempts=3):
+        def do_fail(cur):
+            row = cur.execute("SELECT attempts FROM tasks WHERE id = ? AND worker = ?",
+                              (task_id, worker_id)).fetchone()
+            if not row:
+                return
+            self._release_urls(cur, task_id)
+            state = 'failed' if row[0] >= max_attempts else 'pending'
+            cur.execute(
+                "UPDATE tasks SET state = ?, worker = NULL, statistics = ? WHERE id = ?",
+                (state, json.dumps({'error': error}), task_id))
+
+        self._transaction(do_fail)
+
+    def requeue_expired(self):
+        def do_requeue(cur):
+            expired = [row[0] for row in cur.execute(
+                "SELECT id FROM tasks WHERE state = 'leased' AND lease_until < ?",
+                (time.time(),)).fetchall()]
+            for task_id in expired:
+                self._release_urls(cur, task_id)
+                cur.execute("UPDATE tasks SET state = 'pending', worker = NULL WHERE id = ?",
+                            (task_id,))
+            return len(expired)
+
+        return self._transaction(do_requeue)
+
+    @staticmethod
+    def _release_urls(cur, task_id):
+        """완료되지 않은 URL 소유권 해제"""
+        cur.execute(
+            "DELETE FROM url_owners WHERE task_id = ? "
+            "AND url NOT IN (SELECT url FROM results)", (task_id,))
+
+    def claim_urls(self, urls, worker_id, task_id):
+        def do_claim(cur):
+            claimed = []
+            for url in urls:
+                cur.execute("INSERT OR IGNORE INTO url_owners (url, task_id) VALUES (?, ?)",
+                            (url, task_id))
+                if cur.rowcount == 1:
+                    claimed.append(url)
+            return claimed
+
+        return self._transaction(do_claim)
+
+    def record_results(self, results):
+        rows = [(r['url'], json.dumps(dict(r), ensure_ascii=False)) for r in results if r.get('url')]
+        self._transaction(lambda cur: cur.executemany(
+            "INSERT OR REPLACE INTO results (url, record) VALUES (?, ?)", rows))
+
+    def get_results(self):
+        return [json.loads(row[0]) for row in self._query("SELECT record FROM results")]
+
+    def status(self):
+        counts = dict.fromkeys(('pending', 'leased', 'done', 'failed'), 0)
+        for state, count in self._query("SELECT state, COUNT(*) FROM tasks GROUP BY state"):
+            counts[state] = count
+        counts['results'] = self._query("SELECT COUNT(*) FROM results")[0][0]
+        return counts
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def open_work_queue(uri):
+    """URI 로 대기열 백엔드 생성 (memory:// 또는 sqlite:///경로)"""
+    if uri == 'memory://':
+        return MemoryWorkQueue()
+    if uri.startswith('sqlite:///'):
+        return SQLiteWorkQueue(uri[len('sqlite:///'):])
+    if uri.endswith(('.db', '.sqlite', '.sqlite3')):
+        return SQLiteWorkQueue(uri)
+    raise ValueError(f"지원하지 않는 대기열 주소입니다: {uri}")
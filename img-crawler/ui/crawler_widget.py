@@ -10,13 +10,23 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QGroupBox,
 from PyQt5.QtCore import QThread, pyqtSignal, QSettings
 import validators
 
-from core.crawler_thread import CrawlerThread
+from core.crawler_thread import CrawlerThread, JobManagerThread
+
+# 프로파일링 결과 저장 폴더 (설정 > 크롤링 프로파일링)
+PROFILE_DIR = os.path.join("logs", "profile")
+
+# 설정 > 다운로드 > "지원하는 형식만 다운로드" 에서 허용하는 형식
+SUPPORTED_FORMATS = ('jpeg', 'png', 'gif', 'webp')
+
+# 앱 종료 시 크롤링 스레드가 끝나기를 기다리는 최대 시간 (밀리초)
+STOP_WAIT_MS = 5000
 
 
 class CrawlerWidget(QWidget):
     # 신호 정의
     crawling_started = pyqtSignal()
     crawling_progress = pyqtSignal(int, str)  # 진행률, 메시지
+    crawling_snapshot = pyqtSignal(object)  # ProgressSnapshot
     crawling_finished = pyqtSignal(list)  # 결과 리스트
     crawling_error = pyqtSignal(str)  # 에러 메시지
     images_found = pyqtSignal(list)  # 발견된 이미지 리스트
@@ -25,6 +35,7 @@ class CrawlerWidget(QWidget):
     def __init__(self):
         super().__init__()
         self.crawler_thread = None
+        self.job_thread = None  # 대기열 작업을 실행하는 JobManagerThread (처음 추가할 때 시작)
         self.settings = QSettings()
         self.init_ui()
         self.load_settings()
@@ -51,6 +62,10 @@ class CrawlerWidget(QWidget):
         repeat_group = self.create_repeat_group()
         scroll_layout.addWidget(repeat_group)
         
+        # 링크 따라가기 그룹
+        follow_group = self.create_follow_group()
+        scroll_layout.addWidget(follow_group)
+        
         # 저장 설정 그룹
         save_group = self.create_save_group()
         scroll_layout.addWidget(save_group)
@@ -159,6 +174,50 @@ class CrawlerWidget(QWidget):
         
         return group
         
+    def create_follow_group(self):
+        """링크 따라가기 설정 그룹 생성"""
+        group = QGroupBox("🔗 링크 따라가기")
+        layout = QVBoxLayout(group)
+        
+        # 활성화 체크박스
+        self.enable_follow = QCheckBox("페이지의 링크를 따라가며 크롤링 (다음 페이지, 하위 앨범)")
+        self.enable_follow.toggled.connect(self.toggle_follow_settings)
+        layout.addWidget(self.enable_follow)
+        
+        # 설정 프레임
+        self.follow_frame = QFrame()
+        follow_layout = QGridLayout(self.follow_frame)
+        
+        # 따라갈 링크 선택자 (이미지 선택자와 같은 CSS 문법)
+        follow_layout.addWidget(QLabel("링크 선택자:"), 0, 0)
+        self.follow_selector_input = QLineEdit()
+        self.follow_selector_input.setPlaceholderText("a[href] (예: .pagination a, a.next, .album a)")
+        follow_layout.addWidget(self.follow_selector_input, 0, 1, 1, 3)
+        
+        # 최대 단계
+        follow_layout.addWidget(QLabel("최대 단계:"), 1, 0)
+        self.max_depth_value = QSpinBox()
+        self.max_depth_value.setRange(1, 20)
+        self.max_depth_value.setValue(2)
+        follow_layout.addWidget(self.max_depth_value, 1, 1)
+        
+        # 호스트별 페이지 수 제한
+        follow_layout.addWidget(QLabel("호스트별 최대 페이지:"), 1, 2)
+        self.max_pages_per_host_value = QSpinBox()
+        self.max_pages_per_host_value.setRange(0, 1000000)
+        self.max_pages_per_host_value.setSpecialValueText("제한 없음")
+        follow_layout.addWidget(self.max_pages_per_host_value, 1, 3)
+        
+        # 같은 사이트만
+        self.same_domain_check = QCheckBox("같은 사이트의 링크만 따라가기")
+        self.same_domain_check.setChecked(True)
+        follow_layout.addWidget(self.same_domain_check, 2, 0, 1, 4)
+        
+        self.follow_frame.setEnabled(False)
+        layout.addWidget(self.follow_frame)
+        
+        return group
+        
     def create_save_group(self):
         """저장 설정 그룹 생성"""
         group = QGroupBox("💾 저장 설정")
@@ -237,10 +296,54 @@ class CrawlerWidget(QWidget):
         self.stop_btn.clicked.connect(self.stop_crawling)
         self.stop_btn.setEnabled(False)
         
+        self.pause_btn = QPushButton("⏸ 일시정지")
+        self.pause_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #FF9800;
+                color: white;
+                border: none;
+                padding: 12px 24px;
+                font-size: 14px;
+                font-weight: bold;
+                border-radius: 6px;
+            }
+            QPushButton:hover {
+                background-color: #F57C00;
+            }
+            QPushButton:disabled {
+                background-color: #cccccc;
+            }
+        """)
+        self.pause_btn.clicked.connect(self.toggle_pause)
+        self.pause_btn.setEnabled(False)
+        
         layout.addWidget(self.start_btn)
+        layout.addWidget(self.pause_btn)
         layout.addWidget(self.stop_btn)
         
-        return layout
+        # 대기열 (여러 크롤링을 한 연결 풀에서 동시에 실행)
+        queue_layout = QHBoxLayout()
+        
+        self.queue_btn = QPushButton("📥 대기열에 추가")
+        self.queue_btn.setToolTip("현재 설정을 대기열에 추가합니다. 여러 작업이 연결 풀을 함께 쓰며 동시에 실행됩니다.")
+        self.queue_btn.clicked.connect(self.queue_crawling)
+        queue_layout.addWidget(self.queue_btn)
+        
+        queue_layout.addWidget(QLabel("우선순위:"))
+        self.priority_value = QSpinBox()
+        self.priority_value.setRange(0, 9)
+        self.priority_value.setToolTip("높을수록 먼저 시작하고 동시 요청을 더 많이 나눠 받습니다")
+        queue_layout.addWidget(self.priority_value)
+        
+        self.queue_status_label = QLabel("")
+        self.queue_status_label.setStyleSheet("color: gray; font-size: 12px;")
+        queue_layout.addWidget(self.queue_status_label)
+        queue_layout.addStretch()
+        
+        control_layout = QVBoxLayout()
+        control_layout.addLayout(layout)
+        control_layout.addLayout(queue_layout)
+        return control_layout
         
     def validate_url(self):
         """URL 유효성 검사"""
@@ -272,6 +375,10 @@ class CrawlerWidget(QWidget):
         self.repeat_frame.setEnabled(enabled)
         self.validate_url()
         
+    def toggle_follow_settings(self, enabled):
+        """링크 따라가기 설정 활성화/비활성화"""
+        self.follow_frame.setEnabled(enabled)
+        
     def set_common_selectors(self):
         """일반적인 선택자 설정"""
         selectors = """img
@@ -308,27 +415,131 @@ article img"""
         # UI 상태 변경
         self.start_btn.setEnabled(False)
         self.stop_btn.setEnabled(True)
+        self.pause_btn.setEnabled(True)
         
         # 크롤링 스레드 시작
         self.crawler_thread = CrawlerThread(self.get_crawl_config())
         self.crawler_thread.progress.connect(self.crawling_progress.emit)
+        self.crawler_thread.snapshot.connect(self.crawling_snapshot.emit)
         self.crawler_thread.images_found.connect(self.images_found.emit)
         self.crawler_thread.finished_signal.connect(self.on_crawling_finished)
         self.crawler_thread.error.connect(self.on_crawling_error)
+        self.crawler_thread.finished.connect(self.on_thread_finished)
+        self.crawler_thread.paused.connect(self.on_paused_changed)
         
         self.crawler_thread.start()
         self.crawling_started.emit()
         self.status_message.emit("크롤링을 시작합니다...")
         
-    def stop_crawling(self):
-        """크롤링 중지"""
+    def stop_crawling(self, wait=False):
+        """크롤링 중지 (기본은 기다리지 않고 스레드가 끝나면 on_thread_finished 에서 UI 복원)
+
+        wait: 앱 종료처럼 스레드가 끝날 때까지 기다려야 할 때 (최대 STOP_WAIT_MS)
+        """
         if self.crawler_thread and self.crawler_thread.isRunning():
+            self.stop_btn.setEnabled(False)
+            self.pause_btn.setEnabled(False)
+            self.status_message.emit("크롤링을 중지하는 중...")
             self.crawler_thread.stop()
-            self.crawler_thread.wait()
+            if not wait:
+                return
+            self.crawler_thread.wait(STOP_WAIT_MS)
             
         self.reset_ui_state()
         self.status_message.emit("크롤링이 중지되었습니다")
         
+    def toggle_pause(self):
+        """일시정지 / 재개 (연결과 대기 중인 작업은 유지)"""
+        if not (self.crawler_thread and self.crawler_thread.isRunning()):
+            return
+        if self.crawler_thread.is_paused():
+            self.crawler_thread.resume()
+        else:
+            self.crawler_thread.pause()
+            
+    def on_paused_changed(self, paused):
+        """일시정지 상태에 맞게 버튼과 상태 표시 변경"""
+        self.pause_btn.setText("▶ 재개" if paused else "⏸ 일시정지")
+        self.status_message.emit("크롤링 일시정지 (진행 중이던 전송만 마무리)" if paused
+                                 else "크롤링을 재개합니다")
+        
+    def on_thread_finished(self):
+        """크롤링 스레드 종료 (중지 요청으로 끝났으면 UI 복원)"""
+        if self.crawler_thread and self.crawler_thread.is_stop_requested():
+            self.reset_ui_state()
+            self.status_message.emit("크롤링이 중지되었습니다")
+        
+    def queue_crawling(self):
+        """현재 설정을 대기열에 추가 (자리가 나면 자동으로 시작)"""
+        if not self.validate_inputs():
+            return
+            
+        self.save_settings()
+        
+        if self.job_thread is None:
+            rate, host_rate = self.get_bandwidth_limits()
+            self.job_thread = JobManagerThread({
+                'max_jobs': self.settings.value("jobs/max_jobs", 4, type=int),
+                'max_connections': self.settings.value("jobs/max_connections", 16, type=int),
+                'bandwidth_limit': rate,
+                'host_bandwidth_limit': host_rate,
+            })
+            self.job_thread.job_started.connect(self.on_job_started)
+            self.job_thread.job_finished.connect(self.on_job_finished)
+            self.job_thread.job_error.connect(self.on_job_error)
+            self.job_thread.start()
+        else:
+            self.apply_runtime_settings()
+            
+        job_id = self.job_thread.submit(self.get_crawl_config(), self.priority_value.value())
+        self.update_queue_status()
+        self.status_message.emit(f"대기열 작업 #{job_id} 추가됨")
+        
+    def on_job_started(self, job_id, url):
+        self.update_queue_status()
+        self.status_message.emit(f"대기열 작업 #{job_id} 시작: {url}")
+        
+    def on_job_finished(self, job_id, state, results):
+        self.update_queue_status()
+        if state == 'done':
+            self.status_message.emit(f"대기열 작업 #{job_id} 완료: {len(results)}개 이미지 처리됨")
+        elif state == 'cancelled':
+            self.status_message.emit(f"대기열 작업 #{job_id} 취소됨")
+            
+    def on_job_error(self, job_id, error_msg):
+        self.status_message.emit(f"대기열 작업 #{job_id} 오류: {error_msg}")
+        
+    def update_queue_status(self):
+        """대기 중이거나 실행 중인 대기열 작업 수 표시"""
+        active = self.job_thread.active_jobs() if self.job_thread else 0
+        self.queue_status_label.setText(f"대기열 작업 {active}개" if active else "")
+        
+    def get_bandwidth_limits(self):
+        """설정 > 네트워크의 (전체, 호스트별) 수신 속도 제한 (바이트/초, 0 이면 제한 없음)"""
+        return (self.settings.value("network/bandwidth_limit_kb", 0, type=int) * 1024,
+                self.settings.value("network/host_bandwidth_limit_kb", 0, type=int) * 1024)
+        
+    def apply_runtime_settings(self):
+        """설정 변경을 실행 중인 크롤링과 대기열에 바로 적용 (수신 속도, 대기열 작업 수)"""
+        rate, host_rate = self.get_bandwidth_limits()
+        if self.crawler_thread and self.crawler_thread.isRunning():
+            self.crawler_thread.set_bandwidth_limit(rate, host_rate)
+        if self.job_thread and self.job_thread.isRunning():
+            self.job_thread.set_bandwidth_limit(rate, host_rate)
+            self.job_thread.set_limits(self.settings.value("jobs/max_jobs", 4, type=int),
+                                       self.settings.value("jobs/max_connections", 16, type=int))
+        
+    def stop_jobs(self, wait=False):
+        """대기열 작업 모두 중지 (앱 종료 시 wait=True 로 최대 STOP_WAIT_MS 대기)"""
+        if self.job_thread and self.job_thread.isRunning():
+            self.job_thread.stop()
+            if wait:
+                self.job_thread.wait(STOP_WAIT_MS)
+                
+    def has_active_jobs(self):
+        """대기열에 끝나지 않은 작업이 있는지"""
+        return bool(self.job_thread and self.job_thread.active_jobs())
+        
     def validate_inputs(self):
         """입력값 유효성 검사"""
         if not self.validate_url():
@@ -370,13 +581,45 @@ article img"""
             'step_value': self.step_value.value(),
             'concurrent': self.concurrent_value.value()
         }
+        
+        # 링크 따라가기
+        if self.enable_follow.isChecked():
+            follow_selector = self.follow_selector_input.text().strip()
+            config.update({
+                'follow_links': True,
+                'follow_selectors': [follow_selector] if follow_selector else ['a[href]'],
+                'max_depth': self.max_depth_value.value(),
+                'max_pages_per_host': self.max_pages_per_host_value.value(),
+                'same_domain': self.same_domain_check.isChecked(),
+            })
+            
+        # 이미지 수신 속도 제한 (설정 > 네트워크)
+        config['bandwidth_limit'], config['host_bandwidth_limit'] = self.get_bandwidth_limits()
+        
+        # 저장 형식 (설정 > 다운로드 > 저장 형식)
+        config['output_format'] = self.settings.value("download/output_format", "files")
+        
+        # 이미지 필터 (설정 > 다운로드, 본문을 받기 전에 확인)
+        config['max_file_size_mb'] = self.settings.value("download/max_size", 50, type=int)
+        config['min_width'] = self.settings.value("download/min_width", 100, type=int)
+        config['min_height'] = self.settings.value("download/min_height", 100, type=int)
+        if self.settings.value("download/supported_formats", True, type=bool):
+            config['allowed_types'] = list(SUPPORTED_FORMATS)
+        
+        # 설정 대화상자에서 프로파일링을 켠 경우
+        if self.settings.value("ui/profile_crawl", False, type=bool):
+            config['profile_dir'] = PROFILE_DIR
         return config
         
     def on_crawling_finished(self, results):
         """크롤링 완료 처리"""
         self.reset_ui_state()
         self.crawling_finished.emit(results)
-        self.status_message.emit(f"크롤링 완료: {len(results)}개 이미지 처리됨")
+        if self.crawler_thread and self.crawler_thread.profile_summary:
+            self.status_message.emit(f"크롤링 완료: {len(results)}개 이미지 처리됨 "
+                                     f"(프로파일: {os.path.join(PROFILE_DIR, 'summary.txt')})")
+        else:
+            self.status_message.emit(f"크롤링 완료: {len(results)}개 이미지 처리됨")
         
     def on_crawling_error(self, error_msg):
         """크롤링 오류 처리"""
@@ -389,6 +632,8 @@ article img"""
         """UI 상태 초기화"""
         self.start_btn.setEnabled(True)
         self.stop_btn.setEnabled(False)
+        self.pause_btn.setEnabled(False)
+        self.pause_btn.setText("⏸ 일시정지")
         
     def is_crawling(self):
         """크롤링 중인지 확인"""
@@ -406,6 +651,11 @@ article img"""
         self.settings.setValue("end_value", self.end_value.value())
         self.settings.setValue("step_value", self.step_value.value())
         self.settings.setValue("concurrent", self.concurrent_value.value())
+        self.settings.setValue("follow_links", self.enable_follow.isChecked())
+        self.settings.setValue("follow_selector", self.follow_selector_input.text())
+        self.settings.setValue("max_depth", self.max_depth_value.value())
+        self.settings.setValue("max_pages_per_host", self.max_pages_per_host_value.value())
+        self.settings.setValue("same_domain", self.same_domain_check.isChecked())
         
     def load_settings(self):
         """설정 로드"""
@@ -423,4 +673,9 @@ article img"""
         self.start_value.setValue(self.settings.value("start_value", 1, type=int))
         self.end_value.setValue(self.settings.value("end_value", 10, type=int))
         self.step_value.setValue(self.settings.value("step_value", 1, type=int))
-        self.concurrent_value.setValue(self.settings.value("concurrent", 3, type=int)) 
\ No newline at end of file
+        self.concurrent_value.setValue(self.settings.value("concurrent", 3, type=int))
+        self.enable_follow.setChecked(self.settings.value("follow_links", False, type=bool))
+        self.follow_selector_input.setText(self.settings.value("follow_selector", ""))
+        self.max_depth_value.setValue(self.settings.value("max_depth", 2, type=int))
+        self.max_pages_per_host_value.setValue(self.settings.value("max_pages_per_host", 0, type=int))
+        self.same_domain_check.setChecked(self.settings.value("same_domain", True, type=bool))
@@ -0,0 +1,55 @@
+"""
+로그 뷰 - 링 버퍼 기반 로그 표시 위젯
+"""
+
+from PyQt5.QtWidgets import QPlainTextEdit
+from PyQt5.QtCore import QTimer
+
+from core.log_buffer import LogBuffer
+
+
+class LogView(QPlainTextEdit):
+    """고정 줄 수만 유지하며 프레임 단위로 묶어서 출력하는 로그 뷰"""
+
+    def __init__(self, capacity=5000, flush_interval=50):
+        super().__init__()
+        self.buffer = LogBuffer(capacity)
+        self.auto_scroll = True
+        self.setReadOnly(True)
+        self.setMaximumBlockCount(capacity)
+        self.setLineWrapMode(QPlainTextEdit.NoWrap)
+
+        # 추가된 줄은 flush_interval(ms) 마다 한 번에 출력
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setInterval(flush_interval)
+        self.flush_timer.timeout.connect(self.flush)
+        self.flush_timer.start()
+
+    def append_line(self, line):
+        """로그 한 줄 추가 (실제 출력은 다음 flush 시점)"""
+        self.buffer.append(line)
+
+    def flush(self):
+        """대기 중인 로그를 한 번에 출력"""
+        lines = self.buffer.drain()
+        if not lines:
+            return
+
+        self.appendPlainText("\n".join(lines))
+
+        # 자동 스크롤
+        if self.auto_scroll:
+            scrollbar = self.verticalScrollBar()
+            scrollbar.setValue(scrollbar.maximum())
+
+    def clear(self):
+        """화면과 버퍼 비우기"""
+        self.buffer.clear()
+        super().clear()
+
+    def set_spill_file(self, file_path):
+        """로그 파일 저장 설정 (None 이면 해제)"""
+        if file_path:
+            self.buffer.enable_spill(file_path)
+        else:
+            self.buffer.disable_spill()
@@ -114,6 +114,7 @@ class MainWindow(QMainWindow):
         # 크롤러 위젯에서 진행상황 위젯으로 신호 전달
         self.crawler_widget.crawling_started.connect(self.progress_widget.start_progress)
         self.crawler_widget.crawling_progress.connect(self.progress_widget.update_progress)
+        self.crawler_widget.crawling_snapshot.connect(self.progress_widget.update_snapshot)
         self.crawler_widget.crawling_finished.connect(self.progress_widget.finish_progress)
         self.crawler_widget.crawling_error.connect(self.progress_widget.show_error)
         
@@ -128,7 +129,9 @@ class MainWindow(QMainWindow):
     def show_settings(self):
         """설정 다이얼로그 표시"""
         dialog = SettingsDialog(self)
-        dialog.exec_()
+        if dialog.exec_():
+            # 수신 속도 제한 등은 진행 중인 크롤링에도 바로 적용
+            self.crawler_widget.apply_runtime_settings()
         
     def show_about(self):
         """정보 다이얼로그 표시"""
@@ -146,7 +149,7 @@ class MainWindow(QMainWindow):
         
     def closeEvent(self, event):
         """앱 종료 시 확인"""
-        if self.crawler_widget.is_crawling():
+        if self.crawler_widget.is_crawling() or self.crawler_widget.has_active_jobs():
             reply = QMessageBox.question(self, '종료 확인',
                                        '크롤링이 진행 중입니다. 정말 종료하시겠습니까?',
                                        QMessageBox.Yes | 
@@ -154,9 +157,13 @@ class MainWindow(QMainWindow):
                                        QMessageBox.No)
             
             if reply == QMessageBox.Yes:
-                self.crawler_widget.stop_crawling()
+                self.crawler_widget.stop_crawling(wait=True)
+                self.crawler_widget.stop_jobs(wait=True)
+                self.progress_widget.stop_log_saving()
                 event.accept()
             else:
                 event.ignore()
         else:
+            self.crawler_widget.stop_jobs(wait=True)
+            self.progress_widget.stop_log_saving()
             event.accept() 
\ No newline at end of file
@@ -3,7 +3,6 @@
 """
 
 import os
-from urllib.parse import urlparse
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QGroupBox,
                              QTableWidget, QTableWidgetItem, QLabel, QPushButton,
                              QTabWidget, QScrollArea, QFrame, QGridLayout,
@@ -14,15 +13,19 @@ from PyQt5.QtGui import QPixmap, QFont, QIcon
 from PIL import Image
 import requests
 
+from core.collection import ImageCollection
+from core.records import ResultCounts
+
 
 class ImageThumbnailWidget(QLabel):
     """이미지 썸네일 표시 위젯"""
     clicked = pyqtSignal(str)  # 이미지 URL
     
-    def __init__(self, image_url, local_path=None):
+    def __init__(self, image_url, local_path=None, image_bytes=None):
         super().__init__()
         self.image_url = image_url
         self.local_path = local_path
+        self.image_bytes = image_bytes  # 묶음 파일에서 읽은 이미지 (memoryview)
         self.setFixedSize(150, 150)
         self.setAlignment(Qt.AlignCenter)
         self.setStyleSheet("""
@@ -43,7 +46,16 @@ class ImageThumbnailWidget(QLabel):
     def load_thumbnail(self):
         """썸네일 로드"""
         try:
-            if self.local_path and os.path.exists(self.local_path):
+            if self.image_bytes is not None:
+                # 묶음 파일(mmap)에서 로드
+                pixmap = QPixmap()
+                if pixmap.loadFromData(bytes(self.image_bytes)):
+                    self.setPixmap(pixmap.scaled(140, 140, Qt.KeepAspectRatio,
+                                                 Qt.SmoothTransformation))
+                else:
+                    self.setText("❌\n로드 실패")
+                self.image_bytes = None
+            elif self.local_path and os.path.exists(self.local_path):
                 # 로컬 파일에서 로드
                 print(f"썸네일 로딩 시도: {self.local_path}")  # 디버깅용
                 pixmap = QPixmap(self.local_path)
@@ -80,6 +92,8 @@ class PreviewWidget(QWidget):
     def __init__(self):
         super().__init__()
         self.images_data = []
+        self.result_counts = ResultCounts()  # 마지막 결과의 상태/확장자/도메인별 수
+        self._pack_readers = {}  # 묶음 폴더 -> ImageCollection
         self.init_ui()
         
     def init_ui(self):
@@ -267,7 +281,8 @@ class PreviewWidget(QWidget):
             
             thumbnail = ImageThumbnailWidget(
                 image_data.get('url', ''),
-                image_data.get('local_path', '')
+                image_data.get('local_path', ''),
+                self.read_packed_image(image_data.get('pack'))
             )
             thumbnail.clicked.connect(self.on_thumbnail_clicked)
             
@@ -275,6 +290,21 @@ class PreviewWidget(QWidget):
         
         print(f"썸네일 새로고침 완료")  # 디버깅용
         
+    def read_packed_image(self, pack):
+        """묶음 파일에 저장된 이미지 바이트 (mmap memoryview, 없으면 None)"""
+        if not pack:
+            return None
+        try:
+            directory, shard = os.path.split(pack['shard'])
+            reader = self._pack_readers.get(directory)
+            if reader is None:
+                reader = self._pack_readers[directory] = ImageCollection(directory)
+            return reader.read({'shard': shard, 'offset': pack['offset'],
+                                      'length': pack['length']})
+        except Exception as e:
+            print(f"묶음 이미지 읽기 오류 {pack.get('shard')}: {e}")
+            return None
+            
     def update_image_count(self):
         """이미지 개수 업데이트"""
         count = len(self.images_data)
@@ -289,17 +319,9 @@ class PreviewWidget(QWidget):
     def show_results(self, results):
         """크롤링 결과 표시"""
         # 다운로드된 이미지들을 미리보기에 추가
-        downloaded_images = []
-        for result in results:
-            if result.get('success', False) and result.get('local_path'):
-                # 다운로드 결과를 이미지 데이터 형식으로 변환
-                image_data = {
-                    'url': result.get('url', ''),
-                    'local_path': result.get('local_path', ''),
-                    'filename': result.get('filename', ''),
-                    'size': result.get('size', 0)
-                }
-                downloaded_images.append(image_data)
+        # 결과 레코드를 그대로 사용 (이미지마다 dict 로 복사하지 않음)
+        downloaded_images = [result for result in results
+                             if result.get('success', False) and (result.get('local_path') or result.get('pack'))]
         
         # 기존 이미지 데이터를 다운로드된 것들로 교체
         if downloaded_images:
@@ -307,9 +329,11 @@ class PreviewWidget(QWidget):
             self.update_image_count()
             self.refresh_thumbnails()
         
-        # 결과 테이블과 통계 업데이트
+        # 결과 테이블과 통계 업데이트 (통계는 결과를 받을 때 한 번 센 카운터로 표시)
         self.populate_results_table(results)
-        self.update_statistics(results)
+        self.result_counts = ResultCounts()
+        self.result_counts.add_all(results)
+        self.update_statistics()
         
     def populate_results_table(self, results):
         """결과 테이블 채우기"""
@@ -337,12 +361,15 @@ class PreviewWidget(QWidget):
             download_time = result.get('download_time', '알 수 없음')
             self.results_table.setItem(row, 4, QTableWidgetItem(str(download_time)))
             
-    def update_statistics(self, results):
-        """통계 업데이트"""
-        total = len(results)
-        success = sum(1 for r in results if r.get('success', False))
-        failed = total - success
-        total_size = sum(r.get('size', 0) for r in results if r.get('success', False))
+    def update_statistics(self):
+        """통계 업데이트 (result_counts 에서 읽음, 결과 목록을 다시 훑지 않음)"""
+        counts = self.result_counts
+        total = counts.total
+        success = counts.success
+        failed = counts.failed
+        total_size = counts.total_size
+        file_types = counts.file_types
+        domains = counts.domains
         
         # 요약 통계 업데이트
         self.total_images_label.setText(f"총 이미지: {total}")
@@ -355,25 +382,11 @@ class PreviewWidget(QWidget):
         self.total_size_label.setText(f"총 크기: {self.format_size(total_size)}")
         
         # 파일 타입 통계
-        file_types = {}
-        for result in results:
-            if result.get('success', False):
-                filename = result.get('filename', '')
-                ext = os.path.splitext(filename)[1].lower()
-                file_types[ext] = file_types.get(ext, 0) + 1
-                
         file_types_text = "\n".join([f"{ext or '확장자 없음'}: {count}개" 
                                    for ext, count in file_types.items()])
         self.file_types_label.setText(file_types_text or "파일 타입 정보 없음")
         
         # 도메인 통계
-        domains = {}
-        for result in results:
-            if result.get('success', False):
-                url = result.get('url', '')
-                domain = urlparse(url).netloc
-                domains[domain] = domains.get(domain, 0) + 1
-                
         domains_text = "\n".join([f"{domain}: {count}개" 
                                 for domain, count in domains.items()])
         self.domains_label.setText(domains_text or "도메인 정보 없음")
@@ -443,8 +456,12 @@ class PreviewWidget(QWidget):
         """모든 데이터 지우기"""
         self.images_data.clear()
         self.refresh_thumbnails()
+        for reader in self._pack_readers.values():
+            reader.close()
+        self._pack_readers = {}
         self.update_image_count()
         self.results_table.setRowCount(0)
+        self.result_counts = ResultCounts()
         
         # 통계 초기화
         self.total_images_label.setText("총 이미지: 0")
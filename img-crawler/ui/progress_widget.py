@@ -2,12 +2,18 @@
 진행상황 위젯 - 크롤링 진행률 및 로그 표시
 """
 
+import os
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QGroupBox,
-                             QProgressBar, QLabel, QTextEdit, QPushButton,
+                             QProgressBar, QLabel, QPushButton,
                              QFrame)
-from PyQt5.QtCore import pyqtSignal, QTimer, QDateTime
+from PyQt5.QtCore import pyqtSignal, QTimer, QDateTime, QSettings
 from PyQt5.QtGui import QFont
 
+from .log_view import LogView
+
+# 로그 자동 저장 파일 (설정 > 인터페이스 > 로그 자동 저장)
+LOG_FILE_PATH = os.path.join("logs", "crawler.log")
+
 
 class ProgressWidget(QWidget):
     status_message = pyqtSignal(str)
@@ -87,10 +93,9 @@ class ProgressWidget(QWidget):
         group = QGroupBox("📝 로그")
         layout = QVBoxLayout(group)
         
-        # 로그 텍스트
-        self.log_text = QTextEdit()
+        # 로그 텍스트 (최근 5000줄만 유지)
+        self.log_text = LogView(capacity=5000)
         self.log_text.setMaximumHeight(200)
-        self.log_text.setReadOnly(True)
         
         # 크로스 플랫폼 모노스페이스 폰트 설정
         font = QFont()
@@ -99,7 +104,7 @@ class ProgressWidget(QWidget):
         self.log_text.setFont(font)
         
         self.log_text.setStyleSheet("""
-            QTextEdit {
+            QPlainTextEdit {
                 background-color: #ffffff;
                 border: 1px solid #dee2e6;
                 border-radius: 4px;
@@ -120,9 +125,6 @@ class ProgressWidget(QWidget):
         
         log_controls.addStretch()
         
-        # 자동 스크롤 토글 (기본적으로 체크됨)
-        self.auto_scroll = True
-        
         layout.addLayout(log_controls)
         
         return group
@@ -135,27 +137,26 @@ class ProgressWidget(QWidget):
         self.progress_label.setText("크롤링 시작...")
         self.processed_label.setText("처리됨: 0")
         self.failed_label.setText("실패: 0")
+        
+        # 로그 자동 저장 설정 반영
+        auto_save = QSettings().value("ui/auto_save_log", False, type=bool)
+        self.log_text.set_spill_file(LOG_FILE_PATH if auto_save else None)
+        
         self.add_log("✅ 크롤링을 시작합니다.")
         
     def update_progress(self, percentage, message):
-        """진행률 업데이트"""
+        """진행률 업데이트 (단계 전환 메시지)"""
         self.progress_bar.setValue(percentage)
         self.progress_label.setText(message)
-        
-        # 통계 정보 업데이트 (메시지에서 파싱)
-        if "처리됨:" in message:
-            parts = message.split(",")
-            for part in parts:
-                part = part.strip()
-                if "처리됨:" in part:
-                    processed = part.split(":")[1].strip()
-                    self.processed_label.setText(f"처리됨: {processed}")
-                elif "실패:" in part:
-                    failed = part.split(":")[1].strip()
-                    self.failed_label.setText(f"실패: {failed}")
-        
         self.add_log(f"📊 {message}")
         
+    def update_snapshot(self, snapshot):
+        """주기적으로 전달되는 진행 스냅샷 반영"""
+        self.progress_bar.setValue(snapshot.percentage)
+        self.progress_label.setText(snapshot.describe())
+        self.processed_label.setText(f"처리됨: {snapshot.processed_images}")
+        self.failed_label.setText(f"실패: {snapshot.failed_downloads}")
+        
     def finish_progress(self, results):
         """진행률 완료"""
         self.timer.stop()
@@ -183,17 +184,12 @@ class ProgressWidget(QWidget):
     def add_log(self, message):
         """로그 추가"""
         timestamp = QDateTime.currentDateTime().toString("hh:mm:ss")
-        formatted_message = f"[{timestamp}] {message}"
-        
-        # 텍스트 색상을 명시적으로 설정
-        self.log_text.setTextColor(self.log_text.palette().text().color())
-        self.log_text.append(formatted_message)
-        
-        # 자동 스크롤
-        if self.auto_scroll:
-            scrollbar = self.log_text.verticalScrollBar()
-            scrollbar.setValue(scrollbar.maximum())
+        self.log_text.append_line(f"[{timestamp}] {message}")
             
+    def stop_log_saving(self):
+        """로그 파일 저장 종료 (남은 로그 기록)"""
+        self.log_text.set_spill_file(None)
+        
     def clear_log(self):
         """로그 지우기"""
         self.log_text.clear()
@@ -8,6 +8,12 @@ from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QTabWidget,
                              QFormLayout, QDialogButtonBox, QMessageBox)
 from PyQt5.QtCore import Qt, QSettings
 
+# 저장 형식 (core.sinks.OUTPUT_FORMATS 의 이름, 표시 이름)
+OUTPUT_FORMAT_CHOICES = [
+    ('files', "개별 파일 (도메인별 폴더)"),
+    ('tar', "tar 묶음 파일 (대량 이미지용)"),
+]
+
 
 class SettingsDialog(QDialog):
     def __init__(self, parent=None):
@@ -19,7 +25,7 @@ class SettingsDialog(QDialog):
     def init_ui(self):
         """UI 초기화"""
         self.setWindowTitle("설정")
-        self.setFixedSize(500, 400)
+        self.setFixedSize(500, 540)
         
         layout = QVBoxLayout(self)
         
@@ -79,8 +85,39 @@ class SettingsDialog(QDialog):
         self.max_concurrent_spin.setValue(5)
         conn_layout.addRow("최대 동시 연결:", self.max_concurrent_spin)
         
+        # 이미지 수신 속도 제한 (크롤링 중에 바꿔도 적용)
+        self.bandwidth_limit_spin = QSpinBox()
+        self.bandwidth_limit_spin.setRange(0, 1000000)
+        self.bandwidth_limit_spin.setSuffix(" KB/초")
+        self.bandwidth_limit_spin.setSpecialValueText("제한 없음")
+        conn_layout.addRow("전체 수신 속도:", self.bandwidth_limit_spin)
+        
+        self.host_bandwidth_limit_spin = QSpinBox()
+        self.host_bandwidth_limit_spin.setRange(0, 1000000)
+        self.host_bandwidth_limit_spin.setSuffix(" KB/초")
+        self.host_bandwidth_limit_spin.setSpecialValueText("제한 없음")
+        self.host_bandwidth_limit_spin.setToolTip("같은 호스트(CDN)에서 동시에 받는 이미지들의 속도 합")
+        conn_layout.addRow("호스트별 수신 속도:", self.host_bandwidth_limit_spin)
+        
         layout.addWidget(connection_group)
         
+        # 대기열 작업 그룹 (크롤러 화면의 "대기열에 추가")
+        jobs_group = QGroupBox("대기열 작업")
+        jobs_layout = QFormLayout(jobs_group)
+        
+        self.max_jobs_spin = QSpinBox()
+        self.max_jobs_spin.setRange(1, 50)
+        self.max_jobs_spin.setValue(4)
+        jobs_layout.addRow("동시 실행 작업 수:", self.max_jobs_spin)
+        
+        self.job_connections_spin = QSpinBox()
+        self.job_connections_spin.setRange(1, 200)
+        self.job_connections_spin.setValue(16)
+        self.job_connections_spin.setToolTip("모든 대기열 작업이 우선순위에 따라 나눠 쓰는 동시 요청 수")
+        jobs_layout.addRow("작업 전체 동시 요청:", self.job_connections_spin)
+        
+        layout.addWidget(jobs_group)
+        
         # User Agent 설정 그룹
         ua_group = QGroupBox("User Agent 설정")
         ua_layout = QVBoxLayout(ua_group)
@@ -135,6 +172,12 @@ class SettingsDialog(QDialog):
         ])
         file_layout.addRow("파일명 패턴:", self.filename_pattern_combo)
         
+        # 저장 형식
+        self.output_format_combo = QComboBox()
+        for output_format, label in OUTPUT_FORMAT_CHOICES:
+            self.output_format_combo.addItem(label, output_format)
+        file_layout.addRow("저장 형식:", self.output_format_combo)
+        
         layout.addWidget(file_group)
         
         # 필터 설정 그룹
@@ -219,6 +262,9 @@ class SettingsDialog(QDialog):
         self.auto_save_log = QCheckBox("로그 자동 저장")
         log_layout.addWidget(self.auto_save_log)
         
+        self.profile_crawl = QCheckBox("크롤링 프로파일링 (logs/profile 에 결과 저장)")
+        log_layout.addWidget(self.profile_crawl)
+        
         layout.addWidget(log_group)
         
         layout.addStretch()
@@ -235,15 +281,23 @@ class SettingsDialog(QDialog):
         self.timeout_spin.setValue(self.settings.value("network/timeout", 30, type=int))
         self.retry_spin.setValue(self.settings.value("network/retry", 3, type=int))
         self.max_concurrent_spin.setValue(self.settings.value("network/max_concurrent", 5, type=int))
+        self.bandwidth_limit_spin.setValue(self.settings.value("network/bandwidth_limit_kb", 0, type=int))
+        self.host_bandwidth_limit_spin.setValue(self.settings.value("network/host_bandwidth_limit_kb", 0, type=int))
         
         ua_index = self.settings.value("network/user_agent_index", 0, type=int)
         self.user_agent_combo.setCurrentIndex(ua_index)
         self.custom_ua_input.setText(self.settings.value("network/custom_user_agent", ""))
         
+        self.max_jobs_spin.setValue(self.settings.value("jobs/max_jobs", 4, type=int))
+        self.job_connections_spin.setValue(self.settings.value("jobs/max_connections", 16, type=int))
+        
         # 다운로드 설정
         self.max_size_spin.setValue(self.settings.value("download/max_size", 50, type=int))
         filename_pattern_index = self.settings.value("download/filename_pattern", 0, type=int)
         self.filename_pattern_combo.setCurrentIndex(filename_pattern_index)
+        output_format_index = self.output_format_combo.findData(
+            self.settings.value("download/output_format", "files"))
+        self.output_format_combo.setCurrentIndex(max(0, output_format_index))
         
         self.min_width_spin.setValue(self.settings.value("download/min_width", 100, type=int))
         self.min_height_spin.setValue(self.settings.value("download/min_height", 100, type=int))
@@ -261,6 +315,7 @@ class SettingsDialog(QDialog):
         
         self.enable_debug_log.setChecked(self.settings.value("ui/debug_log", False, type=bool))
         self.auto_save_log.setChecked(self.settings.value("ui/auto_save_log", False, type=bool))
+        self.profile_crawl.setChecked(self.settings.value("ui/profile_crawl", False, type=bool))
         
     def save_settings(self):
         """설정 저장"""
@@ -268,12 +323,17 @@ class SettingsDialog(QDialog):
         self.settings.setValue("network/timeout", self.timeout_spin.value())
         self.settings.setValue("network/retry", self.retry_spin.value())
         self.settings.setValue("network/max_concurrent", self.max_concurrent_spin.value())
+        self.settings.setValue("network/bandwidth_limit_kb", self.bandwidth_limit_spin.value())
+        self.settings.setValue("network/host_bandwidth_limit_kb", self.host_bandwidth_limit_spin.value())
         self.settings.setValue("network/user_agent_index", self.user_agent_combo.currentIndex())
         self.settings.setValue("network/custom_user_agent", self.custom_ua_input.text())
+        self.settings.setValue("jobs/max_jobs", self.max_jobs_spin.value())
+        self.settings.setValue("jobs/max_connections", self.job_connections_spin.value())
         
         # 다운로드 설정
         self.settings.setValue("download/max_size", self.max_size_spin.value())
         self.settings.setValue("download/filename_pattern", self.filename_pattern_combo.currentIndex())
+        self.settings.setValue("download/output_format", self.output_format_combo.currentData())
         self.settings.setValue("download/min_width", self.min_width_spin.value())
         self.settings.setValue("download/min_height", self.min_height_spin.value())
         self.settings.setValue("download/supported_formats", self.supported_formats.isChecked())
@@ -285,6 +345,7 @@ class SettingsDialog(QDialog):
         self.settings.setValue("ui/thumbnails_per_row", self.thumbnails_per_row_spin.value())
         self.settings.setValue("ui/debug_log", self.enable_debug_log.isChecked())
         self.settings.setValue("ui/auto_save_log", self.auto_save_log.isChecked())
+        self.settings.setValue("ui/profile_crawl", self.profile_crawl.isChecked())
         
     def accept_settings(self):
         """설정 적용"""
@@ -305,12 +366,17 @@ class SettingsDialog(QDialog):
             self.timeout_spin.setValue(30)
             self.retry_spin.setValue(3)
             self.max_concurrent_spin.setValue(5)
+            self.bandwidth_limit_spin.setValue(0)
+            self.host_bandwidth_limit_spin.setValue(0)
             self.user_agent_combo.setCurrentIndex(0)
             self.custom_ua_input.setText("")
+            self.max_jobs_spin.setValue(4)
+            self.job_connections_spin.setValue(16)
             
             # 다운로드 설정 기본값
             self.max_size_spin.setValue(50)
             self.filename_pattern_combo.setCurrentIndex(0)
+            self.output_format_combo.setCurrentIndex(0)
             self.min_width_spin.setValue(100)
             self.min_height_spin.setValue(100)
             self.supported_formats.setChecked(True)
@@ -321,4 +387,5 @@ class SettingsDialog(QDialog):
             self.thumbnail_size_spin.setValue(150)
             self.thumbnails_per_row_spin.setValue(4)
             self.enable_debug_log.setChecked(False)
-            self.auto_save_log.setChecked(False) 
\ No newline at end of file
+            self.auto_save_log.setChecked(False)
+            self.profile_crawl.setChecked(False) 
\ No newline at end of file